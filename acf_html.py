@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Single-pass parsing of the HTML stored in ACF meta values.
+
+The featured_quote, more_quotes and track_listing fields hold small
+hand-written HTML fragments. Each parser below walks a value once with
+html.parser and collects text as it goes, so the cost is linear in the size
+of the value however the HTML is nested or broken.
+
+Text is rendered the way clean_html() in the extract scripts does it: <br>
+becomes a newline, </p><p> a blank line, other tags are dropped and entities
+are decoded.
+"""
+
+import re
+from html.parser import HTMLParser
+
+DASHES = '—–-'
+
+
+def unescape_mysql(value):
+    """Undo the MySQL string escapes left in raw meta values."""
+    return value.replace('\\"', '"').replace("\\'", "'").replace('\\r\\n', '\n').replace('\\n', '\n')
+
+
+def finish_text(text):
+    """Collapse runs of blank lines and trim, as clean_html() does."""
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+class FragmentParser(HTMLParser):
+    """Base parser that renders text into self.text and tracks paragraph breaks."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = []
+        self.after_paragraph = False  # saw </p>, only whitespace since
+        self.pending_space = ''
+
+    def write(self, data):
+        self.text.append(data)
+
+    def flush_paragraph(self):
+        if self.after_paragraph:
+            self.after_paragraph = False
+            if self.pending_space:
+                self.write(self.pending_space)
+            self.pending_space = ''
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'p' and self.after_paragraph:
+            self.after_paragraph = False
+            self.pending_space = ''
+            self.paragraph_break()
+            return
+        self.flush_paragraph()
+        if tag == 'br':
+            self.write('\n')
+
+    def handle_endtag(self, tag):
+        self.flush_paragraph()
+        if tag == 'p':
+            self.after_paragraph = True
+
+    def handle_data(self, data):
+        if self.after_paragraph and not data.strip():
+            self.pending_space += data
+            return
+        self.flush_paragraph()
+        self.write(data)
+
+    def paragraph_break(self):
+        self.write('\n\n')
+
+    def parse(self, value):
+        self.feed(unescape_mysql(value))
+        self.close()
+        self.flush_paragraph()
+        return self
+
+
+# ==========================================================================
+# Track listings
+# ==========================================================================
+
+class TrackListingParser(FragmentParser):
+    """Collect <li> items and the text after a "Credits" heading."""
+
+    def __init__(self):
+        super().__init__()
+        self.items = []          # (title, before_credits)
+        self.item = None         # text of the open <li>
+        self.credits = None      # text after "Credits", once seen
+
+    def write(self, data):
+        if self.item is not None:
+            self.item.append(data)
+        if self.credits is not None:
+            self.credits.append(data)
+
+    def close_item(self):
+        if self.item is not None:
+            self.items.append((finish_text(''.join(self.item)), self.credits is None))
+            self.item = None
+
+    def handle_starttag(self, tag, attrs):
+        super().handle_starttag(tag, attrs)
+        if tag == 'li':
+            # <li> may be left open; the next one ends it
+            self.close_item()
+            self.item = []
+
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        if tag in ('li', 'ol', 'ul'):
+            self.close_item()
+
+    def handle_data(self, data):
+        if self.credits is None:
+            index = data.lower().find('credits')
+            if index != -1:
+                super().handle_data(data[:index])
+                self.credits = []
+                data = data[index + len('credits'):]
+        super().handle_data(data)
+
+
+def numbered_tracks(items):
+    """Track records numbered by list position, skipping empty items."""
+    return [{'number': i + 1, 'title': title} for i, title in enumerate(items) if title]
+
+
+def parse_track_listing(value):
+    """Tracks listed before the "Credits" heading, and the credits text (or None)."""
+    if not value:
+        return [], None
+    parser = TrackListingParser().parse(value)
+    tracks = numbered_tracks([title for title, before_credits in parser.items if before_credits])
+    credits = finish_text(''.join(parser.credits)) if parser.credits is not None else None
+    return tracks, credits
+
+
+def parse_track_items(value):
+    """Every <li> item in a track listing, as numbered tracks."""
+    if not value:
+        return []
+    parser = TrackListingParser().parse(value)
+    return numbered_tracks([title for title, _ in parser.items])
+
+
+# ==========================================================================
+# Featured quote
+# ==========================================================================
+
+class FeaturedQuoteParser(FragmentParser):
+    """Split a featured quote into its <em> text and <div class="featured-quote"> source."""
+
+    def __init__(self):
+        super().__init__()
+        self.emphasis = None     # text of the first <em>
+        self.in_emphasis = False
+        self.source = None       # text of the first featured-quote <div>
+        self.source_depth = 0    # open featured-quote <div>s
+        self.in_source = False
+        self.outside = []        # text outside featured-quote <div>s
+
+    def write(self, data):
+        self.text.append(data)
+        if self.in_emphasis:
+            self.emphasis.append(data)
+        if self.in_source:
+            self.source.append(data)
+        if not self.source_depth:
+            self.outside.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        super().handle_starttag(tag, attrs)
+        if tag == 'em' and self.emphasis is None:
+            self.emphasis = []
+            self.in_emphasis = True
+        elif tag == 'div' and dict(attrs).get('class') == 'featured-quote' and not self.source_depth:
+            self.source_depth = 1
+            if self.source is None:
+                self.source = []
+                self.in_source = True
+
+    def handle_endtag(self, tag):
+        super().handle_endtag(tag)
+        if tag == 'em':
+            self.in_emphasis = False
+        elif tag == 'div' and self.source_depth:
+            self.source_depth = 0
+            self.in_source = False
+
+
+def source_after_dash(text):
+    """Attribution after the first dash whose remainder is a single line, or None."""
+    for index, char in enumerate(text):
+        if char in DASHES:
+            rest = text[index + 1:].lstrip()
+            if rest and '\n' not in rest:
+                return rest
+    return None
+
+
+def parse_featured_quote(value):
+    """Quote text and source from HTML like <em>Quote</em><div class="featured-quote">—Source</div>."""
+    if not value:
+        return None, None
+    parser = FeaturedQuoteParser().parse(value)
+
+    quote_text = finish_text(''.join(parser.emphasis)) if parser.emphasis is not None else None
+    if not quote_text:
+        quote_text = finish_text(''.join(parser.outside))
+
+    if parser.source is not None:
+        source = finish_text(''.join(parser.source)).lstrip(DASHES).lstrip()
+    else:
+        source = source_after_dash(finish_text(''.join(parser.text)))
+
+    return quote_text, source
+
+
+# ==========================================================================
+# More quotes (press)
+# ==========================================================================
+
+class PressQuotesParser(FragmentParser):
+    """Split press quotes into blocks and find each block's "— <a href>Source</a>" attribution."""
+
+    def __init__(self):
+        super().__init__()
+        self.blocks = [{'text': [], 'link': None}]
+        self.last_data = None    # data seen immediately before the current tag
+        self.anchor = None       # (href, cut, text) of an <a> that may be an attribution
+
+    def write(self, data):
+        self.blocks[-1]['text'].append(data)
+
+    def new_block(self):
+        if self.blocks[-1]['text']:
+            self.blocks.append({'text': [], 'link': None})
+        self.anchor = None
+
+    def paragraph_break(self):
+        self.new_block()
+
+    def handle_starttag(self, tag, attrs):
+        block = self.blocks[-1]
+        if self.anchor is not None:
+            self.anchor = None  # markup inside the link: not a plain attribution
+        if tag == 'a' and block['link'] is None:
+            href = dict(attrs).get('href')
+            before = self.last_data.rstrip() if self.last_data else ''
+            if href is not None and before and before[-1] in DASHES:
+                written = sum(len(part) for part in block['text'])
+                cut = written - (len(self.last_data) - len(before)) - 1
+                self.anchor = (href, cut, [])
+        self.last_data = None
+        super().handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self.anchor is not None:
+            href, cut, text = self.anchor
+            if ''.join(text):
+                self.blocks[-1]['link'] = (href, cut, ''.join(text))
+        self.anchor = None
+        self.last_data = None
+        super().handle_endtag(tag)
+
+    def handle_data(self, data):
+        pieces = re.split(r'\n\n+', data)
+        for i, piece in enumerate(pieces):
+            if i:
+                self.flush_paragraph()
+                self.new_block()
+            if self.anchor is not None:
+                self.anchor[2].append(piece)
+            super().handle_data(piece)
+        self.last_data = pieces[-1]
+
+    def handle_comment(self, data):
+        self.last_data = None
+
+
+def split_attribution(text):
+    """Split cleaned text into (quote, source) at a trailing dash attribution, or None."""
+    # Source on its own line: the last newline followed by a dash
+    index = text.rfind('\n')
+    while index != -1:
+        if index + 1 < len(text) and text[index + 1] in DASHES and text[index + 2:]:
+            return text[:index].strip(), text[index + 2:].strip()
+        index = text.rfind('\n', 0, index)
+
+    # Source on the same line: a capitalised name after the last dash
+    index = max(text.rfind(dash) for dash in DASHES)
+    if index > 0:
+        rest = text[index + 1:].lstrip()
+        if len(rest) > 1 and 'A' <= rest[0] <= 'Z':
+            return text[:index].strip(), rest.strip()
+    return None
+
+
+def parse_press_quotes(value):
+    """Press quotes as {'text', 'source', 'url'} records."""
+    if not value:
+        return []
+    parser = PressQuotesParser().parse(value)
+
+    quotes = []
+    for block in parser.blocks:
+        text = ''.join(block['text'])
+        if block['link']:
+            href, cut, source = block['link']
+            quote_text = finish_text(text[:cut])
+            if quote_text:
+                quotes.append({'text': quote_text, 'source': source, 'url': href})
+        elif any(dash in text for dash in DASHES):
+            attribution = split_attribution(finish_text(text))
+            if attribution:
+                quotes.append({'text': attribution[0], 'source': attribution[1], 'url': None})
+    return quotes
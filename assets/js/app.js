@@ -25,69 +25,189 @@
   // Album Grid
   // ==========================================================================
 
-  function createAlbumCard(album) {
+  // Rendered card width at each grid breakpoint (see gridColumns)
+  const CARD_SIZES = '(max-width: 640px) 100vw, (max-width: 768px) 50vw, (max-width: 1024px) 33vw, 25vw';
+
+  function createAlbumCard() {
     const card = document.createElement('a');
     card.className = 'album-card';
-    card.href = `pages/albums/${album.slug}.html`;
-    card.dataset.artist = album.artistSlug;
-
-    // Use placeholder image if no cover
-    const coverImage = album.coverImage || 'assets/images/placeholder.svg';
-
     card.innerHTML = `
       <div class="album-card__image">
-        <img src="${coverImage}" alt="${album.name} album cover" loading="lazy">
+        <img alt="" loading="lazy">
       </div>
       <div class="album-card__meta">
-        <span class="album-card__artist">${album.artist}</span>
-        <h3 class="album-card__title">${album.name}</h3>
-        ${album.releaseDate ? `<span class="album-card__year">${album.releaseDate.split('-')[0]}</span>` : ''}
+        <span class="album-card__artist"></span>
+        <h3 class="album-card__title"></h3>
+        <span class="album-card__year"></span>
       </div>
     `;
-
     return card;
   }
 
-  function sortAlbumsByDate(albums) {
-    return [...albums].sort((a, b) => {
-      // Sort by release date, most recent first
-      const dateA = a.releaseDate ? new Date(a.releaseDate) : new Date(0);
-      const dateB = b.releaseDate ? new Date(b.releaseDate) : new Date(0);
-      return dateB - dateA;
-    });
+  // Point a (new or recycled) card at an album
+  function fillAlbumCard(card, album) {
+    card.href = `pages/albums/${album.slug}.html`;
+    card.dataset.artist = album.artistSlug;
+
+    const image = card.querySelector('.album-card__image');
+    image.style.backgroundColor = album.coverImageColor || '';
+
+    // Use placeholder image if no cover
+    const img = image.querySelector('img');
+    const info = album.coverImageInfo;
+    img.removeAttribute('srcset');
+    img.removeAttribute('sizes');
+    img.removeAttribute('width');
+    img.removeAttribute('height');
+    if (info) {
+      img.width = info.width;
+      img.height = info.height;
+      if (info.derivatives && info.derivatives.length) {
+        const candidates = info.derivatives.map(d => `${d.src} ${d.width}w`);
+        candidates.push(`${album.coverImage} ${info.width}w`);
+        img.sizes = CARD_SIZES;
+        img.srcset = candidates.join(', ');
+      }
+    }
+    img.src = album.coverImage || 'assets/images/placeholder.svg';
+    img.alt = `${album.name} album cover`;
+
+    card.querySelector('.album-card__artist').textContent = album.artist;
+    card.querySelector('.album-card__title').textContent = album.name;
+    const year = card.querySelector('.album-card__year');
+    year.textContent = album.releaseDate ? album.releaseDate.split('-')[0] : '';
+    year.hidden = !album.releaseDate;
   }
 
-  function renderAlbumGrid(albums, filter = 'all') {
-    const grid = document.getElementById('album-grid');
-    const countEl = document.getElementById('album-count');
+  // Grid index as written by generate_pages.py (data/grid.json), built here
+  // from albums.json when the site predates it
+  function gridIndexFromAlbums(albums) {
+    const byDate = albums.map((album, index) => index).sort((a, b) => {
+      // Sort by release date, most recent first; undated albums last
+      const dateA = albums[a].releaseDate || '';
+      const dateB = albums[b].releaseDate || '';
+      return dateA < dateB ? 1 : dateA > dateB ? -1 : 0;
+    });
+    const order = { all: byDate };
+    byDate.forEach(index => {
+      const artist = albums[index].artistSlug;
+      (order[artist] = order[artist] || []).push(index);
+    });
+    return { albums, order };
+  }
 
-    if (!grid) return;
+  // Rows rendered beyond the viewport in each direction
+  const OVERSCAN_ROWS = 2;
+
+  // Only the cards in (or near) the viewport exist; the rows above and below
+  // are stood in for by the grid's padding. Cards scrolled out are recycled.
+  class VirtualGrid {
+    constructor(grid, index) {
+      this.grid = grid;
+      this.albums = index.albums;
+      this.orders = index.order;
+      this.order = this.orders.all || [];
+      this.cards = new Map();  // album index -> card in the grid
+      this.spare = [];
+      this.columns = 1;
+      this.rowStride = 0;
+      this.frame = null;
+
+      const schedule = () => this.schedule();
+      window.addEventListener('scroll', schedule, { passive: true });
+      window.addEventListener('resize', () => {
+        this.rowStride = 0;
+        this.schedule();
+      });
+    }
 
-    // Clear existing content
-    grid.innerHTML = '';
+    filter(name) {
+      this.order = this.orders[name] || [];
+      this.schedule();
+      return this.order.length;
+    }
 
-    // Filter albums
-    const filteredAlbums = filter === 'all'
-      ? albums
-      : albums.filter(album => album.artistSlug === filter);
+    schedule() {
+      if (this.frame === null) {
+        this.frame = requestAnimationFrame(() => {
+          this.frame = null;
+          this.render();
+        });
+      }
+    }
 
-    // Sort by release date (most recent first)
-    const sortedAlbums = sortAlbumsByDate(filteredAlbums);
+    // Distance between the tops of consecutive rows, once two rows are rendered
+    measure() {
+      const children = this.grid.children;
+      if (children.length > this.columns) {
+        this.rowStride = children[this.columns].offsetTop - children[0].offsetTop;
+      }
+    }
 
-    // Update count
-    if (countEl) {
-      countEl.textContent = sortedAlbums.length;
+    visibleRows(rowCount, stride) {
+      const top = this.grid.getBoundingClientRect().top;
+      const first = Math.floor(-top / stride) - OVERSCAN_ROWS;
+      const last = Math.ceil((window.innerHeight - top) / stride) + OVERSCAN_ROWS;
+      const firstRow = Math.min(Math.max(0, first), rowCount - 1);
+      return [firstRow, Math.max(firstRow, Math.min(rowCount - 1, last))];
     }
 
-    // Render cards
-    sortedAlbums.forEach(album => {
-      grid.appendChild(createAlbumCard(album));
-    });
+    render() {
+      this.columns = gridColumns();
+      const rowCount = Math.ceil(this.order.length / this.columns);
+      // Until rows have been measured, guess low (a card is at least as tall
+      // as it is wide), which renders extra rows rather than too few
+      const stride = this.rowStride || this.grid.clientWidth / this.columns || window.innerHeight;
+      const [firstRow, lastRow] = rowCount ? this.visibleRows(rowCount, stride) : [0, -1];
+
+      const start = firstRow * this.columns;
+      const end = Math.min(this.order.length, (lastRow + 1) * this.columns);
+      const visible = this.order.slice(start, end);
+      const keep = new Set(visible);
+
+      this.cards.forEach((card, albumIndex) => {
+        if (!keep.has(albumIndex)) {
+          card.remove();
+          this.cards.delete(albumIndex);
+          this.spare.push(card);
+        }
+      });
+
+      visible.forEach((albumIndex, position) => {
+        let card = this.cards.get(albumIndex);
+        if (!card) {
+          card = this.spare.pop() || createAlbumCard();
+          fillAlbumCard(card, this.albums[albumIndex]);
+          this.cards.set(albumIndex, card);
+        }
+        const current = this.grid.children[position];
+        if (current !== card) this.grid.insertBefore(card, current || null);
+      });
+
+      this.grid.style.paddingTop = `${firstRow * stride}px`;
+      this.grid.style.paddingBottom = `${Math.max(0, rowCount - lastRow - 1) * stride}px`;
+
+      // Re-render once the real row height is known
+      if (!this.rowStride && visible.length) {
+        this.measure();
+        if (this.rowStride && this.rowStride !== stride) this.schedule();
+      }
+    }
   }
 
-  function initAlbumFilters(albums) {
-    const filterBtns = document.querySelectorAll('.filter-btn');
+  function initAlbumGrid(index) {
+    const grid = document.getElementById('album-grid');
+    const countEl = document.getElementById('album-count');
+    if (!grid) return;
+
+    grid.innerHTML = '';
+    const virtualGrid = new VirtualGrid(grid, index);
+    const showCount = count => {
+      if (countEl) countEl.textContent = count;
+    };
+    showCount(virtualGrid.filter('all'));
 
+    const filterBtns = document.querySelectorAll('.filter-btn');
     filterBtns.forEach(btn => {
       btn.addEventListener('click', () => {
         // Update active state
@@ -95,8 +215,7 @@
         btn.classList.add('filter-btn--active');
 
         // Filter grid
-        const filter = btn.dataset.filter;
-        renderAlbumGrid(albums, filter);
+        showCount(virtualGrid.filter(btn.dataset.filter));
       });
     });
   }
@@ -151,27 +270,69 @@
     // For a static site, we'll generate these pages with the data already embedded
   }
 
+  // ==========================================================================
+  // Embed Facades
+  // ==========================================================================
+
+  function loadEmbed(facade) {
+    const data = facade.dataset;
+    let src = data.embedSrc;
+    if (data.embedAutoplay) {
+      src += (src.includes('?') ? '&' : '?') + data.embedAutoplay;
+    }
+
+    const iframe = document.createElement('iframe');
+    iframe.src = src;
+    iframe.title = data.embedTitle || '';
+    iframe.loading = 'lazy';
+    if (data.embedHeight) iframe.height = data.embedHeight;
+    if (data.embedAllow) {
+      iframe.allow = data.embedAllow;
+      iframe.allowFullscreen = true;
+    }
+
+    facade.replaceWith(iframe);
+  }
+
+  function preconnect(url) {
+    const origin = new URL(url).origin;
+    if (document.querySelector(`link[rel="preconnect"][href="${origin}"]`)) return;
+    const link = document.createElement('link');
+    link.rel = 'preconnect';
+    link.href = origin;
+    document.head.appendChild(link);
+  }
+
+  function initEmbedFacades() {
+    document.querySelectorAll('.embed-facade').forEach(facade => {
+      const button = facade.querySelector('.embed-facade__play');
+      if (!button) return;
+
+      // Warm up the connection as soon as the visitor shows intent
+      facade.addEventListener('pointerenter', () => preconnect(facade.dataset.embedSrc), { once: true });
+      button.addEventListener('click', () => loadEmbed(facade), { once: true });
+    });
+  }
+
   // ==========================================================================
   // Responsive Grid Classes
   // ==========================================================================
 
+  // Columns at each breakpoint
+  function gridColumns() {
+    const width = window.innerWidth;
+    if (width < 640) return 1;
+    if (width < 768) return 2;
+    if (width < 1024) return 3;
+    return 4;
+  }
+
   function updateGridClasses() {
     const grid = document.getElementById('album-grid');
     if (!grid) return;
 
-    const width = window.innerWidth;
-
     grid.classList.remove('grid-cols-1', 'grid-cols-2', 'grid-cols-3', 'grid-cols-4');
-
-    if (width < 640) {
-      grid.classList.add('grid-cols-1');
-    } else if (width < 768) {
-      grid.classList.add('grid-cols-2');
-    } else if (width < 1024) {
-      grid.classList.add('grid-cols-3');
-    } else {
-      grid.classList.add('grid-cols-4');
-    }
+    grid.classList.add(`grid-cols-${gridColumns()}`);
   }
 
   // ==========================================================================
@@ -182,28 +343,105 @@
     // Initialize mobile menu
     initMobileMenu();
 
-    // Load data
-    const albums = await loadJSON('data/albums.json');
-    const artists = await loadJSON('data/artists.json');
-
-    if (albums) {
-      // Initialize album grid on homepage
-      if (document.getElementById('album-grid')) {
-        renderAlbumGrid(albums);
-        initAlbumFilters(albums);
+    // Third-party players load on demand
+    initEmbedFacades();
 
+    // Homepage grid, from the pre-sorted grid index
+    if (document.getElementById('album-grid')) {
+      let index = await loadJSON('data/grid.json');
+      if (!index) {
+        const albums = await loadJSON('data/albums.json');
+        index = albums && gridIndexFromAlbums(albums);
+      }
+      if (index) {
         // Handle responsive grid
         updateGridClasses();
         window.addEventListener('resize', updateGridClasses);
+        initAlbumGrid(index);
       }
+    }
 
-      // Initialize album detail page
-      if (document.querySelector('.album-hero')) {
+    // Initialize album detail page
+    if (document.querySelector('.album-hero')) {
+      const albums = await loadJSON('data/albums.json');
+      const artists = await loadJSON('data/artists.json');
+      if (albums) {
         initAlbumDetail(albums, artists);
       }
     }
   }
 
+  // ==========================================================================
+  // Prefetching
+  // ==========================================================================
+
+  // Browsers without speculation rules get the same hints as <link rel=prefetch>:
+  // the page's listed next pages once idle, and album cards on hover or press
+  const MAX_PREFETCHES = 8;
+  const HOVER_DELAY = 100;
+  const prefetched = new Set();
+
+  function prefetch(url) {
+    if (prefetched.has(url) || prefetched.size >= MAX_PREFETCHES) return;
+    prefetched.add(url);
+    const link = document.createElement('link');
+    link.rel = 'prefetch';
+    link.href = url;
+    document.head.appendChild(link);
+  }
+
+  function initPrefetch() {
+    const supported = HTMLScriptElement.supports && HTMLScriptElement.supports('speculationrules');
+    const saveData = navigator.connection && navigator.connection.saveData;
+    if (supported || saveData) return;
+
+    const idle = window.requestIdleCallback || (callback => setTimeout(callback, 1));
+    idle(() => {
+      document.querySelectorAll('script[type="speculationrules"]').forEach(script => {
+        try {
+          JSON.parse(script.textContent).prefetch
+            .filter(rule => rule.source === 'list')
+            .forEach(rule => rule.urls.forEach(url => prefetch(new URL(url, document.baseURI).href)));
+        } catch (error) {
+          console.error('Invalid speculation rules:', error);
+        }
+      });
+    });
+
+    let timer = null;
+    document.addEventListener('pointerover', event => {
+      const card = event.target.closest && event.target.closest('a.album-card');
+      clearTimeout(timer);
+      if (card) timer = setTimeout(() => prefetch(card.href), HOVER_DELAY);
+    });
+    ['touchstart', 'focusin'].forEach(type => {
+      document.addEventListener(type, event => {
+        const card = event.target.closest && event.target.closest('a.album-card');
+        if (card) prefetch(card.href);
+      }, { passive: true });
+    });
+  }
+
+  initPrefetch();
+
+  // ==========================================================================
+  // Offline Support
+  // ==========================================================================
+
+  // sw.js is written to the site root, two levels above this script
+  const scriptUrl = document.currentScript && document.currentScript.src;
+
+  function registerServiceWorker() {
+    if (!('serviceWorker' in navigator) || !scriptUrl) return;
+    const root = new URL('../../', scriptUrl);
+    navigator.serviceWorker.register(new URL('sw.js', root)).catch(error => {
+      console.error('Service worker registration failed:', error);
+    });
+  }
+
+  // After the first page has loaded, so precaching doesn't compete with it
+  window.addEventListener('load', registerServiceWorker);
+
   // Run on DOM ready
   if (document.readyState === 'loading') {
     document.addEventListener('DOMContentLoaded', init);
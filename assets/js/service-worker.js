@@ -0,0 +1,116 @@
+/**
+ * Static Motor Recordings Archive
+ * Service Worker
+ *
+ * service_worker.py writes this file to /sw.js after each build, prefixed
+ * with the build's precache manifest:
+ *
+ *   const MANIFEST = {version, precache: [{url, revision}], runtime: [{prefix, cache, maxEntries}]};
+ *
+ * The app shell is cached on install, keyed by revision, so a new build only
+ * downloads the files whose contents changed. Pages and images under the
+ * runtime prefixes are served stale-while-revalidate.
+ */
+
+const SCOPE = new URL(self.registration.scope);
+const CACHE_PREFIX = `smr:${SCOPE.pathname}:`;
+const PRECACHE = `${CACHE_PREFIX}precache-${MANIFEST.version}`;
+
+// Site-relative path -> cache key carrying the file's revision
+const PRECACHE_KEYS = new Map(MANIFEST.precache.map(entry => [entry.url, revisionedUrl(entry)]));
+
+function revisionedUrl(entry) {
+  const url = new URL(entry.url, SCOPE);
+  url.searchParams.set('__revision', entry.revision);
+  return url.href;
+}
+
+function sitePath(url) {
+  const path = url.pathname.startsWith(SCOPE.pathname) ? url.pathname.slice(SCOPE.pathname.length) : null;
+  return path === '' ? 'index.html' : path;
+}
+
+// ==========================================================================
+// Install / Activate
+// ==========================================================================
+
+// Copy unchanged files from the previous build's cache; fetch the rest
+async function precache() {
+  const cache = await caches.open(PRECACHE);
+  await Promise.all(MANIFEST.precache.map(async entry => {
+    const key = PRECACHE_KEYS.get(entry.url);
+    const cached = await caches.match(key);
+    if (cached) {
+      return cache.put(key, cached);
+    }
+    const response = await fetch(new URL(entry.url, SCOPE), { cache: 'reload' });
+    if (!response.ok) throw new Error(`Failed to precache ${entry.url}`);
+    return cache.put(key, response);
+  }));
+}
+
+self.addEventListener('install', event => {
+  event.waitUntil(precache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    const names = await caches.keys();
+    await Promise.all(names
+      .filter(name => name.startsWith(`${CACHE_PREFIX}precache-`) && name !== PRECACHE)
+      .map(name => caches.delete(name)));
+    await self.clients.claim();
+  })());
+});
+
+// ==========================================================================
+// Fetch
+// ==========================================================================
+
+async function trimCache(cache, maxEntries) {
+  if (!maxEntries) return;
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - maxEntries)).map(key => cache.delete(key)));
+}
+
+async function staleWhileRevalidate(event, rule) {
+  const cache = await caches.open(`${CACHE_PREFIX}${rule.cache}`);
+  const cached = await cache.match(event.request, { ignoreSearch: true });
+  const network = fetch(event.request).then(async response => {
+    if (response.ok) {
+      await cache.put(event.request, response.clone());
+      await trimCache(cache, rule.maxEntries);
+    }
+    return response;
+  });
+  if (cached) {
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+  }
+  return network;
+}
+
+async function precached(request, key) {
+  const cached = await caches.match(key);
+  return cached || fetch(request);
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  if (request.method !== 'GET') return;
+
+  const url = new URL(request.url);
+  if (url.origin !== SCOPE.origin) return;
+  const path = sitePath(url);
+  if (path === null) return;
+
+  if (PRECACHE_KEYS.has(path)) {
+    event.respondWith(precached(request, PRECACHE_KEYS.get(path)));
+    return;
+  }
+
+  const rule = MANIFEST.runtime.find(rule => path.startsWith(rule.prefix));
+  if (rule) {
+    event.respondWith(staleWhileRevalidate(event, rule));
+  }
+});
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Run the extract -> fix -> generate pipeline, redoing only what changed.
+
+Each stage below is one of the existing scripts with the files and
+directories it reads and writes. A stage runs when one of its outputs is
+missing or the contents of any of its inputs (including its own source and
+the local modules it imports) differ from what it saw when it last ran
+successfully; stages that write files another stage reads or writes wait
+for it, and the rest run side by side.
+
+A stage's inputs are fingerprinted as it starts, so a file a later stage
+writes (fonts.css, read by generate_pages and written by build_fonts) makes
+the earlier stage run again next time. A stage that rewrites one of its own
+inputs (albums.json) also records what it wrote, and finding that is not a
+change.
+
+Fingerprints are SHA-256 hashes of file contents, kept in .build-state.json
+with each file's size and mtime so that unchanged files are not read again;
+a build with nothing to do only stats the tracked files. Because contents
+are compared, a stage that rewrites a file without changing it does not
+trigger the stages after it.
+
+When sites.json lists several sites (see sites.py), the stages whose scripts
+build every configured site track each site's copy of their files and its
+SQL backup, and sites.json itself.
+
+    python3 build.py                  # run whatever is out of date
+    python3 build.py generate_pages   # just these stages (if out of date)
+    python3 build.py --all            # include the optional stages
+    python3 build.py --force          # run every selected stage
+    python3 build.py --dry-run        # list what would run
+    python3 build.py --quiet          # only warnings, from every stage
+    python3 build.py --json-log       # JSON lines, from every stage
+
+--quiet, --verbose and --json-log are passed on to the stages' scripts (see
+progress.py).
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import progress
+from service_worker import TEMPLATE as SW_TEMPLATE, shell_inputs
+from sites import SITES_FILE, load_sites
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive'
+SITE_PATH = os.path.join(BASE_PATH, 'smr-archive-site')
+STATE_FILE = os.path.join(SITE_PATH, '.build-state.json')
+
+XML_EXPORT = os.path.join(BASE_PATH, 'staticmotorrecordings.WordPress.2026-01-24.xml')
+CATALOG_CSV = os.path.join(BASE_PATH, 'SMR_Catalog_Basic.csv')
+PRESS_CSV = os.path.join(BASE_PATH, 'SMR_Albums_Press.csv')
+SQL_FILE = os.path.join(BASE_PATH, 'backup-1.23.2026_18-29-26_staticmo/mysql/staticmo_wplive.sql')
+
+ALBUMS = 'data/albums.json'
+ARTISTS = 'data/artists.json'
+TIMELINE = 'data/timeline.json'
+IMAGES = ['assets/images/albums', 'assets/images/artists']
+
+# Stages that write sw.js read every file its manifest hashes
+SW_INPUTS = [SW_TEMPLATE] + shell_inputs()
+
+# In pipeline order. Paths are relative to SITE_PATH unless absolute; a stage
+# is skipped while one of its inputs is missing, but optional_inputs are only
+# fingerprinted. Stages marked 'sites' build every site in sites.json.
+STAGES = [
+    {'name': 'extract_content', 'script': 'extract_content.py',
+     'inputs': [XML_EXPORT, CATALOG_CSV, 'data/timeline_rules.json'],
+     'outputs': [ALBUMS, ARTISTS, TIMELINE, 'data/site.json', 'data/posts.json']},
+    {'name': 'update_covers', 'script': 'update_covers.py',
+     'inputs': [ALBUMS, 'assets/images/albums'],
+     'outputs': [ALBUMS]},
+    {'name': 'update_artists', 'script': 'update_artists.py',
+     'inputs': [ARTISTS, 'assets/images/artists'],
+     'outputs': [ARTISTS]},
+    {'name': 'extract_products', 'script': 'extract_products.py', 'sites': True,
+     'inputs': [SQL_FILE, ALBUMS, ARTISTS],
+     'outputs': ['data/products_raw.json', ALBUMS, ARTISTS]},
+    {'name': 'extract_acf_data', 'script': 'extract_acf_data.py', 'sites': True,
+     'inputs': [SQL_FILE, ALBUMS, 'data/products_raw.json'],
+     'outputs': [ALBUMS]},
+    {'name': 'update_albums_from_csv', 'script': 'update_albums_from_csv.py',
+     'inputs': [PRESS_CSV, ALBUMS],
+     'outputs': [ALBUMS]},
+    {'name': 'fix_bandcamp_embeds', 'script': 'fix_bandcamp_embeds.py',
+     'inputs': [ALBUMS],
+     'outputs': [ALBUMS]},
+    {'name': 'update_bandcamp_embeds', 'script': 'update_bandcamp_embeds.py',
+     'inputs': [ALBUMS],
+     'outputs': [ALBUMS]},
+    {'name': 'images', 'script': 'images.py',
+     'inputs': [ALBUMS, ARTISTS] + IMAGES,
+     'outputs': [ALBUMS, ARTISTS] + IMAGES},
+    {'name': 'placeholders', 'script': 'placeholders.py',
+     'inputs': [ALBUMS, ARTISTS] + IMAGES,
+     'optional_inputs': ['data/placeholders.json'],
+     'outputs': [ALBUMS, ARTISTS, 'data/placeholders.json']},
+    {'name': 'related', 'script': 'related.py',
+     'inputs': [ALBUMS],
+     'optional_inputs': ['data/posts.json'],
+     'outputs': [ALBUMS]},
+    {'name': 'people', 'script': 'people.py',
+     'inputs': [ALBUMS],
+     'outputs': ['data/people.json']},
+    {'name': 'generate_pages', 'script': 'generate_pages.py', 'sites': True,
+     'inputs': [ALBUMS, ARTISTS, TIMELINE, 'data/timeline_rules.json', 'assets/css/style.css', 'index.html',
+                'assets/js/app.js', SW_TEMPLATE],
+     'optional_inputs': ['assets/fonts/fonts.css', 'data/people.json'] + SW_INPUTS,
+     'outputs': ['pages', 'index.html', 'sw.js', 'data/grid.json']},
+    {'name': 'build_fonts', 'script': 'build_fonts.py', 'optional': True,
+     'inputs': ['pages', 'index.html', ALBUMS, ARTISTS, TIMELINE, 'assets/fonts/src'],
+     'outputs': ['assets/fonts/fonts.css']},
+    {'name': 'optimize_site', 'script': 'optimize_site.py', 'optional': True,
+     'inputs': ['pages', 'index.html', 'assets/css/style.css', 'assets/js/app.js', SW_TEMPLATE],
+     'optional_inputs': SW_INPUTS,
+     'outputs': ['pages', 'assets/css/style.min.css', 'sw.js']},
+]
+
+# ==========================================================================
+# Sites
+# ==========================================================================
+
+def site_stage(stage, sites):
+    """A stage with its site paths and SQL backup repeated for each configured site."""
+    def expand(paths):
+        expanded = []
+        for path in paths:
+            if path == SQL_FILE:
+                expanded += [site['sql_file'] for site in sites]
+            elif os.path.isabs(path):
+                expanded.append(path)
+            else:
+                expanded += [os.path.join(site['site_path'], path) for site in sites]
+        return list(dict.fromkeys(expanded))
+
+    return dict(stage, inputs=expand(stage['inputs']),
+                optional_inputs=expand(stage.get('optional_inputs', [])) + [SITES_FILE],
+                outputs=expand(stage['outputs']))
+
+
+def configured_stages(stages, sites):
+    """The stages, with those marked 'sites' tracking every site when there are any."""
+    if not sites:
+        return stages
+    return [site_stage(stage, sites) if stage.get('sites') else stage for stage in stages]
+
+# ==========================================================================
+# Fingerprints
+# ==========================================================================
+
+def site_path(path):
+    return os.path.join(SITE_PATH, path)
+
+
+def file_digest(path, hashes):
+    """SHA-256 of a file, reusing the cached hash while its size and mtime are unchanged."""
+    stat = os.stat(path)
+    cached = hashes.get(path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(block)
+    digest = sha256.hexdigest()
+    hashes[path] = [stat.st_size, stat.st_mtime_ns, digest]
+    return digest
+
+
+def path_digest(path, hashes):
+    """Digest of a file, or of every file under a directory, or None if it doesn't exist."""
+    if os.path.isdir(path):
+        combined = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                combined.update(f'{os.path.relpath(full_path, path)}\0{file_digest(full_path, hashes)}\n'.encode())
+        return combined.hexdigest()
+    if os.path.isfile(path):
+        return file_digest(path, hashes)
+    return None
+
+
+def local_modules(script):
+    """The script and every module in SITE_PATH it imports, directly or not."""
+    found = []
+    pending = [script]
+    while pending:
+        filename = pending.pop()
+        if filename in found:
+            continue
+        found.append(filename)
+        with open(site_path(filename), 'r') as f:
+            tree = ast.parse(f.read(), filename)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = name.split('.')[0] + '.py'
+                if os.path.exists(site_path(module)):
+                    pending.append(module)
+    return sorted(found)
+
+
+def stage_reads(stage):
+    return list(dict.fromkeys(stage['inputs'] + stage.get('optional_inputs', [])))
+
+
+def stage_inputs(stage):
+    return local_modules(stage['script']) + stage_reads(stage)
+
+
+def fingerprint(stage, hashes):
+    return {path: path_digest(site_path(path), hashes) for path in stage_inputs(stage)}
+
+
+def rewritten_inputs(stage, hashes):
+    """Digests of the inputs a stage also writes, as it left them."""
+    return {path: path_digest(site_path(path), hashes)
+            for path in stage_reads(stage) if path in stage['outputs']}
+
+
+def missing_outputs(stage):
+    return [path for path in stage['outputs'] if not os.path.exists(site_path(path))]
+
+
+def is_up_to_date(stage, record, hashes):
+    """Whether a stage's outputs all exist and its inputs are as it saw them or left them."""
+    if not record or 'inputs' not in record or missing_outputs(stage):
+        return False
+    seen, wrote = record['inputs'], record.get('wrote', {})
+    current = fingerprint(stage, hashes)
+    return set(current) == set(seen) and all(
+        digest == seen[path] or (path in wrote and digest == wrote[path])
+        for path, digest in current.items())
+
+# ==========================================================================
+# Scheduling
+# ==========================================================================
+
+def overlaps(a, b):
+    """Whether two paths are the same or one contains the other."""
+    a, b = site_path(a), site_path(b)
+    return a == b or a.startswith(b + os.sep) or b.startswith(a + os.sep)
+
+
+def touches(paths, others):
+    return any(overlaps(a, b) for a in paths for b in others)
+
+
+def dependencies(stages):
+    """{name: [earlier stages it waits for]}: any writing what it uses, or reading what it writes."""
+    deps = {}
+    for index, stage in enumerate(stages):
+        deps[stage['name']] = [
+            earlier['name'] for earlier in stages[:index]
+            if touches(earlier['outputs'], stage_reads(stage) + stage['outputs'])
+            or touches(stage_reads(earlier), stage['outputs'])
+        ]
+    return deps
+
+
+def produced_by_earlier(stages, index, path):
+    return any(touches(stage['outputs'], [path]) for stage in stages[:index])
+
+
+def missing_inputs(stages, index):
+    """Inputs of a stage that don't exist and that no earlier stage writes."""
+    return [path for path in stages[index]['inputs']
+            if not os.path.exists(site_path(path)) and not produced_by_earlier(stages, index, path)]
+
+
+def run_stage(stage):
+    """Run a stage's script, returning (ok, output)."""
+    result = subprocess.run([sys.executable, site_path(stage['script'])], cwd=SITE_PATH,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    return result.returncode == 0, result.stdout
+
+
+def build(stages, force=False, dry_run=False, jobs=None):
+    """Run the out-of-date stages, recording fingerprints of those that succeed."""
+    state = {'hashes': {}, 'stages': {}}
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE, 'r') as f:
+            state = json.load(f)
+    hashes = state['hashes']
+
+    deps = dependencies(stages)
+    by_name = {stage['name']: stage for stage in stages}
+    futures = {}
+    results = {}
+    records = {}
+    print_lock = threading.Lock()
+    slots = threading.Semaphore(jobs or os.cpu_count() or 1)
+
+    def report(message, level='info', **fields):
+        with print_lock:
+            progress.log(level, message, **fields)
+
+    def process(index):
+        stage = stages[index]
+        name = stage['name']
+        for dep in deps[name]:
+            if dep in futures and futures[dep].result() == 'failed':
+                report(f"  {name}: skipped ({dep} failed)", 'warning', build_stage=name)
+                return 'failed'
+
+        missing = missing_inputs(stages, index)
+        if missing:
+            report(f"  {name}: skipped, missing {', '.join(missing)}", 'warning', build_stage=name, missing=missing)
+            return 'missing'
+
+        # In a dry run nothing is rewritten, so a stage reading what a
+        # would-run stage writes is out of date whatever its fingerprint says
+        stale = [dep for dep in deps[name] if futures[dep].result() == 'would-run'
+                 and touches(by_name[dep]['outputs'], stage_reads(stage))]
+        if not force and not stale and is_up_to_date(stage, state['stages'].get(name), hashes):
+            return 'clean'
+        if dry_run:
+            after = f" (after {', '.join(stale)})" if stale else ''
+            report(f"  {name}: would run{after}", build_stage=name, after=stale)
+            return 'would-run'
+
+        with slots:
+            report(f"  {name}: running", build_stage=name)
+            start = time.perf_counter()
+            seen = fingerprint(stage, hashes)
+            ok, output = run_stage(stage)
+            elapsed = time.perf_counter() - start
+        # A failed stage runs again next time, whatever it left behind
+        records[name] = {'inputs': seen, 'wrote': rewritten_inputs(stage, hashes)} if ok else None
+        with print_lock:
+            # The script logs in the same format, so its output is passed through
+            if progress.JSON_LOG:
+                sys.stdout.write(output)
+            elif output.strip():
+                print(f"\n--- {name} ({elapsed:.1f}s) ---\n{output.rstrip()}\n", flush=True)
+            if not ok:
+                progress.error(f"  {name}: FAILED", build_stage=name)
+        return 'ran' if ok else 'failed'
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(stages)) as pool:
+        for index, stage in enumerate(stages):
+            futures[stage['name']] = pool.submit(process, index)
+        for name, future in futures.items():
+            results[name] = future.result()
+
+    if not dry_run:
+        for name, record in records.items():
+            if record:
+                state['stages'][name] = record
+            else:
+                state['stages'].pop(name, None)
+        with open(STATE_FILE, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    ran = [name for name, result in results.items() if result == 'ran']
+    would_run = [name for name, result in results.items() if result == 'would-run']
+    failed = [name for name, result in results.items() if result == 'failed']
+    clean = sum(result == 'clean' for result in results.values())
+    if dry_run:
+        progress.info(f"Dry run: {len(would_run)} would run, {clean} up to date",
+                      would_run=would_run, clean=clean)
+        return True
+    progress.info(f"Build finished in {time.perf_counter() - start:.2f}s: "
+                  f"{len(ran)} ran, {len(failed)} failed, {clean} up to date",
+                  ran=ran, failed=failed, clean=clean)
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the out-of-date stages of the site build.')
+    parser.add_argument('stages', nargs='*', help='stages to consider (default: all non-optional)')
+    parser.add_argument('--all', action='store_true', help='include optional stages')
+    parser.add_argument('--force', action='store_true', help='run the selected stages even if up to date')
+    parser.add_argument('--dry-run', action='store_true', help='list the stages that would run')
+    parser.add_argument('--jobs', type=int, help='stages run at once (default: CPU count)')
+    progress.add_arguments(parser)
+    args = parser.parse_args()
+    progress.apply_arguments(args)
+
+    names = [stage['name'] for stage in STAGES]
+    unknown = [name for name in args.stages if name not in names]
+    if unknown:
+        parser.error(f"unknown stage {', '.join(unknown)} (choose from {', '.join(names)})")
+
+    if args.stages:
+        stages = [stage for stage in STAGES if stage['name'] in args.stages]
+    else:
+        stages = [stage for stage in STAGES if args.all or not stage.get('optional')]
+
+    if not build(configured_stages(stages, load_sites()), args.force, args.dry_run, args.jobs):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Build self-hosted, subsetted web fonts for the Static Motor Recordings archive.
+
+Reads the original font files from assets/fonts/src, keeps only the glyphs
+that appear in the generated pages and the catalog data (which app.js renders
+client-side), and writes WOFF2 files plus an @font-face stylesheet to
+assets/fonts. generate_pages.py switches from Google Fonts to these files
+once assets/fonts/fonts.css exists.
+
+Requires fontTools and brotli: pip install fonttools brotli
+"""
+
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+try:
+    from fontTools import subset
+    import brotli  # noqa: F401 - needed by fontTools to write WOFF2
+except ImportError:
+    subset = None
+
+from optimize_site import find_pages
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+FONT_SOURCE_DIR = 'assets/fonts/src'
+FONT_DIR = 'assets/fonts'
+FONT_CSS = 'assets/fonts/fonts.css'
+DATA_FILES = ['albums.json', 'artists.json', 'timeline.json']
+
+# (family, weight, source file) for every face the stylesheet uses
+FONT_FACES = [
+    ('Inter', 400, 'Inter-Regular.ttf'),
+    ('Inter', 500, 'Inter-Medium.ttf'),
+    ('Inter', 600, 'Inter-SemiBold.ttf'),
+    ('Inter', 700, 'Inter-Bold.ttf'),
+    ('Inter', 900, 'Inter-Black.ttf'),
+    ('JetBrains Mono', 400, 'JetBrainsMono-Regular.ttf'),
+    ('JetBrains Mono', 500, 'JetBrainsMono-Medium.ttf'),
+    ('JetBrains Mono', 700, 'JetBrainsMono-Bold.ttf'),
+]
+
+# Always kept, so small copy edits don't need a font rebuild
+BASE_CHARACTERS = ''.join(chr(c) for c in range(0x20, 0x7f)) + ' ©–—‘’“”•…←→'
+
+# Attributes whose text can be shown to the visitor
+TEXT_ATTRS = {'alt', 'title', 'aria-label', 'placeholder', 'value'}
+
+
+def font_file(family, weight):
+    """Output filename of a subsetted face, e.g. inter-700.woff2."""
+    return f"{re.sub(r'[^a-z0-9]+', '-', family.lower())}-{weight}.woff2"
+
+
+class TextCollector(HTMLParser):
+    """Collect every character a page can display."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.characters = set()
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self.skip += 1
+        for name, value in attrs:
+            if name in TEXT_ATTRS and value:
+                self.characters.update(value)
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self.skip:
+            self.skip -= 1
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.characters.update(data)
+
+
+def json_strings(value):
+    """Yield every string in a JSON document."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from json_strings(item)
+
+
+def collect_characters(base_path):
+    """Characters used by the generated pages and the catalog data."""
+    characters = set(BASE_CHARACTERS)
+
+    for path in find_pages(base_path):
+        collector = TextCollector()
+        with open(path, 'r') as f:
+            collector.feed(f.read())
+        collector.close()
+        characters |= collector.characters
+
+    for filename in DATA_FILES:
+        with open(os.path.join(base_path, 'data', filename), 'r') as f:
+            for text in json_strings(json.load(f)):
+                characters.update(text)
+
+    return {c for c in characters if not c.isspace() or c in ' \u00a0'}
+
+
+def subset_font(source, target, codepoints):
+    """Write a WOFF2 subset of a font keeping only the given codepoints."""
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.desubroutinize = True
+    font = subset.load_font(source, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, target, options)
+    font.close()
+
+
+def font_face_css(family, weight):
+    """@font-face rule for a subsetted face, with a URL relative to fonts.css."""
+    return f'''@font-face {{
+  font-family: '{family}';
+  font-style: normal;
+  font-weight: {weight};
+  font-display: swap;
+  src: url('{font_file(family, weight)}') format('woff2');
+}}
+'''
+
+
+def main():
+    progress.configure_from_args()
+    if subset is None:
+        progress.warning("fontTools and brotli are required: pip install fonttools brotli")
+        return
+
+    codepoints = sorted(ord(c) for c in collect_characters(BASE_PATH))
+    progress.info(f"Collected {len(codepoints)} characters from pages and catalog", characters=len(codepoints))
+
+    os.makedirs(os.path.join(BASE_PATH, FONT_DIR), exist_ok=True)
+
+    progress.info("Subsetting fonts...")
+    rules = []
+    for family, weight, filename in FONT_FACES:
+        source = os.path.join(BASE_PATH, FONT_SOURCE_DIR, filename)
+        if not os.path.exists(source):
+            progress.warning(f"Missing: {FONT_SOURCE_DIR}/{filename}")
+            continue
+        target = os.path.join(BASE_PATH, FONT_DIR, font_file(family, weight))
+        subset_font(source, target, codepoints)
+        progress.debug(f"{filename}: {os.path.getsize(source):,} -> {os.path.getsize(target):,} bytes")
+        rules.append(font_face_css(family, weight))
+
+    if not rules:
+        progress.warning("No fonts found; leaving fonts.css untouched.")
+        return
+
+    with open(os.path.join(BASE_PATH, FONT_CSS), 'w') as f:
+        f.write(''.join(rules))
+    progress.info(f"Wrote {FONT_CSS} with {len(rules)} faces", faces=len(rules))
+
+if __name__ == '__main__':
+    main()
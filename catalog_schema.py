@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Declarative schema for the catalog data, compiled into fast validators.
+
+Each schema maps a field name to a spec:
+
+    {'type': str, 'required': True, 'pattern': SLUG, 'choices': {...},
+     'items': <spec for list items>, 'fields': <schema for nested objects>}
+
+At most one of pattern, choices, items and fields applies to a value.
+Fields are optional and may be null unless 'required' is set. Extra fields
+are allowed. compile_schema() turns a schema into the source of one flat
+Python function, so validating a record is a straight run of type checks
+with no per-field dispatch; the whole catalog is checked before
+generate_pages.py renders anything.
+"""
+
+import json
+import os
+import re
+import time
+
+import progress
+from timeline_rules import load_rule_types
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+
+SLUG = r'[a-z0-9]+(?:-[a-z0-9]+)*'
+DATE = r'\d{4}-\d{2}-\d{2}'
+HEX_COLOR = r'#[0-9a-f]{6}'
+
+TYPE_NAMES = {
+    str: 'string',
+    int: 'integer',
+    bool: 'boolean',
+    list: 'list',
+    dict: 'object',
+}
+
+# ==========================================================================
+# Schemas
+# ==========================================================================
+
+IMAGE_INFO = {
+    'width': {'type': int, 'required': True},
+    'height': {'type': int, 'required': True},
+    'derivatives': {'type': list, 'items': {'type': dict, 'fields': {
+        'src': {'type': str, 'required': True},
+        'width': {'type': int, 'required': True},
+    }}},
+}
+
+EMBED = {
+    'provider': {'type': str, 'required': True, 'choices': {'bandcamp', 'soundcloud', 'youtube'}},
+    'id': {'type': str, 'required': True},
+    'size': {'type': str, 'choices': {'small', 'large'}},
+    'url': {'type': str},
+    'title': {'type': str},
+    'playlist': {'type': bool},
+}
+
+ALBUM = {
+    'name': {'type': str, 'required': True},
+    'artist': {'type': str, 'required': True},
+    'slug': {'type': str, 'required': True, 'pattern': SLUG},
+    'artistSlug': {'type': str, 'required': True, 'pattern': SLUG},
+    'releaseDate': {'type': str, 'pattern': DATE},
+    'catalogNumber': {'type': str},
+    'formats': {'type': list, 'items': {'type': str, 'required': True}},
+    'coverImage': {'type': str},
+    'coverImageInfo': {'type': dict, 'fields': IMAGE_INFO},
+    'coverImageColor': {'type': str, 'pattern': HEX_COLOR},
+    'featuredQuote': {'type': dict, 'fields': {
+        'text': {'type': str},
+        'source': {'type': str},
+    }},
+    'description': {'type': str},
+    'tracks': {'type': list, 'items': {'type': dict, 'required': True, 'fields': {
+        'number': {'type': int, 'required': True},
+        'title': {'type': str, 'required': True},
+    }}},
+    'credits': {'type': str},
+    'press': {'type': list, 'items': {'type': dict, 'required': True, 'fields': {
+        'text': {'type': str, 'required': True},
+        'source': {'type': str},
+        'url': {'type': str},
+    }}},
+    'bandcampUrl': {'type': str},
+    'soundcloudPlaylist': {'type': str},
+    'youtubePlaylist': {'type': str},
+    'youtubeVideo': {'type': str},
+    'relatedPosts': {'type': list, 'items': {'type': dict, 'required': True, 'fields': {
+        'id': {'type': str},
+        'title': {'type': str},
+        'date': {'type': str, 'pattern': DATE},
+        'excerpt': {'type': str},
+    }}},
+    'bandcampEmbed': {'type': dict, 'fields': EMBED},
+    'soundcloudEmbed': {'type': dict, 'fields': EMBED},
+    'related': {'type': list, 'items': {'type': str, 'required': True, 'pattern': SLUG}},
+}
+
+ARTIST = {
+    'name': {'type': str, 'required': True},
+    'slug': {'type': str, 'required': True, 'pattern': SLUG},
+    'bio': {'type': str},
+    'quote': {'type': str},
+    'heroImage': {'type': str},
+    'heroImageInfo': {'type': dict, 'fields': IMAGE_INFO},
+    'heroImageColor': {'type': str, 'pattern': HEX_COLOR},
+    'bandcampUrl': {'type': str},
+    'soundcloudPlaylist': {'type': str},
+    'youtubePlaylist': {'type': str},
+    'youtubeEmbed': {'type': str},
+    'albums': {'type': list, 'items': {'type': dict, 'required': True, 'fields': {
+        'name': {'type': str, 'required': True},
+        'slug': {'type': str, 'required': True, 'pattern': SLUG},
+    }}},
+}
+
+TIMELINE_EVENT = {
+    'date': {'type': str, 'pattern': DATE},
+    'title': {'type': str, 'required': True},
+    # Choices are the types timeline_rules.json can assign; see timeline_validator()
+    'type': {'type': str},
+    'categories': {'type': list, 'items': {'type': str, 'required': True}},
+    'tags': {'type': list, 'items': {'type': str, 'required': True}},
+    'excerpt': {'type': str},
+}
+
+PERSON = {
+    'name': {'type': str, 'required': True},
+    'slug': {'type': str, 'required': True, 'pattern': SLUG},
+    'credits': {'type': list, 'required': True, 'items': {'type': dict, 'required': True, 'fields': {
+        'album': {'type': str, 'required': True, 'pattern': SLUG},
+        'roles': {'type': list, 'items': {'type': str, 'required': True}},
+    }}},
+}
+
+# ==========================================================================
+# Compiler
+# ==========================================================================
+
+def _emit_value(lines, constants, spec, var, path, indent, depth):
+    """Emit checks for one value held in `var`, whose location is the f-string fragment `path`."""
+    pad = '    ' * indent
+    expected = spec['type']
+
+    if spec.get('required'):
+        lines.append(f"{pad}if {var} is None:")
+        lines.append(f"{pad}    errors.append(f'{path}: is required')")
+    else:
+        lines.append(f"{pad}if {var} is None:")
+        lines.append(f"{pad}    pass")
+
+    lines.append(f"{pad}elif type({var}) is not {expected.__name__}:")
+    lines.append(f"{pad}    errors.append(f'{path}: expected {TYPE_NAMES[expected]}, got {{type({var}).__name__}}')")
+
+    if 'pattern' in spec:
+        # Values seen to match are remembered, so repeated dates and slugs skip the regex
+        name = f'PATTERN_{len(constants)}'
+        constants[name] = re.compile(spec['pattern'] + r'\Z')
+        constants[f'{name}_SEEN'] = set()
+        lines.append(f"{pad}elif {var} in {name}_SEEN:")
+        lines.append(f"{pad}    pass")
+        lines.append(f"{pad}elif {name}.match({var}):")
+        lines.append(f"{pad}    {name}_SEEN.add({var})")
+        lines.append(f"{pad}else:")
+        lines.append(f"{pad}    errors.append(f'{path}: {{{var}!r}} is not in the expected format')")
+
+    elif 'choices' in spec:
+        name = f'CHOICES_{len(constants)}'
+        constants[name] = frozenset(spec['choices'])
+        lines.append(f"{pad}elif {var} not in {name}:")
+        lines.append(f"{pad}    errors.append(f'{path}: {{{var}!r}} is not one of {', '.join(sorted(spec['choices']))}')")
+
+    elif 'items' in spec:
+        index, item = f'i{depth}', f'v{depth + 1}'
+        lines.append(f"{pad}else:")
+        lines.append(f"{pad}    for {index}, {item} in enumerate({var}):")
+        _emit_value(lines, constants, spec['items'], item, f'{path}[{{{index}}}]', indent + 2, depth + 1)
+
+    elif 'fields' in spec:
+        lines.append(f"{pad}else:")
+        _emit_fields(lines, constants, spec['fields'], var, path, indent + 1, depth + 1)
+
+
+def _emit_fields(lines, constants, schema, var, path, indent, depth):
+    """Emit checks for every field of the object held in `var`."""
+    pad = '    ' * indent
+    value, get = f'v{depth}', f'get{depth}'
+    lines.append(f"{pad}{get} = {var}.get")
+    for key, spec in schema.items():
+        lines.append(f"{pad}{value} = {get}({key!r})")
+        _emit_value(lines, constants, spec, value, f'{path}.{key}', indent, depth)
+
+
+def compile_schema(schema, name='validate'):
+    """Compile a record schema into validate(record, path, errors), appending error strings."""
+    constants = {}
+    lines = [
+        # Builtins are bound as defaults so the checks use fast local lookups
+        f"def {name}(record, path, errors, type=type, str=str, int=int, bool=bool, list=list, dict=dict, enumerate=enumerate):",
+        "    if type(record) is not dict:",
+        "        errors.append(f'{path}: expected object, got {type(record).__name__}')",
+        "        return",
+    ]
+    _emit_fields(lines, constants, schema, 'record', '{path}', 1, 0)
+    source = '\n'.join(lines)
+    namespace = dict(constants)
+    exec(compile(source, f'<schema {name}>', 'exec'), namespace)
+    validator = namespace[name]
+    validator.source = source
+    return validator
+
+
+validate_album = compile_schema(ALBUM, 'validate_album')
+validate_artist = compile_schema(ARTIST, 'validate_artist')
+validate_timeline_event = compile_schema(TIMELINE_EVENT, 'validate_timeline_event')
+validate_person = compile_schema(PERSON, 'validate_person')
+
+# Timeline validators by the event types they accept
+_timeline_validators = {}
+
+def timeline_validator(types):
+    """A timeline event validator accepting only the given types, or any type if None."""
+    if types is None:
+        return validate_timeline_event
+    types = frozenset(types)
+    if types not in _timeline_validators:
+        schema = dict(TIMELINE_EVENT, type={'type': str, 'choices': set(types)})
+        _timeline_validators[types] = compile_schema(schema, 'validate_timeline_event')
+    return _timeline_validators[types]
+
+# ==========================================================================
+# Catalog
+# ==========================================================================
+
+def record_label(collection, index, record):
+    """Name a record by its slug where it has one, for error messages."""
+    slug = record.get('slug') if type(record) is dict else None
+    return f'{collection}[{slug}]' if slug else f'{collection}[{index}]'
+
+
+def validate_records(collection, records, validator, errors):
+    """Validate every record of one collection."""
+    if type(records) is not list:
+        errors.append(f'{collection}: expected list, got {type(records).__name__}')
+        return
+    for index, record in enumerate(records):
+        validator(record, record_label(collection, index, record), errors)
+
+
+def validate_catalog(albums, artists, timeline, people=None, timeline_types=None):
+    """Every schema error and duplicate slug in the catalog, as readable strings.
+
+    timeline_types are the event types allowed, normally those of
+    timeline_rules.json (see load_rule_types).
+    """
+    errors = []
+    validate_records('albums', albums, validate_album, errors)
+    validate_records('artists', artists, validate_artist, errors)
+    validate_records('timeline', timeline, timeline_validator(timeline_types), errors)
+    if people is not None:
+        validate_records('people', people, validate_person, errors)
+
+    # Slugs name output files, so they must be unique
+    for collection, records in (('albums', albums), ('artists', artists), ('people', people or [])):
+        seen = set()
+        for record in records if type(records) is list else []:
+            slug = record.get('slug') if type(record) is dict else None
+            if type(slug) is str:
+                if slug in seen:
+                    errors.append(f'{collection}[{slug}].slug: duplicate slug')
+                seen.add(slug)
+
+    return errors
+
+
+def main():
+    progress.configure_from_args()
+    catalog = {}
+    for name in ('albums', 'artists', 'timeline'):
+        with open(os.path.join(BASE_PATH, 'data', f'{name}.json'), 'r') as f:
+            catalog[name] = json.load(f)
+    people_path = os.path.join(BASE_PATH, 'data', 'people.json')
+    if os.path.exists(people_path):
+        with open(people_path, 'r') as f:
+            catalog['people'] = json.load(f)
+
+    timeline_types = load_rule_types(os.path.join(BASE_PATH, 'data', 'timeline_rules.json'))
+
+    start = time.perf_counter()
+    errors = validate_catalog(catalog['albums'], catalog['artists'], catalog['timeline'], catalog.get('people'),
+                              timeline_types)
+    elapsed = time.perf_counter() - start
+
+    records = sum(len(records) for records in catalog.values())
+    progress.info(f"Validated {records} records in {elapsed * 1000:.1f} ms", records=records)
+    for error in errors:
+        progress.error(error)
+    progress.info(f"{len(errors)} errors" if errors else "Catalog is valid.", errors=len(errors))
+
+if __name__ == '__main__':
+    main()
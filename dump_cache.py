@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Materialise the WordPress tables the extract scripts use into SQLite.
+
+The first run imports wp_posts, wp_postmeta, wp_terms and the Shopp tables
+from the mysqldump into <dump>.sqlite in a single pass, with indexes on
+post_type, meta_key and post_id. Later runs open that file directly, so the extractors can
+query rows instead of re-parsing the whole dump.
+
+Compressed dumps are read through sql_dump.open_dump(). The cache records
+the SHA-256 of the dump file it was built from and is rebuilt when the dump
+changes. The dump's size and mtime are stored alongside, so an unchanged
+dump is recognised without hashing it again.
+
+Values are stored as they appear in the dump (backslash escapes kept), the
+same as sql_dump.read_table_rows() returns them.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+from sql_dump import CHUNK_SIZE, batched, open_dump, parse_chunks, skip_line, stream_insert_chunks
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive'
+SQL_FILE = os.path.join(BASE_PATH, 'backup-1.23.2026_18-29-26_staticmo/mysql/staticmo_wplive.sql')
+
+CACHED_TABLES = ['wp_posts', 'wp_postmeta', 'wp_terms']
+CACHED_TABLE_PREFIXES = ['wp_shopp_']
+
+COMPRESSED_EXTENSIONS = ['.gz', '.bz2', '.xz', '.zst']
+
+INDEXES = {
+    'wp_posts': ['post_type', 'post_name'],
+    'wp_postmeta': ['meta_key', 'post_id'],
+    'wp_terms': ['slug'],
+}
+
+CREATE_TABLE = re.compile(rb'CREATE TABLE `([^`]+)` \(')
+COLUMN = re.compile(rb'\s*`([^`]+)`\s+(\w+)')
+INSERT_INTO = re.compile(rb'INSERT INTO `([^`]+)` VALUES ')
+
+# MySQL integer column types, stored as INTEGER so ids compare as numbers
+INTEGER_TYPES = re.compile(r'(?:tiny|small|medium|big)?int', re.IGNORECASE)
+
+
+def cache_path(sql_file):
+    """<dump>.sqlite beside the dump, e.g. staticmo_wplive.sqlite for staticmo_wplive.sql.gz."""
+    base, ext = os.path.splitext(sql_file)
+    if ext in COMPRESSED_EXTENSIONS:
+        base, ext = os.path.splitext(base)
+    return base + '.sqlite'
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_cached_table(table):
+    return table in CACHED_TABLES or any(table.startswith(prefix) for prefix in CACHED_TABLE_PREFIXES)
+
+
+def column_affinity(mysql_type):
+    """SQLite column type for a MySQL one; INTEGER lets ids be compared as numbers."""
+    return 'INTEGER' if INTEGER_TYPES.fullmatch(mysql_type) else 'TEXT'
+
+
+def import_dump(db, sql_file, workers=None, chunk_size=CHUNK_SIZE):
+    """Create and fill the cached tables in one pass over the dump; returns {table: [(column, type)]}.
+
+    Each table is created when its CREATE TABLE statement ends, and each
+    INSERT line is routed by table name to that table's executemany, so the
+    dump is read (and decompressed) once however many tables are cached.
+    Lines are read in pieces of chunk_size and INSERTs parsed a chunk per
+    worker at a time, so memory use stays bounded however long the
+    extended INSERT lines are. Rows with the wrong number of fields for
+    their table are left out, with a warning giving the count.
+    """
+    workers = workers or os.cpu_count() or 1
+    tables = {}
+    inserts = {}
+    dropped = {}
+    creating = None
+    with open_dump(sql_file) as f:
+        for line in iter(lambda: f.readline(chunk_size), b''):
+            if creating is not None:
+                match = COLUMN.match(line)
+                if match:
+                    tables[creating].append((match.group(1).decode(), column_affinity(match.group(2).decode())))
+                    continue
+                inserts[creating] = create_table(db, creating, tables[creating])
+                creating = None
+
+            if line.startswith(b'INSERT INTO'):
+                match = INSERT_INTO.match(line)
+                table = match.group(1).decode() if match else None
+                if table not in inserts:
+                    skip_line(f, line, chunk_size)
+                    continue
+                width = len(tables[table])
+                chunks = stream_insert_chunks(f, line[match.end():], chunk_size)
+                for batch in batched(chunks, workers):
+                    tasks = [(sql_file, chunk, ()) for chunk in batch]
+                    db.executemany(inserts[table], rows_of_width(parse_chunks(tasks, workers), width, dropped, table))
+                continue
+
+            if line.startswith(b'CREATE TABLE'):
+                match = CREATE_TABLE.match(line)
+                table = match.group(1).decode() if match else None
+                if table and is_cached_table(table):
+                    tables[table] = []
+                    creating = table
+            skip_line(f, line, chunk_size)
+
+    for table, count in dropped.items():
+        progress.warning(f"{table}: skipped {count} row{'s' if count != 1 else ''} without {len(tables[table])} fields",
+                         table=table, rows=count)
+    return tables
+
+
+def rows_of_width(rows, width, dropped, table):
+    """The rows with width fields, counting the others in dropped[table]."""
+    for fields in rows:
+        if len(fields) == width:
+            yield fields
+        else:
+            dropped[table] = dropped.get(table, 0) + 1
+
+
+def create_table(db, table, columns):
+    """Create a cached table, returning the statement that inserts one of its rows."""
+    column_defs = ', '.join(f'"{name}" {affinity}' for name, affinity in columns)
+    db.execute(f'CREATE TABLE "{table}" ({column_defs})')
+    placeholders = ', '.join('?' * len(columns))
+    return f'INSERT INTO "{table}" VALUES ({placeholders})'
+
+
+def build_cache(sql_file, path, digest):
+    """Import the cached tables into a fresh SQLite file at path."""
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    db = sqlite3.connect(temp_path)
+    db.execute('PRAGMA journal_mode = OFF')
+    db.execute('PRAGMA synchronous = OFF')
+
+    for table, columns in import_dump(db, sql_file).items():
+        names = {name for name, _ in columns}
+        for column in INDEXES.get(table, []):
+            if column in names:
+                db.execute(f'CREATE INDEX "{table}_{column}" ON "{table}" ("{column}")')
+
+        count = db.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        progress.debug(f"{table}: {count} rows", table=table, rows=count)
+
+    stat = os.stat(sql_file)
+    db.execute('CREATE TABLE dump_source (sha256 TEXT, size INTEGER, mtime_ns INTEGER)')
+    db.execute('INSERT INTO dump_source VALUES (?, ?, ?)', (digest, stat.st_size, stat.st_mtime_ns))
+    db.commit()
+    db.close()
+    os.replace(temp_path, path)
+
+
+def cached_source(db):
+    try:
+        return db.execute('SELECT sha256, size, mtime_ns FROM dump_source').fetchone()
+    except sqlite3.DatabaseError:
+        return None
+
+
+def open_dump_cache(sql_file=SQL_FILE):
+    """A connection to the SQLite cache of a dump, importing the dump first if needed."""
+    path = cache_path(sql_file)
+    stat = os.stat(sql_file)
+
+    if os.path.exists(path):
+        db = sqlite3.connect(path)
+        source = cached_source(db)
+        if source and source[1:] == (stat.st_size, stat.st_mtime_ns):
+            return db
+        # Size or mtime changed: only rebuild if the contents did
+        digest = file_hash(sql_file)
+        if source and source[0] == digest:
+            db.execute('UPDATE dump_source SET size = ?, mtime_ns = ?', (stat.st_size, stat.st_mtime_ns))
+            db.commit()
+            return db
+        db.close()
+    else:
+        digest = file_hash(sql_file)
+
+    progress.info(f"Importing {os.path.basename(sql_file)} into {path}...")
+    start = time.perf_counter()
+    build_cache(sql_file, path, digest)
+    progress.info(f"Imported in {time.perf_counter() - start:.1f}s")
+    return sqlite3.connect(path)
+
+
+def select_rows(sql_file, table, column, values):
+    """Rows of a cached table whose column is one of values, in dump order."""
+    db = open_dump_cache(sql_file)
+    placeholders = ', '.join('?' * len(values))
+    query = f'SELECT * FROM "{table}" WHERE "{column}" IN ({placeholders}) ORDER BY rowid'
+    rows = db.execute(query, list(values)).fetchall()
+    db.close()
+    return rows
+
+
+def main():
+    progress.configure_from_args()
+    start = time.perf_counter()
+    db = open_dump_cache(SQL_FILE)
+    tables = [name for (name,) in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'dump_source' ORDER BY name")]
+    for table in tables:
+        count = db.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+        progress.info(f"{table}: {count} rows", table=table, rows=count)
+    db.close()
+    progress.info(f"Cache ready in {time.perf_counter() - start:.2f}s")
+
+if __name__ == '__main__':
+    main()
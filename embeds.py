@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Structured player embeds for albums.json.
+
+Embeds are stored as records instead of raw iframe HTML:
+
+    {"provider": "bandcamp", "id": "1451702757", "size": "large",
+     "url": "https://thelongwalls.bandcamp.com/album/kowloon",
+     "title": "Kowloon by The Longwalls"}
+
+Raw iframes are parsed once, at ingest, by parse_embed(). The renderers below
+turn records into iframe or click-to-load facade markup at build time, so
+restyling every player is a change here rather than a rewrite of the catalog.
+
+Run directly to convert any legacy iframe strings left in albums.json.
+"""
+
+import json
+import re
+import html
+from urllib.parse import urlsplit
+
+import progress
+
+ALBUMS_JSON = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site/data/albums.json'
+
+EMBED_FIELDS = ['bandcampEmbed', 'soundcloudEmbed']
+
+# House style for every Bandcamp player
+BANDCAMP_STYLE = {
+    'bgcol': 'ffffff',
+    'linkcol': '0687f5',
+    'tracklist': 'false',
+    'artwork': 'none',
+    'transparent': 'true',
+}
+
+# Player height in pixels for each Bandcamp size (with artwork=none)
+BANDCAMP_HEIGHTS = {
+    'small': 42,
+    'large': 120,
+}
+
+SOUNDCLOUD_HEIGHT = 300
+
+YOUTUBE_ALLOW = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture'
+
+# Query parameter appended when a facade is clicked, so one click starts playback
+AUTOPLAY_PARAMS = {
+    'youtube': 'autoplay=1',
+    'soundcloud': 'auto_play=true',
+}
+
+PROVIDER_NAMES = {
+    'bandcamp': 'Bandcamp',
+    'soundcloud': 'SoundCloud',
+    'youtube': 'YouTube',
+}
+
+PLAY_ICON = '''<svg width="20" height="20" viewBox="0 0 24 24" fill="currentColor" aria-hidden="true"><path d="M8 5v14l11-7z"/></svg>'''
+
+# ==========================================================================
+# Records
+# ==========================================================================
+
+def bandcamp_record(album_id, url, title, size='large'):
+    """Build a Bandcamp embed record."""
+    return {
+        'provider': 'bandcamp',
+        'id': str(album_id),
+        'size': size,
+        'url': url,
+        'title': title,
+    }
+
+
+def soundcloud_record(playlist_id, title=None):
+    """Build a SoundCloud playlist embed record."""
+    return {
+        'provider': 'soundcloud',
+        'id': str(playlist_id),
+        'url': f'https://api.soundcloud.com/playlists/{playlist_id}',
+        'title': title,
+    }
+
+
+def youtube_record(video_id=None, playlist_id=None, title=None):
+    """Build a YouTube embed record for a single video or a playlist."""
+    if playlist_id:
+        return {'provider': 'youtube', 'id': playlist_id, 'playlist': True, 'title': title}
+    if video_id:
+        return {'provider': 'youtube', 'id': video_id, 'title': title}
+    return None
+
+
+def parse_embed(embed_html):
+    """Parse a legacy iframe string into an embed record.
+
+    Used at ingest, and for the YouTube iframes still stored on artists.
+    """
+    if not embed_html:
+        return None
+    if isinstance(embed_html, dict):
+        return embed_html
+
+    src_match = re.search(r'src="([^"]+)"', embed_html)
+    src = html.unescape(src_match.group(1)) if src_match else ''
+    link_match = re.search(r'<a href="([^"]+)">([^<]+)</a>', embed_html)
+
+    album_match = re.search(r'bandcamp\.com/EmbeddedPlayer/album=(\d+)', src)
+    if album_match:
+        size_match = re.search(r'/size=(\w+)', src)
+        return bandcamp_record(
+            album_match.group(1),
+            link_match.group(1) if link_match else None,
+            html.unescape(link_match.group(2)) if link_match else None,
+            size_match.group(1) if size_match else 'large')
+
+    playlist_match = re.search(r'api\.soundcloud\.com(?:%2F|/)playlists(?:%2F|/)(\d+)', src)
+    if playlist_match:
+        return soundcloud_record(playlist_match.group(1))
+
+    youtube_match = re.search(r'youtube(?:-nocookie)?\.com/embed/(?:videoseries\?list=([\w-]+)|([\w-]+))', src)
+    if youtube_match:
+        return youtube_record(youtube_match.group(2), youtube_match.group(1))
+
+    raise ValueError(f'Unrecognized embed: {embed_html[:80]}')
+
+# ==========================================================================
+# Renderers
+# ==========================================================================
+
+def embed_src(record):
+    """Player URL for an embed record."""
+    provider = record['provider']
+    if provider == 'bandcamp':
+        options = ''.join(f'{key}={value}/' for key, value in BANDCAMP_STYLE.items())
+        return f"https://bandcamp.com/EmbeddedPlayer/album={record['id']}/size={record.get('size', 'large')}/{options}"
+    if provider == 'soundcloud':
+        return f"https://w.soundcloud.com/player/?visual=true&url=https%3A%2F%2Fapi.soundcloud.com%2Fplaylists%2F{record['id']}&show_artwork=true"
+    if provider == 'youtube':
+        if record.get('playlist'):
+            return f"https://www.youtube.com/embed/videoseries?list={record['id']}"
+        return f"https://www.youtube.com/embed/{record['id']}"
+    raise ValueError(f"Unknown embed provider: {provider}")
+
+
+def embed_height(record):
+    """Fixed pixel height of an audio player, or None for responsive video."""
+    if record['provider'] == 'bandcamp':
+        return BANDCAMP_HEIGHTS.get(record.get('size', 'large'), BANDCAMP_HEIGHTS['large'])
+    if record['provider'] == 'soundcloud':
+        return SOUNDCLOUD_HEIGHT
+    return None
+
+
+def embed_poster(record):
+    """Static preview image available from the provider without loading its player."""
+    if record['provider'] == 'youtube' and not record.get('playlist'):
+        return f"https://i.ytimg.com/vi/{record['id']}/hqdefault.jpg"
+    return None
+
+
+def embed_origins(record, player=True):
+    """Third-party origins a page connects to for an embed: its player and any poster image.
+
+    With player=False only the poster's, for pages that load the player on click.
+    """
+    origins = set()
+    for url in (embed_src(record) if player else None, embed_poster(record)):
+        if url:
+            parts = urlsplit(url)
+            origins.add(f'{parts.scheme}://{parts.netloc}')
+    return origins
+
+
+def render_iframe(record, lazy=True):
+    """Full player iframe for an embed record."""
+    src = html.escape(embed_src(record))
+    title = html.escape(record.get('title') or PROVIDER_NAMES[record['provider']])
+    height = embed_height(record)
+    attrs = f' height="{height}"' if height else ''
+    if record['provider'] == 'youtube':
+        attrs += f' allow="{YOUTUBE_ALLOW}" allowfullscreen'
+    if lazy:
+        attrs += ' loading="lazy"'
+    if record['provider'] == 'bandcamp' and record.get('url'):
+        link = f'<a href="{html.escape(record["url"])}">{title}</a>'
+        return f'<iframe style="border: 0; width: 100%; height: {height}px;" src="{src}" title="{title}"{attrs} seamless>{link}</iframe>'
+    return f'<iframe src="{src}" title="{title}"{attrs}></iframe>'
+
+
+def render_facade(record, label, poster=None):
+    """Lightweight stand-in for a player; app.js swaps in the iframe on click.
+
+    The real iframe is kept in <noscript> with loading="lazy" for visitors without JavaScript.
+    """
+    provider = record['provider']
+    kind = 'video' if provider == 'youtube' else 'audio'
+    title = record.get('title') or PROVIDER_NAMES[provider]
+    height = embed_height(record)
+    poster = embed_poster(record) or poster
+
+    data = f'data-embed-src="{html.escape(embed_src(record))}" data-embed-title="{html.escape(title)}"'
+    if height:
+        data += f' data-embed-height="{height}"'
+    if provider == 'youtube':
+        data += f' data-embed-allow="{YOUTUBE_ALLOW}"'
+    if provider in AUTOPLAY_PARAMS:
+        data += f' data-embed-autoplay="{AUTOPLAY_PARAMS[provider]}"'
+    style = f' style="height: {height}px;"' if height else ''
+    poster_html = f'<img class="embed-facade__poster" src="{poster}" alt="" loading="lazy">' if poster else ''
+    provider_html = f'<span class="embed-facade__provider">{PROVIDER_NAMES[provider]}</span>' if kind == 'audio' else ''
+
+    return f'''<div class="embed-facade embed-facade--{kind}" {data}{style}>
+            {poster_html}
+            <button type="button" class="embed-facade__play" aria-label="{html.escape(label)}">
+              {PLAY_ICON}
+              <span class="embed-facade__label">{html.escape(label)}</span>
+              {provider_html}
+            </button>
+            <noscript>{render_iframe(record)}</noscript>
+          </div>'''
+
+
+# ==========================================================================
+# Ingest
+# ==========================================================================
+
+def normalize_album_embeds(album):
+    """Convert an album's legacy iframe strings into records. Returns True if anything changed."""
+    changed = False
+    for field in EMBED_FIELDS:
+        value = album.get(field)
+        if isinstance(value, str):
+            record = parse_embed(value)
+            if record and not record.get('title'):
+                record['title'] = f"{album['name']} by {album['artist']}"
+            album[field] = record
+            changed = True
+    return changed
+
+
+def main():
+    progress.configure_from_args()
+    progress.info("Loading albums.json...")
+    with open(ALBUMS_JSON, 'r') as f:
+        albums = json.load(f)
+
+    converted = 0
+    for album in albums:
+        if normalize_album_embeds(album):
+            converted += 1
+            progress.debug(f"Converted: {album['name']}", slug=album['slug'])
+
+    progress.info("Saving albums.json...")
+    with open(ALBUMS_JSON, 'w') as f:
+        json.dump(albums, f, indent=2, ensure_ascii=False)
+
+    progress.info(f"Done! Converted embeds for {converted} albums.", converted=converted)
+
+if __name__ == '__main__':
+    main()
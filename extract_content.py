@@ -10,6 +10,9 @@ import html
 from datetime import datetime
 from collections import defaultdict
 
+from timeline_rules import load_rules
+import progress
+
 # WordPress export namespace
 NAMESPACES = {
     'content': 'http://purl.org/rss/1.0/modules/content/',
@@ -260,28 +263,14 @@ def create_artist_data(wp_data, albums):
 
     return list(artists.values())
 
-def create_timeline_data(wp_data):
+def create_timeline_data(wp_data, rules_path):
     """Create timeline data from blog posts for About page."""
 
+    classify = load_rules(rules_path, clean_html)
     timeline = []
 
     for post in wp_data['posts']:
-        # Categorize posts
-        post_type = 'news'
-        title_lower = post['title'].lower() if post['title'] else ''
-
-        if any(word in title_lower for word in ['review', 'love', 'praise', 'kind words', 'best of']):
-            post_type = 'press'
-        elif any(word in title_lower for word in ['out now', 'on sale', 'release', 'vinyl', 'digital']):
-            post_type = 'release'
-        elif any(word in title_lower for word in ['live', 'show', 'concert', 'tour']):
-            post_type = 'live'
-        elif any(word in title_lower for word in ['video', 'premiere']):
-            post_type = 'video'
-        elif any(word in title_lower for word in ['mtv', 'tv', 'placement']):
-            post_type = 'placement'
-        elif any(word in title_lower for word in ['radio', 'wmbr', 'wmfo', 'pipeline']):
-            post_type = 'radio'
+        post_type = classify(post)
 
         timeline.append({
             'date': post['date'],
@@ -302,51 +291,35 @@ def main():
     csv_path = os.path.join(base_path, 'SMR_Catalog_Basic.csv')
     output_path = os.path.join(base_path, 'smr-archive-site/data')
 
-    print("Parsing WordPress XML export...")
-    wp_data = parse_wordpress_xml(xml_path)
-
-    print(f"Found {len(wp_data['posts'])} posts")
-    print(f"Found {len(wp_data['categories'])} categories")
-    print(f"Found {len(wp_data['tags'])} tags")
-    print(f"Found {len(wp_data['attachments'])} attachments")
-
-    print("\nCreating catalog data...")
-    albums = create_catalog_data(wp_data, csv_path)
-    print(f"Created {len(albums)} album entries")
+    progress.configure_from_args()
 
-    print("\nCreating artist data...")
-    artists = create_artist_data(wp_data, albums)
-    print(f"Created {len(artists)} artist entries")
+    with progress.stage('parse') as counts:
+        wp_data = parse_wordpress_xml(xml_path)
+        for key in ('posts', 'categories', 'tags', 'attachments'):
+            counts[key] = len(wp_data[key])
 
-    print("\nCreating timeline data...")
-    timeline = create_timeline_data(wp_data)
-    print(f"Created {len(timeline)} timeline entries")
+    with progress.stage('transform') as counts:
+        albums = create_catalog_data(wp_data, csv_path)
+        counts['albums'] = len(albums)
+        artists = create_artist_data(wp_data, albums)
+        counts['artists'] = len(artists)
+        timeline = create_timeline_data(wp_data, os.path.join(output_path, 'timeline_rules.json'))
+        counts['timeline entries'] = len(timeline)
 
     # Save JSON files
     os.makedirs(output_path, exist_ok=True)
-
-    with open(os.path.join(output_path, 'albums.json'), 'w') as f:
-        json.dump(albums, f, indent=2)
-    print(f"\nSaved albums.json")
-
-    with open(os.path.join(output_path, 'artists.json'), 'w') as f:
-        json.dump(artists, f, indent=2)
-    print(f"Saved artists.json")
-
-    with open(os.path.join(output_path, 'timeline.json'), 'w') as f:
-        json.dump(timeline, f, indent=2)
-    print(f"Saved timeline.json")
-
-    with open(os.path.join(output_path, 'site.json'), 'w') as f:
-        json.dump(wp_data['site'], f, indent=2)
-    print(f"Saved site.json")
-
-    # Save raw posts for reference
-    with open(os.path.join(output_path, 'posts.json'), 'w') as f:
-        json.dump(wp_data['posts'], f, indent=2)
-    print(f"Saved posts.json")
-
-    print("\nDone!")
+    outputs = {
+        'albums.json': albums,
+        'artists.json': artists,
+        'timeline.json': timeline,
+        'site.json': wp_data['site'],
+        'posts.json': wp_data['posts'],  # raw posts, for reference
+    }
+    for filename, data in outputs.items():
+        with open(os.path.join(output_path, filename), 'w') as f:
+            json.dump(data, f, indent=2)
+        progress.debug(f"Saved {filename}")
+    progress.info(f"Saved {', '.join(outputs)}")
 
 if __name__ == '__main__':
     main()
@@ -8,10 +8,19 @@ import json
 import html
 import os
 
+from acf_html import parse_track_items
+from dump_cache import select_rows
+import progress
+from sites import DEFAULT_SITE, load_sites
+from sql_dump import read_table_rows, scan_postmeta
+
 BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive'
 SQL_FILE = os.path.join(BASE_PATH, 'backup-1.23.2026_18-29-26_staticmo/mysql/staticmo_wplive.sql')
 OUTPUT_PATH = os.path.join(BASE_PATH, 'smr-archive-site/data')
 
+# Query the SQLite import of the dump (see dump_cache.py) instead of parsing it
+USE_DUMP_CACHE = True
+
 def clean_html(text):
     """Remove HTML tags and decode entities."""
     if not text:
@@ -28,155 +37,92 @@ def clean_html(text):
     text = re.sub(r'\n{3,}', '\n\n', text)
     return text.strip()
 
-def parse_sql_value(s, start=0):
-    """Parse a single SQL value starting at position start, handling quotes and escapes."""
-    if start >= len(s):
-        return None, start
-
-    if s[start] == "'":
-        # Quoted string - find matching end quote
-        i = start + 1
-        result = []
-        while i < len(s):
-            if s[i] == '\\' and i + 1 < len(s):
-                # Escaped character
-                result.append(s[i:i+2])
-                i += 2
-            elif s[i] == "'":
-                if i + 1 < len(s) and s[i+1] == "'":
-                    # Doubled quote
-                    result.append("'")
-                    i += 2
-                else:
-                    # End of string
-                    return ''.join(result), i + 1
-            else:
-                result.append(s[i])
-                i += 1
-        return ''.join(result), i
-    else:
-        # Unquoted value (number or NULL)
-        end = start
-        while end < len(s) and s[end] not in ',)':
-            end += 1
-        return s[start:end], end
-
-def parse_row(row_str):
-    """Parse a SQL row into fields."""
-    fields = []
-    i = 0
-    while i < len(row_str):
-        if row_str[i] in ' ,':
-            i += 1
-            continue
-        value, i = parse_sql_value(row_str, i)
-        if value is not None:
-            fields.append(value)
-        if i < len(row_str) and row_str[i] == ',':
-            i += 1
-    return fields
-
-def extract_products_from_sql():
-    """Extract Shopp product data from SQL dump."""
-    print(f"Reading SQL file: {SQL_FILE}")
-
-    # Read line 240 which contains wp_posts INSERT
-    with open(SQL_FILE, 'r', encoding='utf-8', errors='replace') as f:
-        for i, line in enumerate(f, 1):
-            if i == 240:
-                content = line
-                break
-
-    # Split by ),( to get individual rows
-    rows = content.split('),(')
-    print(f"Total rows in wp_posts: {len(rows)}")
+def extract_products_from_sql(sql_file=SQL_FILE, artist_slugs=DEFAULT_SITE['artist_pages']):
+    """Extract Shopp product data and the artist bio pages named by artist_slugs from SQL dump."""
+    progress.info(f"Reading SQL file: {sql_file}")
 
     products = {}
     artist_pages = {}
 
-    for row in rows:
-        if "'shopp_product'" in row or "'page'" in row:
-            # Parse the row
-            fields = parse_row(row)
+    post_types = ['shopp_product', 'page']
+    if USE_DUMP_CACHE:
+        rows = select_rows(sql_file, 'wp_posts', 'post_type', post_types)
+    else:
+        rows = read_table_rows(sql_file, 'wp_posts', keep=[f"'{post_type}'" for post_type in post_types])
 
-            if len(fields) < 23:
-                continue
+    for fields in rows:
+        if len(fields) < 23:
+            continue
 
-            try:
-                post_id = int(fields[0].lstrip('('))
-                post_date = fields[2]
-                post_content = fields[4]
-                post_title = fields[5]
-                post_excerpt = fields[6]
-                post_status = fields[7]
-                post_name = fields[11]  # slug
-                post_type = fields[20]
-
-                if post_status != 'publish':
-                    continue
-
-                if post_type == 'shopp_product':
-                    products[post_id] = {
-                        'id': post_id,
-                        'title': post_title.replace("\\'", "'"),
-                        'slug': post_name,
-                        'description': clean_html(post_content),
-                        'excerpt': clean_html(post_excerpt),
-                        'date': post_date[:10] if post_date else None
-                    }
-                    print(f"  Found product: {post_title[:50]} (ID: {post_id})")
-
-                elif post_type == 'page' and post_name in ['the-longwalls', 'kurt-von-stetten', 'gatsby', 'dan-london']:
-                    artist_pages[post_name] = {
-                        'slug': post_name,
-                        'title': post_title.replace("\\'", "'"),
-                        'bio': clean_html(post_content)
-                    }
-                    print(f"  Found artist page: {post_title}")
-
-            except (ValueError, IndexError) as e:
+        try:
+            post_id = int(fields[0])
+            post_date = fields[2]
+            post_content = fields[4]
+            post_title = fields[5]
+            post_excerpt = fields[6]
+            post_status = fields[7]
+            post_name = fields[11]  # slug
+            post_type = fields[20]
+
+            if post_status != 'publish':
                 continue
 
-    print(f"\nFound {len(products)} products")
-    print(f"Found {len(artist_pages)} artist pages")
+            if post_type == 'shopp_product':
+                products[post_id] = {
+                    'id': post_id,
+                    'title': post_title.replace("\\'", "'"),
+                    'slug': post_name,
+                    'description': clean_html(post_content),
+                    'excerpt': clean_html(post_excerpt),
+                    'date': post_date[:10] if post_date else None
+                }
+                progress.debug(f"Found product: {post_title[:50]} (ID: {post_id})", id=post_id)
+
+            elif post_type == 'page' and post_name in artist_slugs:
+                artist_pages[post_name] = {
+                    'slug': post_name,
+                    'title': post_title.replace("\\'", "'"),
+                    'bio': clean_html(post_content)
+                }
+                progress.debug(f"Found artist page: {post_title}", slug=post_name)
+
+        except (ValueError, IndexError) as e:
+            continue
+
+    progress.info(f"Found {len(products)} products and {len(artist_pages)} artist pages",
+                  products=len(products), artist_pages=len(artist_pages))
     return products, artist_pages
 
-def extract_postmeta():
+def extract_postmeta(sql_file=SQL_FILE):
     """Extract metadata from wp_postmeta including ACF fields like track_listing."""
-    print("\nExtracting post metadata (ACF fields)...")
-
-    # Read line 190 which contains wp_postmeta INSERT
-    with open(SQL_FILE, 'r', encoding='utf-8', errors='replace') as f:
-        for i, line in enumerate(f, 1):
-            if i == 190:
-                content = line
-                break
+    progress.info("Extracting post metadata (ACF fields)...")
 
     postmeta = {}
+    meta_keys = ['track_listing', 'release_date', 'catalog_number', 'credits']
+    track_listings = 0
 
-    # Find all track_listing entries
-    # Pattern: (meta_id, post_id, 'track_listing', 'value')
-    matches = re.findall(r"\((\d+),(\d+),'track_listing','((?:[^']|\\\\')*)'\)", content)
-    print(f"  Found {len(matches)} track_listing entries")
+    if USE_DUMP_CACHE:
+        rows = select_rows(sql_file, 'wp_postmeta', 'meta_key', meta_keys)
+    else:
+        rows = scan_postmeta(sql_file, meta_keys)
 
-    for m in matches:
-        post_id = int(m[1])
-        tracklist = m[2].replace("\\'", "'").replace("\\r\\n", "\n").replace("\\n", "\n")
+    for fields in rows:
+        if len(fields) < 4 or fields[2] not in meta_keys:
+            continue
+        post_id, meta_key, value = int(fields[1]), fields[2], fields[3]
+
+        if meta_key == 'track_listing':
+            value = value.replace("\\'", "'").replace("\\r\\n", "\n").replace("\\n", "\n")
+            track_listings += 1
+        else:
+            value = value.replace("\\'", "'")
+            progress.debug(f"Found {meta_key} for post {post_id}", id=post_id, key=meta_key)
 
         if post_id not in postmeta:
             postmeta[post_id] = {}
-        postmeta[post_id]['track_listing'] = tracklist
-
-    # Also look for release_date, catalog_number, etc.
-    for field in ['release_date', 'catalog_number', 'credits']:
-        matches = re.findall(rf"\((\d+),(\d+),'{field}','((?:[^']|\\\\')*)'\)", content)
-        for m in matches:
-            post_id = int(m[1])
-            value = m[2].replace("\\'", "'")
-            if post_id not in postmeta:
-                postmeta[post_id] = {}
-            postmeta[post_id][field] = value
-            print(f"  Found {field} for post {post_id}")
+        postmeta[post_id][meta_key] = value
+
+    progress.info(f"Found {track_listings} track_listing entries", track_listings=track_listings)
 
     return postmeta
 
@@ -204,35 +150,13 @@ def parse_tracklist(tracklist_raw):
 
     return tracks
 
-def parse_tracklist_html(tracklist_html):
-    """Parse tracklist from HTML list format."""
-    if not tracklist_html:
-        return []
-
-    tracks = []
-
-    # Remove the "Tracks" header if present
-    tracklist_html = re.sub(r'^Tracks\s*', '', tracklist_html, flags=re.IGNORECASE)
-
-    # Extract list items
-    items = re.findall(r'<li[^>]*>(.*?)</li>', tracklist_html, re.IGNORECASE | re.DOTALL)
-
-    for i, item in enumerate(items):
-        title = clean_html(item).strip()
-        if title:
-            tracks.append({
-                'number': i + 1,
-                'title': title
-            })
-
-    return tracks
-
-def main():
+def extract_site(sql_file=SQL_FILE, output_path=OUTPUT_PATH, artist_slugs=DEFAULT_SITE['artist_pages']):
+    """Extract one site's products and artist bios from its SQL dump into its data directory."""
     # Extract products and artist pages
-    products, artist_pages = extract_products_from_sql()
+    products, artist_pages = extract_products_from_sql(sql_file, artist_slugs)
 
     # Extract postmeta (ACF fields like track_listing)
-    postmeta = extract_postmeta()
+    postmeta = extract_postmeta(sql_file)
 
     # Merge meta into products
     for pid, meta in postmeta.items():
@@ -242,31 +166,24 @@ def main():
             products[pid]['meta'].update(meta)
 
     # Save raw extracted data
-    with open(os.path.join(OUTPUT_PATH, 'products_raw.json'), 'w') as f:
+    with open(os.path.join(output_path, 'products_raw.json'), 'w') as f:
         json.dump(list(products.values()), f, indent=2)
-    print(f"\nSaved products_raw.json")
+    progress.info("Saved products_raw.json")
 
-    # Print summary
-    print("\n=== PRODUCTS FOUND ===")
+    # Per-product summary, for --verbose
     for pid, prod in sorted(products.items()):
-        meta = prod.get('meta', {})
         desc = prod.get('description', '')
-        print(f"\n{prod['title']}")
-        print(f"  Slug: {prod['slug']}")
-        print(f"  Description: {desc[:80]}..." if desc else "  Description: None")
-        if meta:
-            print(f"  Meta keys: {list(meta.keys())}")
-
-    print("\n=== ARTIST PAGES ===")
+        progress.debug(f"Product {prod['title']} ({prod['slug']}): "
+                       f"{desc[:80] + '...' if desc else 'no description'}; "
+                       f"meta keys: {list(prod.get('meta', {}).keys())}", slug=prod['slug'])
     for slug, artist in artist_pages.items():
         bio = artist.get('bio', '')
-        print(f"\n{artist['title']}")
-        print(f"  Bio: {bio[:120]}..." if bio else "  Bio: None")
+        progress.debug(f"Artist page {artist['title']}: {bio[:120] + '...' if bio else 'no bio'}", slug=slug)
 
     # Update albums.json with extracted data
-    print("\n\nUpdating albums.json with extracted data...")
+    progress.info("Updating albums.json with extracted data...")
 
-    with open(os.path.join(OUTPUT_PATH, 'albums.json'), 'r') as f:
+    with open(os.path.join(output_path, 'albums.json'), 'r') as f:
         albums = json.load(f)
 
     # Create slug-to-product mapping
@@ -282,16 +199,16 @@ def main():
             if prod.get('description') and not album.get('description'):
                 album['description'] = prod['description']
                 updated_count += 1
-                print(f"  Updated description for: {album['name']}")
+                progress.debug(f"Updated description for: {album['name']}", slug=slug)
 
             # Update from meta
             meta = prod.get('meta', {})
 
             if meta.get('track_listing'):
-                tracks = parse_tracklist_html(meta['track_listing'])
+                tracks = parse_track_items(meta['track_listing'])
                 if tracks:
                     album['tracks'] = tracks
-                    print(f"  Found {len(tracks)} tracks for: {album['name']}")
+                    progress.debug(f"Found {len(tracks)} tracks for: {album['name']}", slug=slug)
 
             if meta.get('release_date') and not album.get('releaseDate'):
                 # Format YYYYMMDD to YYYY-MM-DD
@@ -301,7 +218,7 @@ def main():
                     album['releaseDate'] = formatted_date
                 else:
                     album['releaseDate'] = raw_date
-                print(f"  Set release date for: {album['name']}: {album['releaseDate']}")
+                progress.debug(f"Set release date for: {album['name']}: {album['releaseDate']}", slug=slug)
 
             if meta.get('Catalog') and not album.get('catalogNumber'):
                 album['catalogNumber'] = meta['Catalog']
@@ -314,15 +231,15 @@ def main():
                 album['credits'] = meta['Credits']
 
     # Save updated albums
-    with open(os.path.join(OUTPUT_PATH, 'albums.json'), 'w') as f:
+    with open(os.path.join(output_path, 'albums.json'), 'w') as f:
         json.dump(albums, f, indent=2)
 
-    print(f"\nUpdated {updated_count} albums with descriptions")
+    progress.info(f"Updated {updated_count} albums with descriptions", updated=updated_count)
 
     # Update artists.json with bios
-    print("\nUpdating artists.json with extracted bios...")
+    progress.info("Updating artists.json with extracted bios...")
 
-    with open(os.path.join(OUTPUT_PATH, 'artists.json'), 'r') as f:
+    with open(os.path.join(output_path, 'artists.json'), 'r') as f:
         artists_data = json.load(f)
 
     for artist in artists_data:
@@ -331,12 +248,20 @@ def main():
             bio = artist_pages[slug].get('bio')
             if bio and not artist.get('bio'):
                 artist['bio'] = bio
-                print(f"  Updated bio for {artist['name']}")
+                progress.debug(f"Updated bio for {artist['name']}", slug=slug)
 
-    with open(os.path.join(OUTPUT_PATH, 'artists.json'), 'w') as f:
+    with open(os.path.join(output_path, 'artists.json'), 'w') as f:
         json.dump(artists_data, f, indent=2)
 
-    print("\nDone!")
+def main():
+    progress.configure_from_args()
+    sites = load_sites()
+    if not sites:
+        with progress.stage('extract_products'):
+            extract_site()
+    for site in sites:
+        with progress.stage(site['name']):
+            extract_site(site['sql_file'], site['data_path'], site['artist_pages'])
 
 if __name__ == '__main__':
     main()
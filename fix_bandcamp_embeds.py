@@ -4,7 +4,9 @@ Fix Bandcamp embeds with correct album IDs.
 """
 
 import json
-import re
+
+from embeds import bandcamp_record, parse_embed
+import progress
 
 ALBUMS_JSON = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site/data/albums.json'
 
@@ -146,12 +148,9 @@ CORRECT_EMBEDS = {
     },
 }
 
-def generate_embed(album_id, url, title):
-    """Generate a Bandcamp embed with the correct format."""
-    return f'<iframe style="border: 0; width: 100%; height: 120px;" src="https://bandcamp.com/EmbeddedPlayer/album={album_id}/size=large/bgcol=ffffff/linkcol=0687f5/tracklist=false/artwork=none/transparent=true/" seamless><a href="{url}">{title}</a></iframe>'
-
 def main():
-    print("Loading albums.json...")
+    progress.configure_from_args()
+    progress.info("Loading albums.json...")
     with open(ALBUMS_JSON, 'r') as f:
         albums = json.load(f)
 
@@ -161,30 +160,27 @@ def main():
 
         if slug in CORRECT_EMBEDS:
             info = CORRECT_EMBEDS[slug]
-            correct_embed = generate_embed(info['album_id'], info['url'], info['title'])
+            correct_embed = bandcamp_record(info['album_id'], info['url'], info['title'])
 
             # Check if current embed is different
-            current_embed = album.get('bandcampEmbed', '')
-
-            # Extract current album ID
-            current_id_match = re.search(r'album=(\d+)', current_embed) if current_embed else None
-            current_id = current_id_match.group(1) if current_id_match else None
+            current_embed = parse_embed(album.get('bandcampEmbed'))
+            current_id = current_embed['id'] if current_embed else None
 
             if current_id != info['album_id']:
                 album['bandcampEmbed'] = correct_embed
-                print(f"  Fixed: {album['name']} (was album={current_id}, now album={info['album_id']})")
+                progress.debug(f"Fixed: {album['name']} (was album={current_id}, now album={info['album_id']})", slug=slug)
                 fixed_count += 1
             else:
                 # Still update to ensure correct URL and title
-                if current_embed != correct_embed:
+                if album.get('bandcampEmbed') != correct_embed:
                     album['bandcampEmbed'] = correct_embed
-                    print(f"  Updated embed format: {album['name']}")
+                    progress.debug(f"Updated embed format: {album['name']}", slug=slug)
 
-    print(f"\nSaving albums.json...")
+    progress.info("Saving albums.json...")
     with open(ALBUMS_JSON, 'w') as f:
         json.dump(albums, f, indent=2, ensure_ascii=False)
 
-    print(f"Done! Fixed {fixed_count} incorrect album IDs.")
+    progress.info(f"Done! Fixed {fixed_count} incorrect album IDs.", fixed=fixed_count)
 
 if __name__ == '__main__':
     main()
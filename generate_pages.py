@@ -5,37 +5,239 @@ Generate static HTML pages for Static Motor Recordings archive.
 
 import json
 import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import html
 
+from build_fonts import FONT_CSS, font_file
+from catalog_schema import validate_catalog
+from embeds import embed_origins, parse_embed, render_facade, youtube_record
+from optimize_site import parse_css, render_page, matching_css, serialize_css
+from personnel import name_spans, person_key
+from service_worker import write_service_worker
+import progress
+from sites import DEFAULT_SITE, load_sites
+from timeline_rules import load_rule_types
+
 BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+DATA_PATH = None  # defaults to BASE_PATH/data
+
+# Branding for the site being built; configure_site() swaps in another label's
+SITE = DEFAULT_SITE
+STYLESHEET = 'assets/css/style.css'
+FONTS_URL = 'https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;900&family=JetBrains+Mono:wght@400;500;700&display=swap'
+
+# Listing page sizes
+ALBUMS_PER_PAGE = 24
+ARTISTS_PER_PAGE = 12
+TIMELINE_PER_PAGE = 30
+PEOPLE_PER_PAGE = 60
+
+# Number of top-level <main> sections visible on first paint, per page template
+ABOVE_THE_FOLD_SECTIONS = {
+    'album': 1,          # album hero
+    'artist': 1,         # artist hero
+    'artists-index': 2,  # intro + roster header
+    'about': 2,          # intro + about hero
+    'timeline': 1,       # timeline archive
+    'catalog': 2,        # catalog header + album grid
+    'people-index': 2,   # catalog header + people list
+    'person': 2,         # catalog header + credited releases
+    'home': 3,           # intro + filters + album grid
+}
+
+# Self-hosted font faces preloaded per page template (the text painted above the fold)
+PRELOAD_FONTS = {
+    'album': [('Inter', 400), ('Inter', 500), ('Inter', 700)],
+    'artist': [('Inter', 400), ('Inter', 500), ('Inter', 700)],
+    'artists-index': [('Inter', 400), ('Inter', 700)],
+    'about': [('Inter', 400), ('Inter', 700)],
+    'timeline': [('Inter', 700), ('JetBrains Mono', 400)],
+    'catalog': [('Inter', 500), ('Inter', 700)],
+    'people-index': [('Inter', 400), ('Inter', 600), ('Inter', 700)],
+    'person': [('Inter', 500), ('Inter', 700)],
+    'home': [('Inter', 400), ('Inter', 500), ('Inter', 700)],
+}
+
+# Album pages prefetched as soon as a page loads (the likeliest next clicks);
+# any other album card is prefetched when hovered or pressed
+NEXT_PAGES_LIMIT = 4
+PREFETCH_ON_HOVER = 'a.album-card'
+
+# Album fields the homepage grid (app.js) renders cards from
+GRID_FIELDS = ['slug', 'name', 'artist', 'artistSlug', 'releaseDate', 'coverImage', 'coverImageInfo', 'coverImageColor']
+
+# Rendered width of each image slot, for srcset selection
+CARD_SIZES = '(max-width: 640px) 100vw, (max-width: 768px) 50vw, (max-width: 1024px) 33vw, 25vw'
+HERO_SIZES = '(max-width: 768px) 100vw, 50vw'
+ARTIST_ITEM_SIZES = '(max-width: 768px) 100vw, 200px'
+
+def data_path(filename):
+    return os.path.join(DATA_PATH or os.path.join(BASE_PATH, 'data'), filename)
 
 def load_json(filename):
-    with open(os.path.join(BASE_PATH, 'data', filename), 'r') as f:
+    with open(data_path(filename), 'r') as f:
         return json.load(f)
 
+def load_people():
+    """The credits index written by people.py, or [] if it hasn't been built."""
+    if not os.path.exists(data_path('people.json')):
+        return []
+    return load_json('people.json')
+
 def escape(text):
     """Escape HTML entities."""
     if text is None:
         return ''
     return html.escape(str(text))
 
-def get_header(title, path_prefix='../../'):
+def blocking_styles(path_prefix):
+    """Render-blocking font and stylesheet links, as written by hand in index.html."""
+    return f'''  <!-- Fonts -->
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+  <link href="{FONTS_URL}" rel="stylesheet">
+
+  <!-- Styles -->
+  <link rel="stylesheet" href="{path_prefix}{STYLESHEET}">'''
+
+def critical_styles(path_prefix, critical_css, preload_fonts=None):
+    """Inline critical CSS and load the fonts and full stylesheet without blocking render.
+
+    With preload_fonts (self-hosted faces), their @font-face rules are expected in
+    critical_css and no third-party font origin is contacted.
+    """
+    if preload_fonts is None:
+        return f'''  <!-- Critical styles -->
+  <style>{critical_css}</style>
+  <link rel="preconnect" href="https://fonts.googleapis.com">
+  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+  <link rel="preload" href="{FONTS_URL}" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <link rel="preload" href="{path_prefix}{STYLESHEET}" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <noscript>
+    <link href="{FONTS_URL}" rel="stylesheet">
+    <link rel="stylesheet" href="{path_prefix}{STYLESHEET}">
+  </noscript>
+  <!-- /Critical styles -->'''
+
+    font_links = ''.join(
+        f'''
+  <link rel="preload" href="{path_prefix}{posixpath.dirname(FONT_CSS)}/{font_file(family, weight)}" as="font" type="font/woff2" crossorigin>'''
+        for family, weight in preload_fonts)
+    return f'''  <!-- Critical styles -->{font_links}
+  <style>{critical_css}</style>
+  <link rel="preload" href="{path_prefix}{STYLESHEET}" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <noscript>
+    <link rel="stylesheet" href="{path_prefix}{STYLESHEET}">
+  </noscript>
+  <!-- /Critical styles -->'''
+
+CRITICAL_STYLES_RE = re.compile(r'  <!-- Critical styles -->.*?<!-- /Critical styles -->', re.DOTALL)
+
+def above_the_fold(page_html, template):
+    """Cut a page after the sections visible on first paint."""
+    main_start = page_html.find('<main>')
+    if main_start == -1:
+        return page_html
+    end = main_start
+    for _ in range(ABOVE_THE_FOLD_SECTIONS[template]):
+        close = page_html.find('</section>', end)
+        if close == -1:
+            break
+        end = close + len('</section>')
+    return page_html[:end]
+
+def rebase_css_urls(css, path_prefix, css_path=STYLESHEET):
+    """Rewrite stylesheet-relative url()s so they resolve from a page at path_prefix."""
+    css_dir = posixpath.dirname(css_path)
+
+    def rebase(match):
+        url = next(group for group in match.groups() if group is not None)
+        if url.startswith(('data:', 'http:', 'https:', '/', '#')):
+            return match.group(0)
+        return f"url('{path_prefix}{posixpath.normpath(posixpath.join(css_dir, url))}')"
+
+    return re.sub(r'''url\(\s*(?:"([^"]*)"|'([^']*)'|([^'")\s]+))\s*\)''', rebase, css)
+
+# Parsed stylesheets by source text; build_sites gives the sites sharing a
+# stylesheet to one process so they parse it once
+_stylesheet_nodes = {}
+
+def stylesheet_nodes():
+    with open(os.path.join(BASE_PATH, STYLESHEET), 'r') as f:
+        css = f.read()
+    if css not in _stylesheet_nodes:
+        _stylesheet_nodes[css] = parse_css(css)
+    return _stylesheet_nodes[css]
+
+def compute_critical_css(template, pages_html):
+    """Minified CSS needed to paint the above-the-fold part of every page of a template."""
+    renders = [render_page(above_the_fold(page_html, template)) for page_html in pages_html]
+    return serialize_css(matching_css(stylesheet_nodes(), renders))
+
+def self_hosted_font_css():
+    """Minified @font-face rules written by build_fonts.py, or None to use Google Fonts."""
+    path = os.path.join(BASE_PATH, FONT_CSS)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return serialize_css(parse_css(f.read()))
+
+def inline_critical_css(page_html, path_prefix, critical_css, template=None, font_css=None, relpath=None):
+    """Swap a page's blocking style links (or previously inlined styles) for critical CSS.
+
+    A page with neither is returned unchanged, with a warning: it stays
+    render-blocked, usually because its <head> was edited or minified by hand.
+    """
+    css = rebase_css_urls(critical_css, path_prefix)
+    preload_fonts = None
+    if font_css:
+        css = rebase_css_urls(font_css, path_prefix, FONT_CSS) + css
+        preload_fonts = [face for face in PRELOAD_FONTS.get(template, []) if font_file(*face) in font_css]
+    styles = critical_styles(path_prefix, css.replace('</', '<\\/'), preload_fonts)
+    if CRITICAL_STYLES_RE.search(page_html):
+        return CRITICAL_STYLES_RE.sub(lambda m: styles, page_html, count=1)
+    if blocking_styles(path_prefix) not in page_html:
+        progress.warning(f"{relpath or template}: no style links or critical-style markers to replace; "
+                         f"critical CSS not inlined", path=relpath, template=template)
+        return page_html
+    return page_html.replace(blocking_styles(path_prefix), styles, 1)
+
+def resource_hints(hero_image=None, origins=(), srcset='', sizes=''):
+    """Preload a page's hero (LCP) image and preconnect to the origins its embeds use."""
+    links = []
+    if hero_image:
+        responsive = f' imagesrcset="{srcset}" imagesizes="{sizes}"' if srcset else ''
+        links.append(f'  <link rel="preload" href="{hero_image}"{responsive} as="image" fetchpriority="high">')
+    for origin in sorted(origins):
+        links.append(f'  <link rel="preconnect" href="{origin}">')
+    return ''.join(f'\n{link}' for link in links)
+
+def speculation_rules(next_pages=()):
+    """Speculation rules prefetching a page's likely next pages now and album cards on hover."""
+    rules = [{'source': 'document', 'where': {'selector_matches': PREFETCH_ON_HOVER}, 'eagerness': 'moderate'}]
+    if next_pages:
+        rules.insert(0, {'source': 'list', 'urls': list(next_pages)[:NEXT_PAGES_LIMIT], 'eagerness': 'eager'})
+    return f'\n  <script type="speculationrules">{json.dumps({"prefetch": rules})}</script>'
+
+def next_album_pages(albums, path_prefix, exclude=None):
+    """URLs of the first distinct album pages in a list, for speculation_rules()."""
+    slugs = [slug for slug in dict.fromkeys(album['slug'] for album in albums) if slug != exclude]
+    return [f'{path_prefix}pages/albums/{slug}.html' for slug in slugs[:NEXT_PAGES_LIMIT]]
+
+def get_header(title, path_prefix='../../', hints='', next_pages=()):
     """Generate page header."""
     return f'''<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8">
   <meta name="viewport" content="width=device-width, initial-scale=1.0">
-  <title>{escape(title)} | Static Motor Recordings</title>
-
-  <!-- Fonts -->
-  <link rel="preconnect" href="https://fonts.googleapis.com">
-  <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-  <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;900&family=JetBrains+Mono:wght@400;500;700&display=swap" rel="stylesheet">
+  <title>{escape(title)} | {SITE['name']}</title>{hints}{speculation_rules(next_pages)}
 
-  <!-- Styles -->
-  <link rel="stylesheet" href="{path_prefix}assets/css/style.css">
+{blocking_styles(path_prefix)}
 </head>
 <body>
   <!-- Header -->
@@ -45,10 +247,10 @@ def get_header(title, path_prefix='../../'):
         <a href="{path_prefix}index.html" class="site-logo">
           <div class="site-logo__mark">
             <svg viewBox="0 0 44 44" fill="none" xmlns="http://www.w3.org/2000/svg">
-              <text x="6" y="28" fill="#fafafa" font-family="Inter, sans-serif" font-size="16" font-weight="900">SM</text>
+              <text x="6" y="28" fill="#fafafa" font-family="Inter, sans-serif" font-size="16" font-weight="900">{SITE['logo_mark']}</text>
             </svg>
           </div>
-          <span class="site-logo__text">Static<br>Motor</span>
+          <span class="site-logo__text">{SITE['logo_text']}</span>
         </a>
 
         <button class="menu-toggle" aria-label="Toggle menu" aria-expanded="false">
@@ -73,6 +275,9 @@ def get_header(title, path_prefix='../../'):
 
 def get_footer(path_prefix='../../'):
     """Generate page footer."""
+    artist_links = ''.join(
+        f'\n            <li><a href="{path_prefix}pages/artists/{slug}.html" class="site-footer__nav-link link-draw">{name}</a></li>'
+        for slug, name in SITE['footer_artists'])
     return f'''
   </main>
 
@@ -81,11 +286,9 @@ def get_footer(path_prefix='../../'):
     <div class="container">
       <div class="site-footer__inner">
         <div class="site-footer__brand">
-          <span class="site-footer__logo">Static Motor Recordings</span>
+          <span class="site-footer__logo">{SITE['name']}</span>
           <p class="site-footer__tagline">
-            Boston-based independent record label (2003&ndash;2020).
-            This archive preserves the catalog and history of indie rock, pop, and americana
-            releases from The Longwalls, Kurt von Stetten, Gatsby, and Dan London.
+            {SITE['tagline']}
           </p>
         </div>
 
@@ -100,25 +303,111 @@ def get_footer(path_prefix='../../'):
 
         <div class="site-footer__nav">
           <h3 class="site-footer__nav-title">Artists</h3>
-          <ul class="site-footer__nav-list">
-            <li><a href="{path_prefix}pages/artists/the-longwalls.html" class="site-footer__nav-link link-draw">The Longwalls</a></li>
-            <li><a href="{path_prefix}pages/artists/kurt-von-stetten.html" class="site-footer__nav-link link-draw">Kurt von Stetten</a></li>
-            <li><a href="{path_prefix}pages/artists/gatsby.html" class="site-footer__nav-link link-draw">Gatsby</a></li>
-            <li><a href="{path_prefix}pages/artists/dan-london.html" class="site-footer__nav-link link-draw">Dan London</a></li>
+          <ul class="site-footer__nav-list">{artist_links}
           </ul>
         </div>
 
         <p class="site-footer__copyright">
-          &copy; 2003&ndash;2020 Static Motor Recordings. Archive maintained for historical preservation.
+          {SITE['copyright']}
         </p>
       </div>
     </div>
   </footer>
+
+  <script src="{path_prefix}assets/js/app.js"></script>
 </body>
 </html>
 '''
 
-def generate_album_page(album, all_albums, artists):
+def asset_url(path, path_prefix, fallback='assets/images/placeholder.svg'):
+    """Resolve a site-relative asset path (or external URL) for a page at path_prefix."""
+    if not path:
+        return f'{path_prefix}{fallback}'
+    if path.startswith('http') or path.startswith('../'):
+        return path
+    return f'{path_prefix}{path}'
+
+def image_srcset(src, info, path_prefix):
+    """srcset listing an image's derivatives and the original, or '' if it has none."""
+    if not info or not info.get('derivatives'):
+        return ''
+    candidates = [f"{asset_url(d['src'], path_prefix)} {d['width']}w" for d in info['derivatives']]
+    candidates.append(f"{asset_url(src, path_prefix)} {info['width']}w")
+    return ', '.join(candidates)
+
+def image_attrs(src, info, path_prefix, sizes):
+    """width/height attributes, plus srcset/sizes where derivatives exist, for an <img>."""
+    if not info:
+        return ''
+    attrs = f' width="{info["width"]}" height="{info["height"]}"'
+    srcset = image_srcset(src, info, path_prefix)
+    if srcset:
+        attrs += f' srcset="{srcset}" sizes="{sizes}"'
+    return attrs
+
+def placeholder_style(color):
+    """Inline background painted while an image loads."""
+    return f' style="background-color: {color};"' if color else ''
+
+def album_card(album, path_prefix, show_artist=True, show_year=False, priority=None):
+    """Album card used by every album grid."""
+    cover = asset_url(album.get('coverImage'), path_prefix)
+    attrs = image_attrs(album.get('coverImage'), album.get('coverImageInfo'), path_prefix, CARD_SIZES)
+    if priority:
+        attrs += f' fetchpriority="{priority}"'
+    artist_html = f'''
+              <span class="album-card__artist">{escape(album['artist'])}</span>''' if show_artist else ''
+    year_html = f'''
+              <span class="album-card__year">{album['releaseDate'][:4]}</span>''' if show_year and album.get('releaseDate') else ''
+    return f'''
+          <a href="{path_prefix}pages/albums/{album['slug']}.html" class="album-card">
+            <div class="album-card__image"{placeholder_style(album.get('coverImageColor'))}>
+              <img src="{cover}" alt="{escape(album['name'])} album cover" loading="lazy"{attrs}>
+            </div>
+            <div class="album-card__meta">{artist_html}
+              <h3 class="album-card__title">{escape(album['name'])}</h3>{year_html}
+            </div>
+          </a>'''
+
+def paginate(items, per_page):
+    """Split a listing into fixed-size pages; there is always at least one page."""
+    return [items[i:i + per_page] for i in range(0, len(items), per_page)] or [[]]
+
+def paged_path(first_page, number):
+    """Site-relative path of page `number` of a listing whose first page is `first_page`."""
+    if number == 1:
+        return first_page
+    stem, ext = os.path.splitext(first_page)
+    return f'{stem}-page-{number}{ext}'
+
+def pagination_nav(number, count, path_for, path_prefix, prev_label='&larr; Previous', next_label='Next &rarr;'):
+    """Prev/next links between the pages of a listing; empty for single-page listings."""
+    if count <= 1:
+        return ''
+    prev_html = f'<a href="{path_prefix}{path_for(number - 1)}" class="pagination__link" rel="prev">{prev_label}</a>' if number > 1 else '<span></span>'
+    next_html = f'<a href="{path_prefix}{path_for(number + 1)}" class="pagination__link" rel="next">{next_label}</a>' if number < count else '<span></span>'
+    return f'''
+        <nav class="pagination" aria-label="Pagination">
+          {prev_html}
+          <span class="pagination__status">Page {number} of {count}</span>
+          {next_html}
+        </nav>'''
+
+def linked_credits(line, people_by_key, path_prefix):
+    """One escaped line of credits with each indexed name linked to its person page."""
+    parts = []
+    position = 0
+    for start, end, _ in name_spans(line):
+        person = people_by_key.get(person_key(line[start:end]))
+        if not person:
+            continue
+        parts.append(escape(line[position:start]))
+        parts.append(f'<a href="{path_prefix}pages/people/{person["slug"]}.html" class="credits__person">{escape(line[start:end])}</a>')
+        position = end
+    parts.append(escape(line[position:]))
+    return ''.join(parts)
+
+def generate_album_page(album, all_albums, artists, people_by_key=None):
     """Generate an album detail page."""
     path_prefix = '../../'
     # Fix cover image path - add prefix if it doesn't start with http or ../
@@ -128,12 +417,21 @@ def generate_album_page(album, all_albums, artists):
             cover_image = f'{path_prefix}{cover_image}'
     else:
         cover_image = f'{path_prefix}assets/images/placeholder.svg'
+    cover_info = album.get('coverImageInfo')
+    cover_attrs = image_attrs(album.get('coverImage'), cover_info, path_prefix, HERO_SIZES)
+    cover_srcset = image_srcset(album.get('coverImage'), cover_info, path_prefix)
 
     # Find artist
     artist = next((a for a in artists if a['slug'] == album['artistSlug']), None)
 
-    # Find related albums (same artist)
-    related = [a for a in all_albums if a['artistSlug'] == album['artistSlug'] and a['slug'] != album['slug']][:4]
+    # Related albums precomputed by related.py, or else more by the same artist
+    if album.get('related'):
+        albums_by_slug = {a['slug']: a for a in all_albums}
+        related = [albums_by_slug[slug] for slug in album['related'] if slug in albums_by_slug]
+        related_title = 'Related Releases'
+    else:
+        related = [a for a in all_albums if a['artistSlug'] == album['artistSlug'] and a['slug'] != album['slug']][:4]
+        related_title = f"More from {escape(album['artist'])}"
 
     # Build press quotes section (use real press quotes, not blog posts)
     press_html = ''
@@ -162,28 +460,12 @@ def generate_album_page(album, all_albums, artists):
     # Build related albums section
     related_html = ''
     if related:
-        related_items = []
-        for r in related:
-            r_cover = r.get('coverImage')
-            if r_cover and not r_cover.startswith('http') and not r_cover.startswith('../'):
-                r_cover = f'{path_prefix}{r_cover}'
-            elif not r_cover:
-                r_cover = f'{path_prefix}assets/images/placeholder.svg'
-            related_items.append(f'''
-          <a href="{r['slug']}.html" class="album-card">
-            <div class="album-card__image">
-              <img src="{r_cover}" alt="{escape(r['name'])} album cover" loading="lazy">
-            </div>
-            <div class="album-card__meta">
-              <span class="album-card__artist">{escape(r['artist'])}</span>
-              <h3 class="album-card__title">{escape(r['name'])}</h3>
-            </div>
-          </a>''')
+        related_items = [album_card(r, path_prefix, priority='low') for r in related]
 
         related_html = f'''
     <section class="album-section">
       <div class="container">
-        <h2 class="album-section__title">More from {escape(album['artist'])}</h2>
+        <h2 class="album-section__title">{related_title}</h2>
         <div class="related-albums">
           {''.join(related_items)}
         </div>
@@ -228,7 +510,8 @@ def generate_album_page(album, all_albums, artists):
         if album.get('credits'):
             # Convert credits newlines to HTML
             credits_lines = album['credits'].split('\n')
-            credits_formatted = '<br>'.join([escape(line) for line in credits_lines if line.strip()])
+            credits_formatted = '<br>'.join([linked_credits(line, people_by_key or {}, path_prefix)
+                                             for line in credits_lines if line.strip()])
             credits_html = f'''
         <h3 class="section-subtitle mt-8">Credits</h3>
         <div class="credits">
@@ -245,27 +528,14 @@ def generate_album_page(album, all_albums, artists):
 
     # Watch section (YouTube embeds)
     watch_html = ''
-    if album.get('youtubePlaylist'):
+    youtube = youtube_record(album.get('youtubeVideo'), album.get('youtubePlaylist'), f'{album["name"]} videos')
+    if youtube:
         watch_html = f'''
     <section class="album-section">
       <div class="container">
         <h2 class="album-section__title">Watch</h2>
         <div class="video-embed">
-          <iframe width="560" height="315" src="https://www.youtube.com/embed/videoseries?list={album['youtubePlaylist']}"
-            frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
-            allowfullscreen></iframe>
-        </div>
-      </div>
-    </section>'''
-    elif album.get('youtubeVideo'):
-        watch_html = f'''
-    <section class="album-section">
-      <div class="container">
-        <h2 class="album-section__title">Watch</h2>
-        <div class="video-embed">
-          <iframe width="560" height="315" src="https://www.youtube.com/embed/{album['youtubeVideo']}"
-            frameborder="0" allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
-            allowfullscreen></iframe>
+          {render_facade(youtube, f'Watch {album["name"]}', poster=cover_image)}
         </div>
       </div>
     </section>'''
@@ -275,22 +545,18 @@ def generate_album_page(album, all_albums, artists):
     if album.get('bandcampEmbed'):
         audio_embed_html = f'''
         <div class="audio-embed audio-embed--hero">
-          {album['bandcampEmbed']}
+          {render_facade(album['bandcampEmbed'], f'Listen to {album["name"]}')}
         </div>'''
     elif album.get('soundcloudEmbed'):
         audio_embed_html = f'''
         <div class="audio-embed audio-embed--hero audio-embed--soundcloud">
-          {album['soundcloudEmbed']}
+          {render_facade(album['soundcloudEmbed'], f'Listen to {album["name"]}')}
         </div>'''
 
     # Buy CTA - prefer embed URL (has correct album link) over bandcampUrl (may be generic)
     buy_url = None
-    if album.get('bandcampEmbed'):
-        # Extract URL from embed href - this has the correct album-specific URL
-        import re
-        href_match = re.search(r'href="(https://[^"]+)"', album['bandcampEmbed'])
-        if href_match:
-            buy_url = href_match.group(1)
+    if album.get('bandcampEmbed') and album['bandcampEmbed'].get('url'):
+        buy_url = album['bandcampEmbed']['url']
     elif album.get('bandcampUrl'):
         # Fallback to bandcampUrl if no embed
         url = album['bandcampUrl']
@@ -322,8 +588,8 @@ def generate_album_page(album, all_albums, artists):
     <section class="album-hero album-hero--refined" data-album="{album['slug']}">
       <div class="container">
         <div class="album-hero__grid">
-          <div class="album-hero__cover album-cover--elevated">
-            <img src="{cover_image}" alt="{escape(album['name'])} album cover">
+          <div class="album-hero__cover album-cover--elevated"{placeholder_style(album.get('coverImageColor'))}>
+            <img src="{cover_image}" alt="{escape(album['name'])} album cover"{cover_attrs} fetchpriority="high">
           </div>
           <div class="album-hero__info">
             <p class="album-hero__artist">
@@ -349,43 +615,53 @@ def generate_album_page(album, all_albums, artists):
     {related_html}
 '''
 
-    return get_header(f'{album["name"]} by {album["artist"]}', path_prefix) + page_content + get_footer(path_prefix)
+    # Hints derived from this page's data: its hero cover and its embeds' posters.
+    # Players load on click, so their origins aren't worth a connection at load.
+    origins = set()
+    for record in (album.get('bandcampEmbed'), album.get('soundcloudEmbed'), youtube):
+        if record:
+            origins |= embed_origins(record, player=False)
+    hints = resource_hints(cover_image, origins, cover_srcset, HERO_SIZES)
+
+    # Likely next: the related albums, then the rest of the artist's catalog
+    same_artist = [a for a in all_albums if a['artistSlug'] == album['artistSlug']]
+    next_pages = next_album_pages(related + same_artist, path_prefix, exclude=album['slug'])
 
-def generate_artist_page(artist, all_albums):
-    """Generate an artist detail page."""
+    return (get_header(f'{album["name"]} by {album["artist"]}', path_prefix, hints, next_pages)
+            + page_content + get_footer(path_prefix))
+
+def generate_artist_pages(artist, all_albums):
+    """Generate an artist detail page, with the discography split across pages."""
     path_prefix = '../../'
+    first_page = f'pages/artists/{artist["slug"]}.html'
 
     # Get artist's albums
     artist_albums = [a for a in all_albums if a['artistSlug'] == artist['slug']]
+    album_pages = paginate(artist_albums, ALBUMS_PER_PAGE)
+
+    return [(paged_path(first_page, number),
+             generate_artist_page(artist, page_albums, len(artist_albums), number, len(album_pages)))
+            for number, page_albums in enumerate(album_pages, 1)]
+
+def generate_artist_page(artist, page_albums, album_count, page_number=1, page_count=1):
+    """Generate one page of an artist's detail page."""
+    path_prefix = '../../'
 
     # Album grid
     albums_html = ''
-    if artist_albums:
-        album_items = []
-        for album in artist_albums:
-            cover = album.get('coverImage')
-            if cover:
-                if not cover.startswith('http') and not cover.startswith('../'):
-                    cover = f'{path_prefix}{cover}'
-            else:
-                cover = f'{path_prefix}assets/images/placeholder.svg'
-            album_items.append(f'''
-          <a href="{path_prefix}pages/albums/{album['slug']}.html" class="album-card">
-            <div class="album-card__image">
-              <img src="{cover}" alt="{escape(album['name'])} album cover" loading="lazy">
-            </div>
-            <div class="album-card__meta">
-              <h3 class="album-card__title">{escape(album['name'])}</h3>
-            </div>
-          </a>''')
+    if page_albums:
+        album_items = [album_card(album, path_prefix, show_artist=False) for album in page_albums]
+        nav = pagination_nav(page_number, page_count,
+                             lambda n: paged_path(f'pages/artists/{artist["slug"]}.html', n), path_prefix)
 
         albums_html = f'''
     <section class="album-section">
       <div class="container">
-        <h2 class="album-section__title">Discography ({len(artist_albums)} releases)</h2>
+        <h2 class="album-section__title">Discography ({album_count} releases)</h2>
         <div class="grid grid-cols-4">
           {''.join(album_items)}
         </div>
+        {nav}
       </div>
     </section>'''
 
@@ -395,6 +671,9 @@ def generate_artist_page(artist, all_albums):
             hero_image = f'{path_prefix}{hero_image}'
     else:
         hero_image = f'{path_prefix}assets/images/placeholder.svg'
+    hero_info = artist.get('heroImageInfo')
+    hero_attrs = image_attrs(artist.get('heroImage'), hero_info, path_prefix, HERO_SIZES)
+    hero_srcset = image_srcset(artist.get('heroImage'), hero_info, path_prefix)
 
     # Bandcamp link
     bandcamp_html = ''
@@ -411,13 +690,15 @@ def generate_artist_page(artist, all_albums):
 
     # YouTube embed section for artist page
     youtube_html = ''
-    if artist.get('youtubeEmbed'):
+    youtube = parse_embed(artist.get('youtubeEmbed'))
+    if youtube:
+        youtube = dict(youtube, title=f"{artist['name']} videos")
         youtube_html = f'''
     <section class="album-section">
       <div class="container">
         <h2 class="album-section__title">Watch</h2>
         <div class="video-embed">
-          {artist['youtubeEmbed']}
+          {render_facade(youtube, f'Watch {artist["name"]}', poster=hero_image)}
         </div>
       </div>
     </section>'''
@@ -427,8 +708,8 @@ def generate_artist_page(artist, all_albums):
     <section class="artist-hero artist-hero--dramatic hero-background hero-background--lines">
       <div class="container">
         <div class="artist-hero__grid">
-          <div class="artist-hero__image">
-            <img src="{hero_image}" alt="{escape(artist['name'])}">
+          <div class="artist-hero__image"{placeholder_style(artist.get('heroImageColor'))}>
+            <img src="{hero_image}" alt="{escape(artist['name'])}"{hero_attrs} fetchpriority="high">
           </div>
           <div class="artist-hero__info">
             <p class="artist-hero__label">Artist</p>
@@ -444,14 +725,25 @@ def generate_artist_page(artist, all_albums):
     {albums_html}
 '''
 
-    return get_header(artist['name'], path_prefix) + page_content + get_footer(path_prefix)
+    title = artist['name'] if page_number == 1 else f"{artist['name']} (page {page_number})"
+    hints = resource_hints(hero_image, embed_origins(youtube, player=False) if youtube else set(),
+                           hero_srcset, HERO_SIZES)
+    next_pages = next_album_pages(page_albums, path_prefix)
+    return get_header(title, path_prefix, hints, next_pages) + page_content + get_footer(path_prefix)
 
 def generate_artists_index(artists, all_albums):
-    """Generate artists index page."""
+    """Generate the artists index, split across pages."""
+    artist_pages = paginate(artists, ARTISTS_PER_PAGE)
+    return [(paged_path('pages/artists/index.html', number),
+             generate_artists_index_page(page_artists, all_albums, len(artists), number, len(artist_pages)))
+            for number, page_artists in enumerate(artist_pages, 1)]
+
+def generate_artists_index_page(page_artists, all_albums, artist_count, page_number=1, page_count=1):
+    """Generate one page of the artists index."""
     path_prefix = '../../'
 
     artist_items = []
-    for artist in artists:
+    for artist in page_artists:
         album_count = len([a for a in all_albums if a['artistSlug'] == artist['slug']])
         hero_image = artist.get('heroImage')
         if hero_image:
@@ -462,8 +754,8 @@ def generate_artists_index(artists, all_albums):
 
         artist_items.append(f'''
       <div class="artist-item">
-        <div class="artist-item__image">
-          <img src="{hero_image}" alt="{escape(artist['name'])}">
+        <div class="artist-item__image"{placeholder_style(artist.get('heroImageColor'))}>
+          <img src="{hero_image}" alt="{escape(artist['name'])}"{image_attrs(artist.get('heroImage'), artist.get('heroImageInfo'), path_prefix, ARTIST_ITEM_SIZES)}>
         </div>
         <div class="artist-item__info">
           <h2 class="artist-item__name">
@@ -477,15 +769,15 @@ def generate_artists_index(artists, all_albums):
     page_content = f'''
     <section class="page-intro">
       <div class="container">
-        <h1 class="page-intro__title">Boston-based indie rock, pop, americana.</h1>
-        <p class="page-intro__subtitle">Static Motor Recordings is home to popsmiths The Longwalls, DIY wunderkind Kurt von Stetten, singer/songwriter Dan London, and ol' local favs Gatsby.</p>
+        <h1 class="page-intro__title">{SITE['artists_intro']['title']}</h1>
+        <p class="page-intro__subtitle">{SITE['artists_intro']['subtitle']}</p>
       </div>
     </section>
 
     <section class="catalog-header">
       <div class="container">
         <p class="catalog-header__title">Label Roster</p>
-        <h1 class="catalog-header__count">{len(artists)} Artists</h1>
+        <h1 class="catalog-header__count">{artist_count} Artists</h1>
       </div>
     </section>
 
@@ -494,32 +786,30 @@ def generate_artists_index(artists, all_albums):
         <div class="artist-list">
           {''.join(artist_items)}
         </div>
+        {pagination_nav(page_number, page_count, lambda n: paged_path('pages/artists/index.html', n), path_prefix)}
       </div>
     </section>
 '''
 
-    return get_header('Artists', path_prefix) + page_content + get_footer(path_prefix)
-
-def generate_about_page(timeline):
-    """Generate about page."""
-    path_prefix = '../'
-
-    # Group timeline by year
-    years = {}
-    for item in timeline:
-        if item.get('date'):
-            year = item['date'][:4]
-            if year not in years:
-                years[year] = []
-            years[year].append(item)
-
-    # Build timeline HTML (show key events, limit per year)
-    timeline_items = []
-    for year in sorted(years.keys(), reverse=True):
-        events = years[year][:3]  # Limit to 3 events per year
-        for event in events:
-            type_label = event.get('type', 'news').title()
-            timeline_items.append(f'''
+    title = 'Artists' if page_number == 1 else f'Artists (page {page_number})'
+    return get_header(title, path_prefix) + page_content + get_footer(path_prefix)
+
+def timeline_events(timeline):
+    """Dated timeline events, newest first."""
+    return sorted((event for event in timeline if event.get('date')), key=lambda event: event['date'], reverse=True)
+
+def timeline_page_path(number, year=None):
+    """Site-relative path of a timeline page; page 1 of the full timeline is the about page."""
+    if year:
+        return paged_path(f'pages/timeline/{year}.html', number)
+    return 'pages/about.html' if number == 1 else f'pages/timeline/page-{number}.html'
+
+def timeline_items(events):
+    """Timeline entries for a list of events."""
+    items = []
+    for event in events:
+        type_label = event.get('type', 'news').title()
+        items.append(f'''
         <div class="timeline__item">
           <span class="timeline__date">{escape(event.get('date', ''))}</span>
           <div class="timeline__content">
@@ -527,20 +817,90 @@ def generate_about_page(timeline):
             <h3 class="timeline__heading">{escape(event.get('title', ''))}</h3>
           </div>
         </div>''')
+    return ''.join(items)
+
+def timeline_years_nav(years, path_prefix, current=None):
+    """Links to the per-year timeline archive pages."""
+    links = []
+    for year in years:
+        if year == current:
+            links.append(f'<span class="timeline-years__link timeline-years__link--active">{year}</span>')
+        else:
+            links.append(f'<a href="{path_prefix}{timeline_page_path(1, year)}" class="timeline-years__link">{year}</a>')
+    return f'''
+        <nav class="timeline-years" aria-label="Timeline by year">
+          {' '.join(links)}
+        </nav>'''
+
+def generate_timeline_pages(timeline):
+    """Generate the timeline pages after the first (which is on the about page) and per-year archives."""
+    events = timeline_events(timeline)
+    years = sorted({event['date'][:4] for event in events}, reverse=True)
+    pages = []
+
+    event_pages = paginate(events, TIMELINE_PER_PAGE)
+    for number, page_events in enumerate(event_pages[1:], 2):
+        pages.append((timeline_page_path(number),
+                      generate_timeline_page('Label Timeline', page_events, years, number, len(event_pages))))
+
+    for year in years:
+        year_pages = paginate([event for event in events if event['date'].startswith(year)], TIMELINE_PER_PAGE)
+        for number, page_events in enumerate(year_pages, 1):
+            pages.append((timeline_page_path(number, year),
+                          generate_timeline_page(f'Label Timeline: {year}', page_events, years,
+                                                 number, len(year_pages), year)))
+    return pages
+
+def generate_timeline_page(title, events, years, page_number, page_count, year=None):
+    """Generate one timeline archive page."""
+    path_prefix = '../../'
+    nav = pagination_nav(page_number, page_count, lambda n: timeline_page_path(n, year), path_prefix,
+                         prev_label='&larr; Newer', next_label='Older &rarr;')
+
+    page_content = f'''
+    <section class="timeline">
+      <div class="container">
+        <h1 class="timeline__title">{escape(title)}</h1>
+        {timeline_years_nav(years, path_prefix, year)}
+        <div class="timeline__list">
+          {timeline_items(events)}
+        </div>
+        {nav}
+      </div>
+    </section>
+'''
+
+    page_title = title if page_number == 1 else f'{title} (page {page_number})'
+    return get_header(page_title, path_prefix) + page_content + get_footer(path_prefix)
+
+def generate_about_page(timeline, release_count, artist_count):
+    """Generate about page, which carries the first page of the label timeline."""
+    path_prefix = '../'
+    about = SITE['about']
+    paragraphs = ''.join(f'''
+            <p>
+              {paragraph}
+            </p>''' for paragraph in about['paragraphs'])
+
+    events = timeline_events(timeline)
+    years = sorted({event['date'][:4] for event in events}, reverse=True)
+    event_pages = paginate(events, TIMELINE_PER_PAGE)
+    nav = pagination_nav(1, len(event_pages), timeline_page_path, path_prefix,
+                         prev_label='&larr; Newer', next_label='Older &rarr;')
 
     page_content = f'''
     <section class="page-intro">
       <div class="container">
-        <h1 class="page-intro__title">Because really DIY means doing it yourselves.</h1>
-        <p class="page-intro__subtitle">Friends making music together, releasing it on their own terms, and building something that lasted seventeen years.</p>
+        <h1 class="page-intro__title">{about['title']}</h1>
+        <p class="page-intro__subtitle">{about['subtitle']}</p>
       </div>
     </section>
 
     <section class="about-hero">
       <div class="container">
-        <h1 class="about-hero__title">Static Motor Recordings</h1>
+        <h1 class="about-hero__title">{SITE['name']}</h1>
         <p class="about-hero__subtitle">
-          A Boston-based independent record label dedicated to releasing thoughtful, well-crafted indie rock, pop, and americana from 2003 to 2020.
+          {about['summary']}
         </p>
       </div>
     </section>
@@ -550,34 +910,19 @@ def generate_about_page(timeline):
         <div class="about-content__grid">
           <div class="about-content__sidebar">
             <p class="about-content__label">Founded</p>
-            <p class="text-xl font-semibold">2003</p>
+            <p class="text-xl font-semibold">{about['founded']}</p>
 
             <p class="about-content__label mt-6">Location</p>
-            <p class="text-xl font-semibold">Boston, MA</p>
+            <p class="text-xl font-semibold">{about['location']}</p>
 
             <p class="about-content__label mt-6">Catalog</p>
-            <p class="text-xl font-semibold">27 Releases</p>
+            <p class="text-xl font-semibold">{release_count} Releases</p>
 
             <p class="about-content__label mt-6">Artists</p>
-            <p class="text-xl font-semibold">4 Acts</p>
+            <p class="text-xl font-semibold">{artist_count} Acts</p>
           </div>
 
-          <div class="about-content__main">
-            <p>
-              Static Motor Recordings was founded in Boston in 2003 with a simple mission: to release music we loved from artists we believed in. Over seventeen years, the label became home to The Longwalls, Kurt von Stetten, Gatsby, and Dan London.
-            </p>
-            <p>
-              From the beginning, we approached each release with care and attention to detail. Whether it was a full-length album, an EP, or a single, every release received the same dedication to quality in recording, design, and promotion.
-            </p>
-            <p>
-              The label earned recognition from outlets including The Boston Globe, The Noise, Twangville, The Owl Mag, and countless music blogs. Our artists received radio play on WMBR, WMFO, and college stations across the country. Songs found their way onto MTV and Vans promotional videos.
-            </p>
-            <p>
-              In 2020, after 27 releases, Static Motor Recordings closed its doors. This archive preserves the catalog and documents the history of the label for anyone who wants to discover or revisit the music.
-            </p>
-            <p>
-              The music remains available on Bandcamp and streaming platforms. Thank you to everyone who supported the label over the years.
-            </p>
+          <div class="about-content__main">{paragraphs}
           </div>
         </div>
       </div>
@@ -586,60 +931,288 @@ def generate_about_page(timeline):
     <section class="timeline">
       <div class="container">
         <h2 class="timeline__title">Label Timeline</h2>
+        {timeline_years_nav(years, path_prefix)}
         <div class="timeline__list">
-          {''.join(timeline_items[:30])}
+          {timeline_items(event_pages[0])}
         </div>
+        {nav}
       </div>
     </section>
 '''
 
     return get_header('About', path_prefix) + page_content + get_footer(path_prefix)
 
-def main():
-    print("Loading data...")
+def generate_catalog_pages(albums):
+    """Generate the static, paginated catalog (the homepage grid is rendered by app.js)."""
+    by_date = sorted(albums, key=lambda album: album.get('releaseDate') or '', reverse=True)
+    album_pages = paginate(by_date, ALBUMS_PER_PAGE)
+    return [(paged_path('pages/catalog/index.html', number),
+             generate_catalog_page(page_albums, len(albums), number, len(album_pages)))
+            for number, page_albums in enumerate(album_pages, 1)]
+
+def generate_catalog_page(page_albums, album_count, page_number=1, page_count=1):
+    """Generate one page of the catalog."""
+    path_prefix = '../../'
+    album_items = [album_card(album, path_prefix, show_year=True) for album in page_albums]
+
+    page_content = f'''
+    <section class="catalog-header">
+      <div class="container">
+        <p class="catalog-header__title">Catalog</p>
+        <h1 class="catalog-header__count">{album_count} Releases</h1>
+      </div>
+    </section>
+
+    <section class="album-grid">
+      <div class="container">
+        <div class="grid grid-cols-4">
+          {''.join(album_items)}
+        </div>
+        {pagination_nav(page_number, page_count, lambda n: paged_path('pages/catalog/index.html', n), path_prefix)}
+      </div>
+    </section>
+'''
+
+    title = 'Catalog' if page_number == 1 else f'Catalog (page {page_number})'
+    return get_header(title, path_prefix) + page_content + get_footer(path_prefix)
+
+def generate_people_index(people):
+    """Generate the index of everyone credited, split across pages."""
+    people_pages = paginate(people, PEOPLE_PER_PAGE)
+    return [(paged_path('pages/people/index.html', number),
+             generate_people_index_page(page_people, len(people), number, len(people_pages)))
+            for number, page_people in enumerate(people_pages, 1)]
+
+def generate_people_index_page(page_people, people_count, page_number=1, page_count=1):
+    """Generate one page of the people index."""
+    path_prefix = '../../'
+    people_items = []
+    for person in page_people:
+        release_count = len(person['credits'])
+        people_items.append(f'''
+          <li class="people-list__item">
+            <a href="{person['slug']}.html" class="people-list__name">{escape(person['name'])}</a>
+            <span class="people-list__releases">{release_count} release{'s' if release_count != 1 else ''}</span>
+          </li>''')
+
+    page_content = f'''
+    <section class="catalog-header">
+      <div class="container">
+        <p class="catalog-header__title">Credits</p>
+        <h1 class="catalog-header__count">{people_count} People</h1>
+      </div>
+    </section>
+
+    <section class="album-section">
+      <div class="container">
+        <ul class="people-list">
+          {''.join(people_items)}
+        </ul>
+        {pagination_nav(page_number, page_count, lambda n: paged_path('pages/people/index.html', n), path_prefix)}
+      </div>
+    </section>
+'''
+
+    title = 'People' if page_number == 1 else f'People (page {page_number})'
+    return get_header(title, path_prefix) + page_content + get_footer(path_prefix)
+
+def generate_person_page(person, albums_by_slug, artist_slugs):
+    """Generate a person's page: every release they are credited on, with their roles."""
+    path_prefix = '../../'
+    credits = [(albums_by_slug[credit['album']], credit.get('roles') or [])
+               for credit in person['credits'] if credit['album'] in albums_by_slug]
+
+    credit_items = []
+    for album, roles in credits:
+        roles_html = f'''
+            <p class="person-credit__roles">{escape('; '.join(roles))}</p>''' if roles else ''
+        credit_items.append(f'''
+          <div class="person-credit">{album_card(album, path_prefix, show_year=True)}{roles_html}
+          </div>''')
+
+    artist_html = ''
+    if person['slug'] in artist_slugs:
+        artist_html = f'''
+        <p class="mt-6"><a href="{path_prefix}pages/artists/{person['slug']}.html" class="link-draw">Artist page &rarr;</a></p>'''
+
+    page_content = f'''
+    <section class="catalog-header">
+      <div class="container">
+        <p class="catalog-header__title"><a href="index.html">People</a></p>
+        <h1 class="catalog-header__count">{escape(person['name'])}</h1>
+      </div>
+    </section>
+
+    <section class="album-grid">
+      <div class="container">
+        <div class="grid grid-cols-4">
+          {''.join(credit_items)}
+        </div>{artist_html}
+      </div>
+    </section>
+'''
+
+    next_pages = next_album_pages([album for album, _ in credits], path_prefix)
+    return get_header(person['name'], path_prefix, next_pages=next_pages) + page_content + get_footer(path_prefix)
+
+def grid_index(albums):
+    """The homepage grid's card records and, per artist filter, their indexes newest first.
+
+    Albums without a release date sort last; ties keep catalog order, as the
+    grid always has.
+    """
+    records = [{field: album[field] for field in GRID_FIELDS if album.get(field) is not None} for album in albums]
+    by_date = sorted(range(len(albums)), key=lambda index: albums[index].get('releaseDate') or '', reverse=True)
+    order = {'all': by_date}
+    for index in by_date:
+        order.setdefault(albums[index]['artistSlug'], []).append(index)
+    return {'albums': records, 'order': order}
+
+def write_grid_index(albums):
+    """Write grid.json beside the site's other data, where app.js loads it."""
+    path = data_path('grid.json')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(grid_index(albums), f, ensure_ascii=False, separators=(',', ':'))
+
+def write_pages(pages):
+    """Inline each template's critical CSS into its pages and write them out."""
+    by_template = {}
+    for template, _, _, page_html in pages:
+        by_template.setdefault(template, []).append(page_html)
+    critical = {template: compute_critical_css(template, pages_html)
+                for template, pages_html in by_template.items()}
+    font_css = self_hosted_font_css()
+
+    with progress.stage('write') as counts:
+        for template, relpath, path_prefix, page_html in progress.track(pages, 'Writing pages'):
+            page_html = inline_critical_css(page_html, path_prefix, critical[template], template, font_css, relpath)
+            with open(os.path.join(BASE_PATH, relpath), 'w') as f:
+                f.write(page_html)
+            progress.debug(f"Created: {relpath}", path=relpath)
+            counts['pages'] += 1
+
+def configure_site(site):
+    """Point the generator at one site config's tree, data and branding."""
+    global BASE_PATH, DATA_PATH, SITE
+    BASE_PATH = site['site_path']
+    DATA_PATH = site['data_path']
+    SITE = site
+
+def build_site(site):
+    """Generate one configured site."""
+    configure_site(site)
+    progress.info(f"=== {site['name']} ===", site=site['name'])
+    generate_site()
+    return site['name']
+
+def build_group(sites):
+    """Generate sites sharing a stylesheet in turn. Runs in a worker process."""
+    return [build_site(site) for site in sites]
+
+def stylesheet_groups(sites):
+    """Sites grouped by the text of their stylesheet, in config order."""
+    groups = {}
+    for site in sites:
+        path = os.path.join(site['site_path'], STYLESHEET)
+        css = None
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                css = f.read()
+        groups.setdefault(css, []).append(site)
+    return list(groups.values())
+
+def build_sites(sites, workers=None):
+    """Generate several sites, one process per distinct stylesheet."""
+    groups = stylesheet_groups(sites)
+    workers = min(workers or os.cpu_count() or 1, len(groups))
+    if workers < 2:
+        return [name for group in groups for name in build_group(group)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [name for names in pool.map(build_group, groups) for name in names]
+
+def generate_site():
+    """Generate every page of the site BASE_PATH points at."""
+    progress.info("Loading data...")
     albums = load_json('albums.json')
     artists = load_json('artists.json')
     timeline = load_json('timeline.json')
+    people = load_people()
+
+    # Fail fast on malformed records rather than halfway through rendering
+    errors = validate_catalog(albums, artists, timeline, people, load_rule_types(data_path('timeline_rules.json')))
+    if errors:
+        progress.error(f"Catalog has {len(errors)} errors")
+        for error in errors:
+            progress.error(error)
+        sys.exit(1)
 
     # Create directories
-    os.makedirs(os.path.join(BASE_PATH, 'pages/albums'), exist_ok=True)
-    os.makedirs(os.path.join(BASE_PATH, 'pages/artists'), exist_ok=True)
-
-    # Generate album pages
-    print(f"\nGenerating {len(albums)} album pages...")
-    for album in albums:
-        html_content = generate_album_page(album, albums, artists)
-        filepath = os.path.join(BASE_PATH, 'pages/albums', f'{album["slug"]}.html')
-        with open(filepath, 'w') as f:
-            f.write(html_content)
-        print(f"  Created: {album['slug']}.html")
-
-    # Generate artist pages
-    print(f"\nGenerating {len(artists)} artist pages...")
-    for artist in artists:
-        html_content = generate_artist_page(artist, albums)
-        filepath = os.path.join(BASE_PATH, 'pages/artists', f'{artist["slug"]}.html')
-        with open(filepath, 'w') as f:
-            f.write(html_content)
-        print(f"  Created: {artist['slug']}.html")
-
-    # Generate artists index
-    print("\nGenerating artists index...")
-    html_content = generate_artists_index(artists, albums)
-    filepath = os.path.join(BASE_PATH, 'pages/artists/index.html')
-    with open(filepath, 'w') as f:
-        f.write(html_content)
-    print("  Created: artists/index.html")
-
-    # Generate about page
-    print("\nGenerating about page...")
-    html_content = generate_about_page(timeline)
-    filepath = os.path.join(BASE_PATH, 'pages/about.html')
-    with open(filepath, 'w') as f:
-        f.write(html_content)
-    print("  Created: about.html")
-
-    print("\nDone! Generated all static pages.")
+    for directory in ['pages/albums', 'pages/artists', 'pages/timeline', 'pages/catalog', 'pages/people']:
+        os.makedirs(os.path.join(BASE_PATH, directory), exist_ok=True)
+
+    # (template, path, path_prefix, html) for every page, written once critical CSS is known
+    pages = []
+
+    with progress.stage('render') as counts:
+        # Generate album pages
+        people_by_key = {person_key(person['name']): person for person in people}
+        for album in progress.track(albums, 'Album pages'):
+            html_content = generate_album_page(album, albums, artists, people_by_key)
+            pages.append(('album', f'pages/albums/{album["slug"]}.html', '../../', html_content))
+
+        # Generate artist pages
+        for artist in progress.track(artists, 'Artist pages'):
+            for relpath, html_content in generate_artist_pages(artist, albums):
+                pages.append(('artist', relpath, '../../', html_content))
+
+        # Generate artists index
+        for relpath, html_content in generate_artists_index(artists, albums):
+            pages.append(('artists-index', relpath, '../../', html_content))
+
+        # Generate catalog
+        for relpath, html_content in generate_catalog_pages(albums):
+            pages.append(('catalog', relpath, '../../', html_content))
+
+        # Generate people pages from the credits index
+        if people:
+            albums_by_slug = {album['slug']: album for album in albums}
+            artist_slugs = {artist['slug'] for artist in artists}
+            for relpath, html_content in generate_people_index(people):
+                pages.append(('people-index', relpath, '../../', html_content))
+            for person in progress.track(people, 'People pages'):
+                html_content = generate_person_page(person, albums_by_slug, artist_slugs)
+                pages.append(('person', f'pages/people/{person["slug"]}.html', '../../', html_content))
+
+        # Generate about page and timeline archive
+        html_content = generate_about_page(timeline, len(albums), len(artists))
+        pages.append(('about', 'pages/about.html', '../', html_content))
+        for relpath, html_content in generate_timeline_pages(timeline):
+            pages.append(('timeline', relpath, '../../', html_content))
+
+        # The homepage is written by hand; only its styles are managed here
+        with open(os.path.join(BASE_PATH, 'index.html'), 'r') as f:
+            pages.append(('home', 'index.html', '', f.read()))
+
+        counts.update(template for template, _, _, _ in pages)
+
+    progress.info("Inlining critical CSS...")
+    write_pages(pages)
+    write_grid_index(albums)
+
+    manifest = write_service_worker(BASE_PATH)
+    progress.info(f"Wrote service worker: version {manifest['version']}, "
+                  f"{len(manifest['precache'])} precached files", version=manifest['version'])
+
+    progress.info("Done! Generated all static pages.")
+
+def main():
+    progress.configure_from_args()
+    sites = load_sites()
+    if sites:
+        build_sites(sites)
+    else:
+        generate_site()
 
 if __name__ == '__main__':
     main()
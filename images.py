@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Record intrinsic image dimensions and resized derivatives in the catalog.
+
+Sizes are read straight from the file headers (JPEG, PNG, GIF, WebP, SVG), so
+no imaging library is needed. Derivatives are resized copies stored next to
+the original as <name>-<width>w.<ext>, e.g. kowloon-400w.jpg. When Pillow is
+installed (pip install pillow), missing or stale ones are made at each of
+DERIVATIVE_WIDTHS narrower than the original; without it, only the
+derivatives already on disk are recorded.
+
+Each album's coverImage and each artist's heroImage gets a sibling record:
+
+    "coverImageInfo": {"width": 1200, "height": 1200,
+                       "derivatives": [{"src": "assets/images/albums/kowloon-400w.jpg", "width": 400}]}
+
+generate_pages.py and app.js turn these into width/height and srcset/sizes.
+"""
+
+import json
+import os
+import re
+import struct
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+
+# (data file, image field) pairs to annotate
+IMAGE_FIELDS = [
+    ('albums.json', 'coverImage'),
+    ('artists.json', 'heroImage'),
+]
+
+# Widths of the resized copies made of each image, for srcset
+DERIVATIVE_WIDTHS = [400, 800, 1200]
+
+# Formats Pillow resizes; SVGs and GIFs are left as they are
+RESIZABLE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+JPEG_QUALITY = 82
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# ==========================================================================
+# Size probes
+# ==========================================================================
+
+def jpeg_size(f):
+    """Width and height from the first JPEG start-of-frame segment."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue  # standalone markers have no length
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in JPEG_SOF_MARKERS:
+            header = f.read(5)
+            if len(header) < 5:
+                return None
+            height, width = struct.unpack('>HH', header[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def png_size(header):
+    """Width and height from a PNG IHDR chunk."""
+    return struct.unpack('>II', header[16:24])
+
+
+def gif_size(header):
+    """Width and height from a GIF logical screen descriptor."""
+    return struct.unpack('<HH', header[6:10])
+
+
+def webp_size(header):
+    """Width and height from a WebP VP8, VP8L or VP8X chunk."""
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = int.from_bytes(header[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        return int.from_bytes(header[24:27], 'little') + 1, int.from_bytes(header[27:30], 'little') + 1
+    return None
+
+
+def svg_size(text):
+    """Width and height from an SVG's width/height attributes, or its viewBox."""
+    match = re.search(r'<svg\b[^>]*>', text)
+    if not match:
+        return None
+    tag = match.group(0)
+    width = re.search(r'\swidth="([\d.]+)(?:px)?"', tag)
+    height = re.search(r'\sheight="([\d.]+)(?:px)?"', tag)
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = re.search(r'\sviewBox="[\d.\-]+[\s,]+[\d.\-]+[\s,]+([\d.]+)[\s,]+([\d.]+)"', tag)
+    if view_box:
+        return round(float(view_box.group(1))), round(float(view_box.group(2)))
+    return None
+
+
+def image_size(path):
+    """Intrinsic (width, height) of an image file, or None if it can't be read."""
+    with open(path, 'rb') as f:
+        header = f.read(32)
+        if header.startswith(b'\xff\xd8'):
+            return jpeg_size(f)
+        if header.startswith(b'\x89PNG\r\n\x1a\n'):
+            return png_size(header)
+        if header[:6] in (b'GIF87a', b'GIF89a'):
+            return gif_size(header)
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return webp_size(header)
+        f.seek(0)
+        text = f.read(4096).decode('utf-8', errors='ignore')
+        if '<svg' in text:
+            return svg_size(text)
+    return None
+
+# ==========================================================================
+# Catalog records
+# ==========================================================================
+
+def derivative_src(src, width):
+    stem, ext = os.path.splitext(src)
+    return f'{stem}-{width}w{ext}'
+
+
+def write_derivatives(base_path, src, width):
+    """Make the missing or out-of-date resized copies of an image; returns how many were written."""
+    path = os.path.join(base_path, src)
+    if Image is None or os.path.splitext(src)[1].lower() not in RESIZABLE_EXTENSIONS:
+        return 0
+    written = 0
+    for target in DERIVATIVE_WIDTHS:
+        if target >= width:
+            continue
+        out = os.path.join(base_path, derivative_src(src, target))
+        if os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(path):
+            continue
+        with Image.open(path) as image:
+            height = max(1, round(image.height * target / image.width))
+            resized = image.resize((target, height), Image.LANCZOS)
+            if out.lower().endswith(('.jpg', '.jpeg')) and resized.mode not in ('RGB', 'L'):
+                resized = resized.convert('RGB')
+            resized.save(out, quality=JPEG_QUALITY)
+        written += 1
+    return written
+
+
+def find_derivatives(base_path, src):
+    """Resized copies of an image (<name>-<width>w.<ext>), smallest first."""
+    directory, filename = os.path.split(src)
+    stem, ext = os.path.splitext(filename)
+    pattern = re.compile(re.escape(stem) + r'-(\d+)w' + re.escape(ext) + '$')
+    full_dir = os.path.join(base_path, directory)
+    if not os.path.isdir(full_dir):
+        return []
+    derivatives = []
+    for name in os.listdir(full_dir):
+        match = pattern.match(name)
+        if match:
+            derivatives.append({'src': f'{directory}/{name}', 'width': int(match.group(1))})
+    return sorted(derivatives, key=lambda d: d['width'])
+
+
+def image_info(base_path, src):
+    """Dimensions and derivatives record for a site-relative image, or None."""
+    if not src or src.startswith('http'):
+        return None
+    path = os.path.join(base_path, src)
+    if not os.path.exists(path):
+        return None
+    size = image_size(path)
+    if not size:
+        return None
+    width, height = size
+    written = write_derivatives(base_path, src, width)
+    if written:
+        progress.debug(f"{src}: wrote {written} derivatives", path=src, written=written)
+    derivatives = [d for d in find_derivatives(base_path, src) if d['width'] < width]
+    return {'width': width, 'height': height, 'derivatives': derivatives}
+
+
+def main():
+    progress.configure_from_args()
+    if Image is None:
+        progress.warning("Pillow is not installed, so no derivatives are made: pip install pillow")
+    for filename, field in IMAGE_FIELDS:
+        path = os.path.join(BASE_PATH, 'data', filename)
+        progress.info(f"Loading {filename}...")
+        with open(path, 'r') as f:
+            records = json.load(f)
+
+        annotated = 0
+        for record in records:
+            info = image_info(BASE_PATH, record.get(field))
+            if info:
+                record[f'{field}Info'] = info
+                annotated += 1
+                sizes = ', '.join(str(d['width']) for d in info['derivatives'])
+                progress.debug(f"{record['slug']}: {info['width']}x{info['height']}" + (f" ({sizes}w)" if sizes else ''),
+                               slug=record['slug'])
+            else:
+                record.pop(f'{field}Info', None)
+                if record.get(field):
+                    progress.warning(f"Unreadable: {record[field]}", path=record[field])
+
+        with open(path, 'w') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+        progress.info(f"Annotated {annotated} of {len(records)} records", annotated=annotated, records=len(records))
+
+if __name__ == '__main__':
+    main()
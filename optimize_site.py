@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Minify generated HTML pages and prune unused rules from the stylesheet.
+
+Run after generate_pages.py. Every page is parsed to collect the tags, classes
+and ids actually in use (plus class names referenced from app.js), the
+stylesheet is pruned to the rules that can match and minified, and each
+generated HTML file is minified in place. The hand-written homepage is only
+read: generate_pages.py finds its style markers again on the next build, so
+it keeps the full stylesheet and its comments. Before anything is written the
+result is checked against a golden render of every page taken from the
+original files; if any page would lose content, attributes or matching CSS
+rules, nothing is written.
+"""
+
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+from service_worker import write_service_worker
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+CSS_FILE = 'assets/css/style.css'
+PRUNED_CSS_FILE = 'assets/css/style.min.css'
+JS_FILES = ['assets/js/app.js']
+PAGE_DIRS = ['.', 'pages']
+
+# Hand-written pages, read for the CSS they use but never rewritten
+SOURCE_PAGES = ['index.html']
+
+# Elements whose surrounding whitespace is never rendered
+BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style', 'noscript',
+    'header', 'footer', 'main', 'nav', 'section', 'article', 'aside', 'div',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'blockquote', 'figure', 'figcaption', 'form', 'hr', 'table', 'thead', 'tbody',
+    'tr', 'th', 'td', 'iframe', 'svg', 'line', 'path', 'text', 'br',
+}
+
+# Elements whose content must be kept byte-for-byte
+RAW_TAGS = ('pre', 'textarea', 'script', 'style')
+
+# Elements that never have a closing tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# Selectors that always apply regardless of page content
+ALWAYS_USED_TAGS = {'*', 'html', 'body', ':root'}
+
+# ==========================================================================
+# HTML
+# ==========================================================================
+
+RAW_BLOCK_RE = re.compile(r'<(%s)\b.*?</\1\s*>' % '|'.join(RAW_TAGS), re.IGNORECASE | re.DOTALL)
+COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+TAG_RE = re.compile(r'<[^>]+>')
+TAG_SPACE_RE = re.compile(r'("[^"]*"|\'[^\']*\')|\s+')
+BLOCK_SPACE_RE = re.compile(
+    r'\s*(</?(?:%s)\b[^>]*>)\s*' % '|'.join(sorted(BLOCK_TAGS, key=len, reverse=True)),
+    re.IGNORECASE)
+
+
+def _collapse_tag(match):
+    tag = TAG_SPACE_RE.sub(lambda m: m.group(1) or ' ', match.group(0))
+    return re.sub(r' (/?>)$', r'\1', tag)
+
+
+def minify_html(text):
+    """Strip comments and redundant whitespace, leaving raw-text elements untouched."""
+    raw_blocks = []
+
+    def stash(match):
+        raw_blocks.append(match.group(0))
+        return f'\x00{len(raw_blocks) - 1}\x00'
+
+    text = RAW_BLOCK_RE.sub(stash, text)
+    text = COMMENT_RE.sub('', text)
+    text = TAG_RE.sub(_collapse_tag, text)
+    text = re.sub(r'\s+', ' ', text)
+    text = BLOCK_SPACE_RE.sub(r'\1', text)
+    text = re.sub(r'\x00(\d+)\x00', lambda m: raw_blocks[int(m.group(1))], text)
+    return text.strip() + '\n'
+
+
+class PageRender(HTMLParser):
+    """Canonical render of a page: element tree, attributes and visible text.
+
+    Whitespace is normalized the way a browser would render it, so two
+    documents with the same render display identically.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+        self.elements = []
+        self._stack = []
+        self._last_child = {}
+        self._text = []
+        self._raw = 0
+
+    def _flush(self, boundary):
+        text = ''.join(self._text)
+        self._text = []
+        if not self._raw:
+            text = re.sub(r'\s+', ' ', text)
+            if self.events and self.events[-1][0] == 'block':
+                text = text.lstrip()
+            if boundary:
+                text = text.rstrip()
+        if text:
+            self.events.append(('text', text))
+
+    def _add_element(self, tag, attrs):
+        attr_map = dict(attrs)
+        parent = self._stack[-1] if self._stack else None
+        self.elements.append({
+            'tag': tag,
+            'classes': set((attr_map.get('class') or '').split()),
+            'id': attr_map.get('id'),
+            'attrs': set(attr_map),
+            'parent': parent,
+            'prev': self._last_child.get(parent),
+        })
+        index = len(self.elements) - 1
+        self._last_child[parent] = index
+        return index
+
+    def handle_starttag(self, tag, attrs):
+        block = tag in BLOCK_TAGS
+        self._flush(block)
+        self.events.append(('block' if block else 'start', tag, tuple(sorted(
+            (name, re.sub(r'\s+', ' ', value or '').strip() if name == 'class' else value or '')
+            for name, value in attrs))))
+        index = self._add_element(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._stack.append(index)
+        if tag in RAW_TAGS:
+            self._raw += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._stack.pop()
+        if tag in RAW_TAGS:
+            self._raw -= 1
+
+    def handle_endtag(self, tag):
+        block = tag in BLOCK_TAGS
+        self._flush(block)
+        self.events.append(('block' if block else 'end', '/' + tag))
+        if any(self.elements[i]['tag'] == tag for i in self._stack):
+            while self.elements[self._stack.pop()]['tag'] != tag:
+                pass
+        if tag in RAW_TAGS and self._raw:
+            self._raw -= 1
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush(True)
+
+
+def render_page(text):
+    """Parse an HTML document into its canonical render."""
+    parser = PageRender()
+    parser.feed(text)
+    parser.close()
+    return parser
+
+# ==========================================================================
+# CSS
+# ==========================================================================
+
+CSS_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|/\*.*?\*/|[{};]|[^{};"\'/]+|/', re.DOTALL)
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+ID_RE = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+TAG_NAME_RE = re.compile(r'(?:^|[\s>+~])([a-zA-Z][\w-]*|\*)')
+PSEUDO_FUNC_RE = re.compile(r':{1,2}[\w-]+\((?:[^()]|\([^()]*\))*\)')
+PSEUDO_RE = re.compile(r':{1,2}[\w-]+')
+ATTR_RE = re.compile(r'\[[^\]]*\]')
+KEYFRAMES_RE = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+ANIMATION_RE = re.compile(r'animation(?:-name)?\s*:\s*([^;]+)')
+
+
+def parse_css(text):
+    """Parse a stylesheet into a tree of ('rule', selector, body) and ('at', prelude, children) nodes.
+
+    Blockless at-rules (@import, @charset) become ('at', prelude, None);
+    declaration blocks are kept as raw text.
+    """
+    tokens = [t for t in CSS_TOKEN_RE.findall(text) if not t.startswith('/*')]
+    pos = 0
+
+    def parse_block(nested):
+        nonlocal pos
+        nodes = []
+        buffer = []
+        while pos < len(tokens):
+            token = tokens[pos]
+            pos += 1
+            if token == '{':
+                prelude = ''.join(buffer).strip()
+                buffer = []
+                if prelude.startswith('@') and not KEYFRAMES_RE.match(prelude) and not prelude.startswith('@font-face'):
+                    nodes.append(('at', prelude, parse_block(True)))
+                else:
+                    nodes.append(('rule', prelude, read_body()))
+            elif token == '}':
+                if nested:
+                    return nodes
+            elif token == ';' and ''.join(buffer).strip().startswith('@'):
+                nodes.append(('at', ''.join(buffer).strip(), None))
+                buffer = []
+            else:
+                buffer.append(token)
+        return nodes
+
+    def read_body():
+        nonlocal pos
+        depth = 1
+        body = []
+        while pos < len(tokens):
+            token = tokens[pos]
+            pos += 1
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            body.append(token)
+        return ''.join(body)
+
+    return parse_block(False)
+
+
+def selector_requirements(selector):
+    """Return the (tags, classes, ids) a selector needs to be present in order to match."""
+    core = PSEUDO_FUNC_RE.sub('', selector)
+    core = ATTR_RE.sub('', core)
+    core = PSEUDO_RE.sub(lambda m: ':root' if m.group(0) == ':root' else '', core)
+    classes = set(CLASS_RE.findall(core))
+    ids = set(ID_RE.findall(core))
+    tags = {t.lower() for t in TAG_NAME_RE.findall(CLASS_RE.sub('', ID_RE.sub('', core)))}
+    return tags, classes, ids
+
+
+def parse_selector(selector):
+    """Split a selector into [(combinator, tag, classes, ids, attrs), ...] from left to right.
+
+    Pseudo-classes are ignored, so the result over-approximates what the
+    selector can match.
+    """
+    core = PSEUDO_FUNC_RE.sub('', selector)
+    core = PSEUDO_RE.sub('', core).strip()
+    parts = []
+    combinator = ' '
+    for piece in re.split(r'\s*([>+~])\s*|\s+', core):
+        if piece is None or piece == '':
+            continue
+        if piece in '>+~':
+            combinator = piece
+            continue
+        attrs = {re.split(r'[~|^$*]?=', a)[0].strip() for a in re.findall(r'\[([^\]]*)\]', piece)}
+        plain = ATTR_RE.sub('', piece)
+        tag = re.match(r'[a-zA-Z][\w-]*|\*', plain)
+        parts.append((combinator, tag.group(0).lower() if tag else '*',
+                      set(CLASS_RE.findall(plain)), set(ID_RE.findall(plain)), attrs))
+        combinator = ' '
+    return parts
+
+
+def matches(elements, index, parts):
+    """True if the element at index matches the parsed selector."""
+    if not parts:
+        return True
+    combinator, tag, classes, ids, attrs = parts[-1]
+    element = elements[index]
+    if tag != '*' and tag != element['tag']:
+        return False
+    if not classes <= element['classes'] or not attrs <= element['attrs']:
+        return False
+    if ids and ids != {element['id']}:
+        return False
+    rest = parts[:-1]
+    if not rest:
+        return True
+    if combinator == '>':
+        return element['parent'] is not None and matches(elements, element['parent'], rest)
+    if combinator == '+':
+        return element['prev'] is not None and matches(elements, element['prev'], rest)
+    step = 'prev' if combinator == '~' else 'parent'
+    other = element[step]
+    while other is not None:
+        if matches(elements, other, rest):
+            return True
+        other = elements[other][step]
+    return False
+
+
+def selector_used(selector, used):
+    """True if every tag, class and id the selector names occurs on the site."""
+    tags, classes, ids = selector_requirements(selector)
+    if ':root' in selector:
+        return True
+    return (tags <= used['tags'] | ALWAYS_USED_TAGS
+            and classes <= used['classes']
+            and ids <= used['ids'])
+
+
+def prune_css(nodes, used):
+    """Drop rules and selectors that cannot match anything on the site."""
+    return drop_unused_keyframes(_filter_nodes(nodes, lambda selector: selector_used(selector, used)))
+
+
+def matching_css(nodes, renders):
+    """Prune a stylesheet to the rules matching an element of one of the given renders."""
+    def keep(selector):
+        if ':root' in selector:
+            return True
+        parts = parse_selector(selector)
+        return any(matches(render.elements, i, parts)
+                   for render in renders for i in range(len(render.elements)))
+
+    return drop_unused_keyframes(_filter_nodes(nodes, keep))
+
+
+def _filter_nodes(nodes, keep):
+    pruned = []
+    for kind, prelude, body in nodes:
+        if kind == 'rule':
+            if KEYFRAMES_RE.match(prelude) or prelude.startswith('@font-face'):
+                pruned.append((kind, prelude, body))
+                continue
+            selectors = [s.strip() for s in split_selectors(prelude) if keep(s.strip())]
+            if selectors:
+                pruned.append((kind, ','.join(selectors), body))
+        elif body is None:
+            pruned.append((kind, prelude, body))
+        else:
+            children = _filter_nodes(body, keep)
+            if children:
+                pruned.append((kind, prelude, children))
+    return pruned
+
+
+def drop_unused_keyframes(nodes):
+    """Remove @keyframes blocks no remaining declaration animates with."""
+    referenced = set()
+
+    def collect(items):
+        for kind, prelude, body in items:
+            if kind == 'rule' and not KEYFRAMES_RE.match(prelude):
+                for value in ANIMATION_RE.findall(body):
+                    referenced.update(re.findall(r'[\w-]+', value))
+            elif kind == 'at' and body:
+                collect(body)
+
+    def strip(items):
+        kept = []
+        for kind, prelude, body in items:
+            match = KEYFRAMES_RE.match(prelude)
+            if match and match.group(1) not in referenced:
+                continue
+            if kind == 'at' and body:
+                body = strip(body)
+            kept.append((kind, prelude, body))
+        return kept
+
+    collect(nodes)
+    return strip(nodes)
+
+
+def split_selectors(prelude):
+    """Split a selector list on top-level commas."""
+    parts, depth, current = [], 0, []
+    for char in prelude:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return [p for p in parts if p.strip()]
+
+
+def minify_declarations(body):
+    """Collapse whitespace in a declaration block, leaving strings untouched."""
+    out = []
+    for token in re.findall(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[^"\']+', body):
+        if token[0] in '"\'':
+            out.append(token)
+        else:
+            token = re.sub(r'\s+', ' ', token)
+            token = re.sub(r'\s*([:;,])\s*', r'\1', token)
+            token = re.sub(r'\s*!important', '!important', token)
+            out.append(token)
+    return ''.join(out).strip().rstrip(';')
+
+
+def serialize_css(nodes):
+    """Serialize a parsed stylesheet in minified form."""
+    out = []
+    for kind, prelude, body in nodes:
+        prelude = re.sub(r'\s+', ' ', prelude).strip()
+        if kind == 'rule':
+            prelude = re.sub(r'\s*([,>+~])\s*', r'\1', prelude)
+            if KEYFRAMES_RE.match(prelude):
+                out.append(f'{prelude}{{{serialize_css(parse_css(body))}}}')
+            else:
+                out.append(f'{prelude}{{{minify_declarations(body)}}}')
+        elif body is None:
+            out.append(f'{prelude};')
+        else:
+            out.append(f'{prelude}{{{serialize_css(body)}}}')
+    return ''.join(out)
+
+
+def flatten_rules(nodes, context=()):
+    """Yield (context, selector, declarations) for every style rule."""
+    for kind, prelude, body in nodes:
+        if kind == 'rule':
+            if KEYFRAMES_RE.match(prelude):
+                continue
+            if prelude.startswith('@font-face'):
+                yield context, prelude, minify_declarations(body)
+                continue
+            for selector in split_selectors(prelude):
+                yield context, re.sub(r'\s+', ' ', selector).strip(), minify_declarations(body)
+        elif body is not None:
+            yield from flatten_rules(body, context + (re.sub(r'\s+', ' ', prelude).strip(),))
+
+# ==========================================================================
+# Site scanning
+# ==========================================================================
+
+def find_pages(base_path):
+    """Return paths of every generated HTML page."""
+    pages = []
+    for page_dir in PAGE_DIRS:
+        root = os.path.join(base_path, page_dir)
+        if page_dir == '.':
+            pages.extend(os.path.join(root, f) for f in sorted(os.listdir(root)) if f.endswith('.html'))
+            continue
+        for dirpath, _, filenames in sorted(os.walk(root)):
+            pages.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.endswith('.html'))
+    return pages
+
+
+def collect_script_classes(base_path):
+    """Collect every class-like token appearing in a string literal in the site's scripts."""
+    classes = set()
+    for js_file in JS_FILES:
+        path = os.path.join(base_path, js_file)
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r') as f:
+            source = f.read()
+        for literal in re.findall(r'"([^"\n]*)"|\'([^\'\n]*)\'|`([^`]*)`', source):
+            for text in literal:
+                classes.update(re.findall(r'-?[_a-zA-Z][\w-]*', text))
+    return classes
+
+
+def collect_used(renders, script_classes):
+    """Union of tags, classes and ids across all page renders."""
+    used = {'tags': set(), 'classes': set(script_classes), 'ids': set()}
+    for render in renders:
+        for element in render.elements:
+            used['tags'].add(element['tag'])
+            used['classes'].update(element['classes'])
+            if element['id']:
+                used['ids'].add(element['id'])
+    return used
+
+
+def matching_rules(rules, renders):
+    """Rules whose selector matches at least one element of some page."""
+    matched = set()
+    for rule in rules:
+        context, selector, _ = rule
+        if selector.startswith('@') or ':root' in selector:
+            matched.add(rule)
+            continue
+        parts = parse_selector(selector)
+        for render in renders:
+            if any(matches(render.elements, i, parts) for i in range(len(render.elements))):
+                matched.add(rule)
+                break
+    return matched
+
+
+def is_source_page(path, base_path):
+    return os.path.relpath(path, base_path).replace(os.sep, '/') in SOURCE_PAGES
+
+
+def verify(originals, minified, css_nodes, pruned_nodes):
+    """Compare minified pages and pruned CSS against the golden render; return a list of problems."""
+    problems = []
+    golden = {}
+    for path, text in originals.items():
+        golden[path] = render_page(text)
+        if path in minified and golden[path].events != render_page(minified[path]).events:
+            problems.append(f'{path}: minified HTML renders differently')
+
+    kept = set(flatten_rules(pruned_nodes))
+    needed = matching_rules(set(flatten_rules(css_nodes)), golden.values())
+    for context, selector, _ in sorted(needed - kept):
+        problems.append(f'{CSS_FILE}: pruned a matching rule: {" ".join(context)} {selector}'.strip())
+    return problems
+
+
+def rewrite_stylesheet_links(text):
+    """Point stylesheet links at the pruned stylesheet."""
+    return re.sub(r'(href="[^"]*)%s"' % re.escape(CSS_FILE), r'\1%s"' % PRUNED_CSS_FILE, text)
+
+
+def main():
+    progress.configure_from_args()
+    pages = find_pages(BASE_PATH)
+    progress.info(f"Optimizing {len(pages)} pages...")
+
+    originals = {}
+    for path in pages:
+        with open(path, 'r') as f:
+            originals[path] = f.read()
+
+    with open(os.path.join(BASE_PATH, CSS_FILE), 'r') as f:
+        css_text = f.read()
+    css_nodes = parse_css(css_text)
+
+    script_classes = collect_script_classes(BASE_PATH)
+    used = collect_used([render_page(t) for t in originals.values()], script_classes)
+    progress.info(f"Used: {len(used['tags'])} tags, {len(used['classes'])} classes, {len(used['ids'])} ids")
+
+    pruned_nodes = prune_css(css_nodes, used)
+    pruned_css = serialize_css(pruned_nodes)
+    minified = {path: minify_html(text) for path, text in originals.items()
+                if not is_source_page(path, BASE_PATH)}
+
+    problems = verify(originals, minified, css_nodes, pruned_nodes)
+    if problems:
+        progress.error("Verification against golden render failed; nothing written:")
+        for problem in problems:
+            progress.error(problem)
+        sys.exit(1)
+
+    with open(os.path.join(BASE_PATH, PRUNED_CSS_FILE), 'w') as f:
+        f.write(pruned_css)
+    progress.info(f"CSS: {len(css_text):,} -> {len(pruned_css):,} bytes ({PRUNED_CSS_FILE})")
+
+    before = after = 0
+    for path, text in minified.items():
+        text = rewrite_stylesheet_links(text)
+        with open(path, 'w') as f:
+            f.write(text)
+        before += len(originals[path])
+        after += len(text)
+    progress.info(f"HTML: {before:,} -> {after:,} bytes")
+
+    # The pruned stylesheet changes the app shell
+    manifest = write_service_worker(BASE_PATH)
+    progress.info(f"Service worker: version {manifest['version']}")
+
+if __name__ == '__main__':
+    main()
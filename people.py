@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Index the people named in album credits, for the people pages.
+
+One pass over albums.json parses each album's credits into
+(person, role, album) entries (see personnel.py) and files them under the
+person's name key, so generate_pages.py can write a page per person and
+link credited names without searching the catalog again:
+
+    [
+      {
+        "name": "Mike Quinn",
+        "slug": "mike-quinn",
+        "credits": [
+          {"album": "careers-in-science", "roles": ["Produced The Longwalls", "Engineered, mixed, and mastered"]},
+          ...
+        ]
+      }
+    ]
+
+A person's name is the spelling used most often; credits are in catalog
+order. The index is written to data/people.json.
+"""
+
+import json
+import os
+from collections import Counter
+
+from personnel import credit_entries, person_key, person_slug
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+
+
+def people_index(albums):
+    """{name key: person} from every album's credits."""
+    people = {}
+    spellings = {}
+    for album in albums:
+        for name, role in credit_entries(album.get('credits')):
+            key = person_key(name)
+            if key not in people:
+                people[key] = {'name': name, 'slug': person_slug(name), 'credits': []}
+                spellings[key] = Counter()
+            spellings[key][name] += 1
+
+            credits = people[key]['credits']
+            if not credits or credits[-1]['album'] != album['slug']:
+                credits.append({'album': album['slug'], 'roles': []})
+            if role and role not in credits[-1]['roles']:
+                credits[-1]['roles'].append(role)
+
+    for key, person in people.items():
+        person['name'] = spellings[key].most_common(1)[0][0]
+    return people
+
+
+def main():
+    progress.configure_from_args()
+    with open(os.path.join(BASE_PATH, 'data', 'albums.json'), 'r') as f:
+        albums = json.load(f)
+
+    people = sorted(people_index(albums).values(), key=lambda person: person['slug'])
+    for person in people:
+        progress.debug(f"{person['name']}: {len(person['credits'])} releases", slug=person['slug'])
+
+    with open(os.path.join(BASE_PATH, 'data', 'people.json'), 'w') as f:
+        json.dump(people, f, indent=2, ensure_ascii=False)
+    progress.info(f"Indexed {len(people)} people", people=len(people))
+
+if __name__ == '__main__':
+    main()
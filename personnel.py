@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Pick out the people named in an album's free-text credits.
+
+Credits are hand-written, in a few recurring shapes:
+
+    Alan Wuorinen – vocals, acoustic guitar
+    Dan London: Lead and Backing Vocals, Guitars
+    Recorded, mixed and mastered with Mike Quinn at Moontower Studio
+    Artwork by Steve Madden
+    Trumpets by Ian Connelly and Tyler Mehlenbacher
+    Mastered: (Vinyl) Mike Quinn
+
+A name is two capitalised words (the second may carry a von/van/de
+particle) that either comes before a dash or colon, or follows "by",
+"with" or a colon, optionally after a parenthetical; names listed after it
+with ", " or "and" share its credit. "The ..." is taken for a band and
+"... Music", "... Publishing" or "... Studio" for a business, and both are
+skipped. Names are compared case-insensitively.
+"""
+
+import re
+
+# Words that make a capitalised pair a business, not a person
+BUSINESS = r"(?:Music|Publishing|Studios?)\b"
+
+NAME = (rf"(?!The\s)(?!\S+\s+{BUSINESS})[A-Z][\w’'-]+\s+(?:(?:von|van|de|Von|Van|De)\s+)?[A-Z][\w’'-]+"
+        rf"(?![\w’'-])(?!\s+{BUSINESS})")
+
+# "Name – roles", "Name: roles"
+NAME_BEFORE_ROLES = re.compile(rf"({NAME})(?=\s*(?:–|—|:|\s-\s))")
+
+# "by Name", "with Name", "artwork: Name", "mastered: (vinyl) Name"
+NAME_AFTER_CREDIT = re.compile(rf"(?:\bby|\bwith|:)\s+(?:\([^)]*\)\s+)?({NAME})")
+
+# ", Name" or " and Name" straight after a credited name
+CO_CREDIT = re.compile(rf"(?:\s*,\s*|\s+and\s+)({NAME})")
+
+
+def person_key(name):
+    """Case- and spacing-insensitive key for a credited name."""
+    return ' '.join(name.lower().split())
+
+
+def person_slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', person_key(name)).strip('-')
+
+
+def name_spans(line):
+    """(start, end, role) of each credited name in one line of credits, in order.
+
+    The role is the text after "Name –", or the clause before "by Name";
+    a name joined on with "with", ", " or "and" shares the role before it.
+    """
+    spans = {}
+    for match in NAME_BEFORE_ROLES.finditer(line):
+        role = re.sub(r'^\s*(?:–|—|:|-)\s*', '', line[match.end(1):]).strip()
+        spans.setdefault(match.start(1), (match.end(1), role))
+
+    clause_start = 0
+    role = ''
+    for match in NAME_AFTER_CREDIT.finditer(line):
+        boundary = max(line.rfind(mark, 0, match.start()) for mark in '.;|') + 1
+        if boundary > clause_start or not role:
+            role = line[boundary:match.start()].strip(' :–—-\xa0')
+        spans.setdefault(match.start(1), (match.end(1), role))
+        clause_start = match.end()
+        while co_credit := CO_CREDIT.match(line, clause_start):
+            spans.setdefault(co_credit.start(1), (co_credit.end(1), role))
+            clause_start = co_credit.end()
+    return [(start, end, role) for start, (end, role) in sorted(spans.items())]
+
+
+def credit_entries(credits):
+    """(name, role) for each credited name in a credits text, in order."""
+    entries = []
+    for line in (credits or '').splitlines():
+        for start, end, role in name_spans(line):
+            entries.append((line[start:end], role))
+    return entries
+
+
+def credited_people(credits):
+    """{key: name as first written} for everyone named in a credits text, in order."""
+    people = {}
+    for name, _ in credit_entries(credits):
+        people.setdefault(person_key(name), name)
+    return people
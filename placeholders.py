@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Precompute low-quality image placeholders for the catalog.
+
+Each album cover and artist hero gets its dominant colour, stored next to the
+image field (coverImageColor / heroImageColor) so generate_pages.py and app.js
+can paint the image box before the full image arrives.
+
+Results are cached in data/placeholders.json by a hash of the image bytes, so
+only new or changed images are decoded.
+
+Requires Pillow and numpy: pip install pillow numpy
+"""
+
+import hashlib
+import json
+import os
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = None
+
+from images import IMAGE_FIELDS
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+CACHE_FILE = 'data/placeholders.json'
+
+# Images are reduced to this many pixels per side before analysis
+SAMPLE_SIZE = 32
+
+# Bits kept per channel when grouping similar colours
+COLOR_BITS = 4
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dominant_color(path):
+    """Hex colour of the most common colour group in an image."""
+    with Image.open(path) as image:
+        image.draft('RGB', (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))  # cheap JPEG downscale while decoding
+        image = image.convert('RGBA').resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.BILINEAR)
+        pixels = np.asarray(image, dtype=np.uint32).reshape(-1, 4)
+
+    # Ignore transparent pixels; fall back to all pixels for fully transparent images
+    opaque = pixels[pixels[:, 3] > 127]
+    pixels = (opaque if len(opaque) else pixels)[:, :3]
+
+    # Group pixels into coarse colour bins and average the largest bin
+    shift = 8 - COLOR_BITS
+    binned = pixels >> shift
+    keys = (binned[:, 0] << (2 * COLOR_BITS)) | (binned[:, 1] << COLOR_BITS) | binned[:, 2]
+    largest = np.bincount(keys).argmax()
+    red, green, blue = pixels[keys == largest].mean(axis=0).round().astype(int)
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def load_cache(base_path):
+    path = os.path.join(base_path, CACHE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def main():
+    progress.configure_from_args()
+    if np is None:
+        progress.warning("Pillow and numpy are required: pip install pillow numpy")
+        return
+
+    cache = load_cache(BASE_PATH)
+    used = {}
+    computed = 0
+
+    for filename, field in IMAGE_FIELDS:
+        path = os.path.join(BASE_PATH, 'data', filename)
+        progress.info(f"Loading {filename}...")
+        with open(path, 'r') as f:
+            records = json.load(f)
+
+        for record in records:
+            src = record.get(field)
+            image_path = os.path.join(BASE_PATH, src) if src and not src.startswith('http') else None
+            if not image_path or not os.path.exists(image_path):
+                record.pop(f'{field}Color', None)
+                continue
+
+            key = file_hash(image_path)
+            if key not in cache:
+                cache[key] = dominant_color(image_path)
+                computed += 1
+                progress.debug(f"{record['slug']}: {cache[key]}", slug=record['slug'])
+            record[f'{field}Color'] = used[key] = cache[key]
+
+        with open(path, 'w') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+    with open(os.path.join(BASE_PATH, CACHE_FILE), 'w') as f:
+        json.dump(used, f, indent=2, sort_keys=True)
+
+    progress.info(f"Done! Computed {computed} placeholders, reused {len(used) - computed}.",
+                  computed=computed, reused=len(used) - computed)
+
+if __name__ == '__main__':
+    main()
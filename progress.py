@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared logging and progress reporting for the pipeline scripts.
+
+Scripts log through the level functions below instead of printing. Per-item
+lines ("Found product ...", "Created: ...") are debug messages, hidden unless
+--verbose is given; stage summaries are info and problems are warnings, so
+on a large catalog the log stays short and the warnings stay visible.
+
+    progress.configure_from_args()          # --quiet, --verbose, --json-log
+    with progress.stage('albums') as counts:
+        for album in progress.track(albums, 'albums'):
+            progress.debug(f"Updated {album['name']}")
+            counts['updated'] += 1
+
+A stage logs its elapsed time and counters when it ends. track() draws a
+progress bar with throughput and ETA on a terminal, redrawn at most every
+PROGRESS_INTERVAL seconds; elsewhere it logs a progress line every
+PROGRESS_LOG_INTERVAL seconds. With --json-log every message, progress
+update and stage summary is one JSON object per line instead.
+
+The settings are also kept in the LOG_LEVEL and LOG_FORMAT environment
+variables, so worker processes and the scripts build.py runs inherit them.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+
+# Seconds between redraws of a terminal progress bar, and between progress
+# lines when the output is a file or CI log
+PROGRESS_INTERVAL = 0.1
+PROGRESS_LOG_INTERVAL = 10.0
+BAR_WIDTH = 30
+
+LEVEL = LEVELS.get(os.environ.get('LOG_LEVEL', 'info'), LEVELS['info'])
+JSON_LOG = os.environ.get('LOG_FORMAT') == 'json'
+
+_stages = []
+
+
+def configure(level='info', json_log=False):
+    """Set the minimum level and output format, for this process and its children."""
+    global LEVEL, JSON_LOG
+    LEVEL = LEVELS[level]
+    JSON_LOG = json_log
+    os.environ['LOG_LEVEL'] = level
+    os.environ['LOG_FORMAT'] = 'json' if json_log else 'text'
+
+
+def add_arguments(parser):
+    parser.add_argument('--quiet', action='store_true', help='only log warnings and errors')
+    parser.add_argument('--verbose', action='store_true', help='log every item processed')
+    parser.add_argument('--json-log', action='store_true', help='log one JSON object per line')
+
+
+def configure_from_args(args=None):
+    """Configure from --quiet/--verbose/--json-log in the command line, ignoring other arguments."""
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    options, _ = parser.parse_known_args(args)
+    apply_arguments(options)
+
+
+def apply_arguments(options):
+    level = 'warning' if options.quiet else 'debug' if options.verbose else os.environ.get('LOG_LEVEL', 'info')
+    configure(level if level in LEVELS else 'info', options.json_log or JSON_LOG)
+
+# ==========================================================================
+# Messages
+# ==========================================================================
+
+def enabled(level):
+    return LEVELS[level] >= LEVEL
+
+
+def emit(record):
+    """Write one JSON log record."""
+    record = {'time': round(time.time(), 3), **record}
+    if _stages:
+        record.setdefault('stage', _stages[-1])
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+    sys.stdout.flush()
+
+
+def log(level, message, **fields):
+    """Log a message at a level, with optional structured fields for --json-log."""
+    if not enabled(level):
+        return
+    if JSON_LOG:
+        emit({'level': level, 'message': message, **fields})
+        return
+    _clear_bar()
+    stream = sys.stderr if LEVELS[level] >= LEVELS['warning'] else sys.stdout
+    prefix = f'{level.upper()}: ' if stream is sys.stderr else ''
+    stream.write(f'{prefix}{message}\n')
+    stream.flush()
+
+
+def debug(message, **fields):
+    log('debug', message, **fields)
+
+
+def info(message, **fields):
+    log('info', message, **fields)
+
+
+def warning(message, **fields):
+    log('warning', message, **fields)
+
+
+def error(message, **fields):
+    log('error', message, **fields)
+
+# ==========================================================================
+# Stages and progress
+# ==========================================================================
+
+@contextmanager
+def stage(name):
+    """Time a stage and count what it does; logs the counters when it ends."""
+    counts = Counter()
+    _stages.append(name)
+    start = time.perf_counter()
+    try:
+        yield counts
+    finally:
+        elapsed = time.perf_counter() - start
+        if JSON_LOG:
+            if enabled('info'):
+                emit({'level': 'info', 'event': 'stage', 'elapsed': round(elapsed, 3), 'counts': dict(counts)})
+        else:
+            summary = ', '.join(f'{count} {key}' for key, count in counts.items())
+            info(f"{name}: {summary or 'done'} ({elapsed:.2f}s)")
+        _stages.pop()
+
+
+_bar_drawn = False
+
+
+def _clear_bar():
+    global _bar_drawn
+    if _bar_drawn:
+        sys.stdout.write('\r\033[K')
+        _bar_drawn = False
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes}m{seconds:02d}s' if minutes else f'{seconds}s'
+
+
+class Progress:
+    """A throttled progress bar with throughput and ETA."""
+
+    def __init__(self, total, label):
+        self.total = total
+        self.label = label
+        self.done = 0
+        self.start = time.perf_counter()
+        self.tty = sys.stdout.isatty() and not JSON_LOG
+        self.last = 0.0 if self.tty else self.start
+
+    def advance(self, count=1):
+        self.done += count
+        now = time.perf_counter()
+        interval = PROGRESS_INTERVAL if self.tty else PROGRESS_LOG_INTERVAL
+        if now - self.last >= interval and self.done < (self.total or float('inf')):
+            self.last = now
+            self.report(now)
+
+    def finish(self):
+        if self.tty and enabled('info'):
+            _clear_bar()
+
+    def report(self, now):
+        if not enabled('info'):
+            return
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate and self.total else None
+        if JSON_LOG:
+            emit({'level': 'info', 'event': 'progress', 'label': self.label, 'done': self.done,
+                  'total': self.total, 'rate': round(rate, 1), 'eta': eta and round(eta, 1)})
+            return
+
+        status = f'{self.done}/{self.total}' if self.total else str(self.done)
+        status += f' {rate:.1f}/s'
+        if eta is not None:
+            status += f' ETA {format_duration(eta)}'
+        if self.tty:
+            global _bar_drawn
+            filled = int(BAR_WIDTH * self.done / self.total) if self.total else 0
+            bar = '#' * filled + '-' * (BAR_WIDTH - filled)
+            sys.stdout.write(f'\r\033[K{self.label} [{bar}] {status}')
+            sys.stdout.flush()
+            _bar_drawn = True
+        else:
+            info(f'{self.label}: {status}')
+
+
+def track(items, label, total=None):
+    """Iterate over items, reporting progress under a label."""
+    if total is None and hasattr(items, '__len__'):
+        total = len(items)
+    bar = Progress(total, label)
+    try:
+        for item in items:
+            yield item
+            bar.advance()
+    finally:
+        bar.finish()
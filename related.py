@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Precompute each album's related albums from what the catalog says about it.
+
+Every album becomes a sparse feature vector:
+
+    artist:<slug>      the releasing artist
+    person:<name>      people named in its credits (see personnel.py)
+    outlet:<name>      press outlets that covered it
+    tag:<tag>          tags on its related blog posts (from posts.json)
+    format:<format>    CD, Vinyl, Digital, ...
+    year:<year>        its release year, with neighbouring years at lower weight
+
+Features are weighted by how rare they are across the catalog and the
+vectors normalised, so the cosine similarity of two albums is the dot
+product of their vectors. Each album's row of dot products is accumulated
+from an inverted index (feature -> albums that have it), so only pairs of
+albums that share a feature are touched, and the top RELATED_COUNT are
+stored in each album's "related" list of slugs. generate_pages.py just
+looks them up.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import time
+from collections import defaultdict
+
+from personnel import credited_people
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+
+RELATED_COUNT = 4
+
+# Feature weights before rarity weighting
+WEIGHTS = {
+    'artist': 1.5,
+    'person': 1.0,
+    'outlet': 1.0,
+    'tag': 0.75,
+    'format': 0.25,
+}
+
+# Weight of the release year and the years either side of it
+YEAR_WEIGHTS = [1.0, 0.5, 0.25]
+
+# Features shared by more than this share of the catalog say little and cost
+# a pass over every pair of albums that has them, so they are dropped
+MAX_FEATURE_SHARE = 0.5
+
+# Press sources longer than this are quote text that swallowed the outlet
+MAX_OUTLET_LENGTH = 60
+
+
+def outlet_name(source):
+    """Normalised outlet from a press source like "Boston Globe" or "...\n— The Noise (scroll)"."""
+    if not source:
+        return None
+    source = re.split(r'[—–]', source)[-1]
+    source = re.sub(r'\(.*?\)', '', source)
+    source = ' '.join(source.replace('’', "'").lower().split()).strip(' .,')
+    if not source or len(source) > MAX_OUTLET_LENGTH:
+        return None
+    return source
+
+
+def album_features(album, post_tags):
+    """{feature: weight} for one album, before rarity weighting."""
+    features = {}
+
+    def add(kind, value, weight=1.0):
+        key = f'{kind}:{value}'
+        features[key] = max(features.get(key, 0), WEIGHTS.get(kind, 1.0) * weight)
+
+    add('artist', album['artistSlug'])
+    for key in credited_people(album.get('credits')):
+        add('person', key)
+    for quote in album.get('press') or []:
+        outlet = outlet_name(quote.get('source'))
+        if outlet:
+            add('outlet', outlet)
+    for post in album.get('relatedPosts') or []:
+        for tag in post_tags.get(str(post.get('id')), []):
+            add('tag', ' '.join(tag.lower().split()))
+    for fmt in album.get('formats') or []:
+        add('format', fmt.lower())
+
+    year = (album.get('releaseDate') or '')[:4]
+    if year.isdigit():
+        for distance, weight in enumerate(YEAR_WEIGHTS):
+            for neighbour in {int(year) - distance, int(year) + distance}:
+                add('year', neighbour, weight)
+
+    return features
+
+
+def feature_vectors(albums, post_tags):
+    """Rarity-weighted, unit-length feature vectors, one per album."""
+    raw = [album_features(album, post_tags) for album in albums]
+
+    document_frequency = defaultdict(int)
+    for features in raw:
+        for feature in features:
+            document_frequency[feature] += 1
+
+    count = len(albums)
+    vectors = []
+    for features in raw:
+        vector = {feature: weight * math.log(1 + count / document_frequency[feature])
+                  for feature, weight in features.items()
+                  if document_frequency[feature] <= MAX_FEATURE_SHARE * count or count < 2}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({feature: weight / norm for feature, weight in vector.items()})
+    return vectors
+
+
+def related_albums(albums, post_tags, count=RELATED_COUNT):
+    """{slug: [related slugs, most similar first]} for the whole catalog."""
+    vectors = feature_vectors(albums, post_tags)
+
+    index = defaultdict(list)
+    for album_index, vector in enumerate(vectors):
+        for feature, weight in vector.items():
+            index[feature].append((album_index, weight))
+
+    related = {}
+    for album_index, vector in enumerate(vectors):
+        # One row of the similarity matrix, from the albums sharing a feature
+        scores = defaultdict(float)
+        for feature, weight in vector.items():
+            for other, other_weight in index[feature]:
+                scores[other] += weight * other_weight
+        scores.pop(album_index, None)
+        best = heapq.nlargest(count, scores.items(), key=lambda item: (item[1], -item[0]))
+        related[albums[album_index]['slug']] = [albums[other]['slug'] for other, score in best if score > 0]
+    return related
+
+
+def load_post_tags(path):
+    """{post id: tags} from posts.json, or {} if it hasn't been extracted."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return {str(post['id']): post.get('tags') or [] for post in json.load(f)}
+
+
+def main():
+    progress.configure_from_args()
+    albums_path = os.path.join(BASE_PATH, 'data', 'albums.json')
+    with open(albums_path, 'r') as f:
+        albums = json.load(f)
+    post_tags = load_post_tags(os.path.join(BASE_PATH, 'data', 'posts.json'))
+
+    start = time.perf_counter()
+    related = related_albums(albums, post_tags)
+    elapsed = time.perf_counter() - start
+
+    for album in albums:
+        album['related'] = related[album['slug']]
+        progress.debug(f"{album['slug']}: {', '.join(album['related'])}", slug=album['slug'])
+
+    with open(albums_path, 'w') as f:
+        json.dump(albums, f, indent=2, ensure_ascii=False)
+    progress.info(f"Related albums for {len(albums)} albums in {elapsed * 1000:.1f} ms", albums=len(albums))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Write the site's service worker and its precache manifest.
+
+The manifest is built from the files in the site tree after a build: each
+app shell file (stylesheets, app.js, self-hosted fonts, logo and icons, the
+homepage and the catalog data it loads) is listed with a revision taken from
+its contents, and the manifest's version is a hash of those revisions.
+assets/js/service-worker.js is written to sw.js at the site root with the
+manifest prepended, so a build that changes any shell file changes sw.js
+and browsers install the new worker, fetching only the files whose revision
+changed. Album pages, the other generated pages and images are cached as
+they are visited and served stale-while-revalidate.
+
+generate_pages.py and optimize_site.py call write_service_worker() after
+writing their output; app.js registers the worker, and writing it fails if
+app.js no longer does.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import re
+
+import progress
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
+TEMPLATE = 'assets/js/service-worker.js'
+OUTPUT = 'sw.js'
+
+# The script loaded on every page, which must register OUTPUT
+REGISTERING_SCRIPT = 'assets/js/app.js'
+REGISTER_CALL = re.compile(r'serviceWorker\.register\(')
+
+# Files and globs (relative to the site root) cached on install; missing ones are skipped
+SHELL_FILES = [
+    'index.html',
+    'assets/css/style.css',
+    'assets/css/style.min.css',
+    'assets/js/app.js',
+    'assets/fonts/fonts.css',
+    'assets/fonts/*.woff2',
+    'assets/images/favicon.svg',
+    'assets/images/placeholder.svg',
+    'assets/images/static-motor-logo-white.svg',
+    'data/albums.json',
+    'data/artists.json',
+    'data/grid.json',
+]
+
+def shell_inputs():
+    """SHELL_FILES with each glob replaced by its directory, for build.py to fingerprint."""
+    return [os.path.dirname(pattern) if glob.has_magic(pattern) else pattern for pattern in SHELL_FILES]
+
+# Path prefixes cached on first visit and served stale-while-revalidate
+RUNTIME_CACHES = [
+    {'prefix': 'pages/', 'cache': 'pages', 'maxEntries': 500},
+    {'prefix': 'assets/images/', 'cache': 'images', 'maxEntries': 1000},
+]
+
+REVISION_LENGTH = 16
+
+
+def file_revision(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:REVISION_LENGTH]
+
+
+def shell_files(site_path):
+    """Site-relative paths of the app shell files that exist, in SHELL_FILES order."""
+    files = []
+    for pattern in SHELL_FILES:
+        for path in sorted(glob.glob(os.path.join(site_path, pattern))):
+            relpath = os.path.relpath(path, site_path).replace(os.sep, '/')
+            if relpath not in files:
+                files.append(relpath)
+    return files
+
+
+def precache_manifest(site_path):
+    """{version, precache: [{url, revision}], runtime: [...]} for a built site."""
+    precache = [{'url': relpath, 'revision': file_revision(os.path.join(site_path, relpath))}
+                for relpath in shell_files(site_path)]
+    version = hashlib.sha256(json.dumps([precache, RUNTIME_CACHES], sort_keys=True).encode()).hexdigest()
+    return {'version': version[:REVISION_LENGTH], 'precache': precache, 'runtime': RUNTIME_CACHES}
+
+
+def check_registration(site_path):
+    """Raise if the site's script doesn't register the worker, which would leave sw.js dead output."""
+    with open(os.path.join(site_path, REGISTERING_SCRIPT), 'r') as f:
+        source = f.read()
+    if not REGISTER_CALL.search(source) or f"'{OUTPUT}'" not in source:
+        raise RuntimeError(f"{REGISTERING_SCRIPT} does not register {OUTPUT}; "
+                           f"the service worker would never be installed")
+
+
+def write_service_worker(site_path=BASE_PATH, template_path=None):
+    """Write sw.js for a built site, returning its manifest."""
+    check_registration(site_path)
+    with open(template_path or os.path.join(site_path, TEMPLATE), 'r') as f:
+        template = f.read()
+    manifest = precache_manifest(site_path)
+    with open(os.path.join(site_path, OUTPUT), 'w') as f:
+        f.write(f'const MANIFEST = {json.dumps(manifest, indent=2)};\n\n{template}')
+    return manifest
+
+
+def main():
+    progress.configure_from_args()
+    manifest = write_service_worker()
+    progress.info(f"Wrote {OUTPUT}: version {manifest['version']}, {len(manifest['precache'])} precached files")
+
+if __name__ == '__main__':
+    main()
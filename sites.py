@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Site configs for building several label archives in one run.
+
+sites.json holds a list of configs. Each must name the site tree the pages
+are written to and the SQL backup the extractors read, and may override the
+branding used in the page header and footer, the prose
+of the about and artists pages and the slugs of the WordPress pages that
+hold artist bios:
+
+    [
+      {
+        "name": "Static Motor Recordings",
+        "site_path": "/path/to/smr-archive-site",
+        "sql_file": "/path/to/staticmo_wplive.sql.gz",
+        "logo_mark": "SM",
+        "logo_text": "Static<br>Motor",
+        "tagline": "Boston-based independent record label (2003&ndash;2020). ...",
+        "copyright": "&copy; 2003&ndash;2020 Static Motor Recordings. ...",
+        "footer_artists": [["the-longwalls", "The Longwalls"], ...],
+        "about": {"title": "...", "subtitle": "...", "summary": "...", "founded": "2003",
+                  "location": "Boston, MA", "paragraphs": ["...", ...]},
+        "artists_intro": {"title": "...", "subtitle": "..."},
+        "artist_pages": ["the-longwalls", "kurt-von-stetten", "gatsby", "dan-london"]
+      }
+    ]
+
+Missing branding keys take the Static Motor values below. The about and
+artists prose and the artist page slugs are Static Motor's own, so any other
+label's config must give them. Without sites.json each script builds the
+single site its own BASE_PATH points at.
+
+A site's data always lives in its site_path's data directory, where app.js
+and sw.js fetch grid.json from; a data_path pointing anywhere else is an
+error.
+"""
+
+import json
+import os
+
+BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive'
+SITES_FILE = os.path.join(BASE_PATH, 'sites.json')
+
+# Keys every site config must give
+REQUIRED_KEYS = ['site_path', 'sql_file']
+
+# Keys every label but Static Motor must give, since the defaults describe Static Motor
+LABEL_KEYS = ['about', 'artists_intro', 'artist_pages']
+
+# Branding used for any key a site config leaves out
+DEFAULT_SITE = {
+    'name': 'Static Motor Recordings',
+    'logo_mark': 'SM',
+    'logo_text': 'Static<br>Motor',
+    'tagline': (
+        'Boston-based independent record label (2003&ndash;2020).\n'
+        '            This archive preserves the catalog and history of indie rock, pop, and americana\n'
+        '            releases from The Longwalls, Kurt von Stetten, Gatsby, and Dan London.'
+    ),
+    'copyright': '&copy; 2003&ndash;2020 Static Motor Recordings. Archive maintained for historical preservation.',
+    'footer_artists': [
+        ['the-longwalls', 'The Longwalls'],
+        ['kurt-von-stetten', 'Kurt von Stetten'],
+        ['gatsby', 'Gatsby'],
+        ['dan-london', 'Dan London'],
+    ],
+    'about': {
+        'title': 'Because really DIY means doing it yourselves.',
+        'subtitle': ('Friends making music together, releasing it on their own terms, '
+                     'and building something that lasted seventeen years.'),
+        'summary': ('A Boston-based independent record label dedicated to releasing thoughtful, '
+                    'well-crafted indie rock, pop, and americana from 2003 to 2020.'),
+        'founded': '2003',
+        'location': 'Boston, MA',
+        'paragraphs': [
+            ('Static Motor Recordings was founded in Boston in 2003 with a simple mission: to release music '
+             'we loved from artists we believed in. Over seventeen years, the label became home to The '
+             'Longwalls, Kurt von Stetten, Gatsby, and Dan London.'),
+            ('From the beginning, we approached each release with care and attention to detail. Whether it '
+             'was a full-length album, an EP, or a single, every release received the same dedication to '
+             'quality in recording, design, and promotion.'),
+            ('The label earned recognition from outlets including The Boston Globe, The Noise, Twangville, '
+             'The Owl Mag, and countless music blogs. Our artists received radio play on WMBR, WMFO, and '
+             'college stations across the country. Songs found their way onto MTV and Vans promotional videos.'),
+            ('In 2020, after 27 releases, Static Motor Recordings closed its doors. This archive preserves the '
+             'catalog and documents the history of the label for anyone who wants to discover or revisit '
+             'the music.'),
+            ('The music remains available on Bandcamp and streaming platforms. Thank you to everyone who '
+             'supported the label over the years.'),
+        ],
+    },
+    'artists_intro': {
+        'title': 'Boston-based indie rock, pop, americana.',
+        'subtitle': ("Static Motor Recordings is home to popsmiths The Longwalls, DIY wunderkind Kurt von "
+                     "Stetten, singer/songwriter Dan London, and ol' local favs Gatsby."),
+    },
+    'artist_pages': ['the-longwalls', 'kurt-von-stetten', 'gatsby', 'dan-london'],
+}
+
+
+def site_config(config):
+    """A site config with branding defaults filled in and data_path resolved."""
+    missing = [key for key in REQUIRED_KEYS if not config.get(key)]
+    if missing:
+        raise ValueError(f"Site {config.get('name', '(unnamed)')!r} is missing {', '.join(missing)}")
+    if config.get('name', DEFAULT_SITE['name']) != DEFAULT_SITE['name']:
+        missing = [key for key in LABEL_KEYS if key not in config]
+        if missing:
+            raise ValueError(f"Site {config['name']!r} is missing {', '.join(missing)}, "
+                             f"which would otherwise describe {DEFAULT_SITE['name']}")
+    site = dict(DEFAULT_SITE)
+    site.update(config)
+    data_path = os.path.join(site['site_path'], 'data')
+    if site.get('data_path') and os.path.normpath(site['data_path']) != os.path.normpath(data_path):
+        raise ValueError(f"Site {site['name']!r} has data_path {site['data_path']!r}; "
+                         f"the pages load their data from {data_path!r}")
+    site['data_path'] = data_path
+    return site
+
+
+def load_sites(path=SITES_FILE):
+    """Every configured site, or an empty list if there is no sites file."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [site_config(config) for config in json.load(f)]
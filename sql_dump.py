@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Reading MySQL dumps of the WordPress database.
+
+read_table_rows() finds a table's extended INSERT statements, splits large
+ones into chunks of whole tuples and parses the chunks in parallel.
+Dumps compressed with gzip, bzip2, xz or zstd are recognised by their magic
+bytes and decompressed as they are read (zstd needs `pip install zstandard`),
+in pieces of about a chunk, so a long INSERT line is never held whole.
+scan_postmeta() picks individual meta keys out of an uncompressed dump with
+bytes patterns over a memory map, without parsing the rest of the table.
+
+Values are returned as they appear in the dump: backslash escapes are kept
+(callers unescape \\' and \\n where they need to) and doubled quotes are
+collapsed to one.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# A quoted string: runs of ordinary characters, backslash escapes and doubled
+# quotes. Written as "normal* (special normal*)*" so each character can only
+# match one way and the scan stays linear; the closing quote may not be
+# followed by another, so a doubled quote is never split to end the string.
+QUOTED_BODY = r"[^'\\]*(?:(?:\\.|'')[^'\\]*)*"
+QUOTED = re.compile(rf"'({QUOTED_BODY})'(?!')", re.DOTALL)
+
+# An unquoted value (number or NULL) runs to the next comma or closing paren
+UNQUOTED = re.compile(r"[^,)]*")
+
+SEPARATORS = re.compile(r"[ ,]*")
+
+
+def parse_sql_value(s, start=0):
+    """Parse a single SQL value starting at position start, handling quotes and escapes."""
+    if start >= len(s):
+        return None, start
+
+    if s[start] == "'":
+        match = QUOTED.match(s, start)
+        if match:
+            return match.group(1).replace("''", "'"), match.end()
+        # Unterminated string: the rest of the input
+        return s[start + 1:].replace("''", "'"), len(s)
+
+    match = UNQUOTED.match(s, start)
+    return match.group(), match.end()
+
+
+def parse_row(row_str):
+    """Parse a SQL row into fields."""
+    fields = []
+    append = fields.append
+    pos, end = 0, len(row_str)
+    while True:
+        pos = SEPARATORS.match(row_str, pos).end()
+        if pos >= end:
+            return fields
+        value, next_pos = parse_sql_value(row_str, pos)
+        append(value)
+        # A stray ')' yields an empty value; step over it
+        pos = next_pos if next_pos > pos else pos + 1
+
+
+# ==========================================================================
+# Opening dumps
+# ==========================================================================
+
+COMPRESSION_MAGIC = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bzip2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+]
+
+# Read buffer for dumps; decompressors are wrapped in one this size too
+READ_BUFFER = 16 * 1024 * 1024
+
+
+def dump_compression(path):
+    """'gzip', 'bzip2', 'xz' or 'zstd' if the dump is compressed, else None."""
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_dump(path):
+    """Open a dump for reading as bytes, decompressing it on the fly if needed."""
+    compression = dump_compression(path)
+    if compression is None:
+        return open(path, 'rb', buffering=READ_BUFFER)
+
+    if compression == 'gzip':
+        stream = gzip.open(path, 'rb')
+    elif compression == 'bzip2':
+        stream = bz2.open(path, 'rb')
+    elif compression == 'xz':
+        stream = lzma.open(path, 'rb')
+    else:
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed: pip install zstandard")
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), read_size=READ_BUFFER, closefd=True)
+    return io.BufferedReader(stream, buffer_size=READ_BUFFER)
+
+
+# ==========================================================================
+# Extended INSERT statements
+# ==========================================================================
+
+# Tuples in a chunk are split at "),(" outside quoted strings
+TUPLE_TOKENS = re.compile(rf"'{QUOTED_BODY}'(?!')|\),\(", re.DOTALL)
+TUPLE_TOKENS_BYTES = re.compile(TUPLE_TOKENS.pattern.encode(), re.DOTALL)
+
+# Bytes of tuples handed to each worker process
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def insert_prefix(table):
+    return f'INSERT INTO `{table}` VALUES '.encode()
+
+
+def tuple_chunks(values, chunk_size=CHUNK_SIZE):
+    """Split an INSERT's tuple list into (start, end) ranges of whole tuples, about chunk_size each.
+
+    Boundaries are "),(" found outside quoted strings, so a chunk never
+    starts or ends inside a value.
+    """
+    if len(values) <= chunk_size:
+        return [(0, len(values))]
+
+    chunks = []
+    chunk_start = 0
+    for match in TUPLE_TOKENS_BYTES.finditer(values):
+        if match.group().startswith(b"'"):
+            continue
+        if match.start() - chunk_start >= chunk_size:
+            boundary = match.start() + 1  # just after the ')'
+            chunks.append((chunk_start, boundary))
+            chunk_start = boundary + 1    # the '(' of the next tuple
+    chunks.append((chunk_start, len(values)))
+    return chunks
+
+
+def insert_values(line, prefix):
+    """The tuple list of an INSERT line, without the prefix and trailing ';'."""
+    values = line[len(prefix):].rstrip()
+    if values.endswith(b';'):
+        values = values[:-1]
+    return values
+
+
+def last_tuple_boundary(data):
+    """Offset just after the last "),(" in data outside quoted strings, or None.
+
+    data may end partway through a statement, so scanning stops at a quote
+    that isn't closed yet.
+    """
+    boundary = None
+    pos = 0
+    for match in TUPLE_TOKENS_BYTES.finditer(data):
+        if data.find(b"'", pos, match.start()) != -1:
+            break
+        if not match.group().startswith(b"'"):
+            boundary = match.start() + 1
+        pos = match.end()
+    return boundary
+
+
+def skip_line(f, piece, chunk_size=CHUNK_SIZE):
+    """Read past the rest of a line of which piece, from f.readline(chunk_size), is the start."""
+    while piece and not piece.endswith(b'\n'):
+        piece = f.readline(chunk_size)
+
+
+def stream_insert_chunks(f, first, chunk_size=CHUNK_SIZE):
+    """Yield runs of whole tuples, about chunk_size bytes each, from an INSERT being read from f.
+
+    first is the statement's tuple list as far as f.readline(chunk_size)
+    read it. The rest of the line is read in pieces of that size, so only
+    about one chunk is held at a time however long the statement is.
+    """
+    pending = first
+    done = first.endswith(b'\n')
+    while not done:
+        piece = f.readline(chunk_size)
+        done = not piece or piece.endswith(b'\n')
+        pending += piece
+        if len(pending) >= chunk_size and not done:
+            boundary = last_tuple_boundary(pending)
+            if boundary:
+                yield pending[:boundary]
+                pending = pending[boundary + 1:]  # from the '(' of the next tuple
+    pending = pending.rstrip()
+    if pending.endswith(b';'):
+        pending = pending[:-1]
+    if pending:
+        yield pending
+
+
+def insert_chunks(path, table, chunk_size=CHUNK_SIZE):
+    """File byte ranges of whole tuples from every INSERT into a table, in dump order."""
+    prefix = insert_prefix(table)
+    ranges = []
+    offset = 0
+    with open(path, 'rb', buffering=READ_BUFFER) as f:
+        for line in f:
+            if line.startswith(prefix):
+                values = insert_values(line, prefix)
+                start = offset + len(prefix)
+                ranges.extend((start + a, start + b) for a, b in tuple_chunks(values, chunk_size))
+            offset += len(line)
+    return ranges
+
+
+def compressed_insert_chunks(path, table, chunk_size=CHUNK_SIZE):
+    """Yield the chunks of every INSERT into a table as bytes, reading each statement in pieces.
+
+    A compressed dump can't be seeked into, so chunks carry their bytes
+    rather than file ranges.
+    """
+    prefix = insert_prefix(table)
+    with open_dump(path) as f:
+        for line in iter(lambda: f.readline(chunk_size), b''):
+            if line.startswith(prefix):
+                yield from stream_insert_chunks(f, line[len(prefix):], chunk_size)
+            else:
+                skip_line(f, line, chunk_size)
+
+
+def split_tuples(text):
+    """The inside of each "(...)" tuple in a run of tuples."""
+    tuples = []
+    tuple_start = 1
+    for match in TUPLE_TOKENS.finditer(text):
+        if not match.group().startswith("'"):
+            tuples.append(text[tuple_start:match.start()])
+            tuple_start = match.end()
+    tuples.append(text[tuple_start:len(text) - 1])
+    return tuples
+
+
+def parse_tuples(data, keep):
+    """Parse a run of tuples given as bytes, skipping rows with none of the keep substrings."""
+    rows = []
+    for row in split_tuples(data.decode('utf-8', errors='replace')):
+        if keep and not any(marker in row for marker in keep):
+            continue
+        rows.append(parse_row(row))
+    return rows
+
+
+def parse_chunk(task):
+    """Parse the tuples in one chunk of a dump. Runs in a worker process.
+
+    A chunk is a (start, end) byte range of an uncompressed dump, or the
+    chunk's bytes when the dump is compressed.
+    """
+    path, chunk, keep = task
+    if isinstance(chunk, bytes):
+        return parse_tuples(chunk, keep)
+    start, end = chunk
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return parse_tuples(f.read(end - start), keep)
+
+
+def batched(items, size):
+    """Lists of up to size consecutive items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def parse_chunks(tasks, workers):
+    """Yield the rows of each task in order, in a process pool when it is worth starting one."""
+    if len(tasks) < 2 or workers < 2:
+        for task in tasks:
+            yield from parse_chunk(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        for rows in pool.map(parse_chunk, tasks):
+            yield from rows
+
+
+def read_table_rows(path, table, keep=None, workers=None, chunk_size=CHUNK_SIZE):
+    """Yield the fields of every row inserted into a table, in dump order.
+
+    keep is an optional list of substrings (e.g. "'shopp_product'"); rows
+    containing none of them are skipped before parsing. Large INSERTs are
+    split into chunks and parsed in a process pool.
+    """
+    keep = tuple(keep or ())
+    workers = workers or os.cpu_count() or 1
+
+    if dump_compression(path):
+        # A chunk per worker at a time, so memory use doesn't grow with the statements
+        for chunks in batched(compressed_insert_chunks(path, table, chunk_size), workers):
+            yield from parse_chunks([(path, chunk, keep) for chunk in chunks], workers)
+        return
+
+    tasks = [(path, chunk, keep) for chunk in insert_chunks(path, table, chunk_size)]
+    yield from parse_chunks(tasks, workers)
+
+
+# ==========================================================================
+# wp_postmeta
+# ==========================================================================
+
+def postmeta_pattern(keys):
+    """Bytes pattern for a (meta_id,post_id,'key','value') tuple with one of the keys."""
+    names = b'|'.join(re.escape(key.encode()) for key in keys)
+    return re.compile(rb"\((\d+),(\d+),'(" + names + rb")','(" + QUOTED_BODY.encode() + rb")'\)", re.DOTALL)
+
+
+def insert_spans(data, table):
+    """(start, end) offsets of every INSERT line into a table, found without copying."""
+    prefix = insert_prefix(table)
+    pos = data.find(prefix)
+    while pos != -1:
+        end = data.find(b'\n', pos)
+        end = len(data) if end == -1 else end
+        if pos == 0 or data[pos - 1] == 0x0a:
+            yield pos + len(prefix), end
+        pos = data.find(prefix, end)
+
+
+def scan_postmeta(path, keys, table='wp_postmeta'):
+    """Yield (meta_id, post_id, meta_key, meta_value) for rows with one of the keys, in dump order.
+
+    The dump is memory-mapped and searched with a compiled bytes pattern;
+    only the values that match are decoded, so memory use stays flat
+    however large the table is. Compressed dumps fall back to
+    read_table_rows().
+    """
+    keys = list(keys)
+    if dump_compression(path) or os.path.getsize(path) == 0:
+        for fields in read_table_rows(path, table, keep=[f"'{key}'" for key in keys]):
+            if len(fields) >= 4 and fields[2] in keys:
+                yield int(fields[0]), int(fields[1]), fields[2], fields[3]
+        return
+
+    pattern = postmeta_pattern(keys)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start, end in insert_spans(data, table):
+            for match in pattern.finditer(data, start, end):
+                meta_id, post_id, key, value = match.groups()
+                value = value.decode('utf-8', errors='replace').replace("''", "'")
+                yield int(meta_id), int(post_id), key.decode(), value
@@ -0,0 +1,31 @@
+from acf_html import parse_track_items, parse_track_listing
+
+
+def test_track_listing_and_credits():
+    value = ('<ol>\\r\\n<li>Careers</li>\\r\\n<li>Sex and Work</li>\\r\\n</ol>\\r\\n'
+             '<p><strong>Credits</strong></p>\\r\\n<p>Design by Alex Budnitz<br />\\r\\nMastered by Mike Quinn</p>')
+    tracks, credits = parse_track_listing(value)
+    assert tracks == [{'number': 1, 'title': 'Careers'}, {'number': 2, 'title': 'Sex and Work'}]
+    assert credits == 'Design by Alex Budnitz\n\nMastered by Mike Quinn'
+
+
+def test_unclosed_items():
+    value = '<ol><li>Fade<li>UFO<li><em>Ghosts</em></ol><p>Credits: Kurt von Stetten</p>'
+    tracks, credits = parse_track_listing(value)
+    assert tracks == [
+        {'number': 1, 'title': 'Fade'},
+        {'number': 2, 'title': 'UFO'},
+        {'number': 3, 'title': 'Ghosts'},
+    ]
+    assert credits == ': Kurt von Stetten'
+
+
+def test_items_after_credits():
+    value = '<ul><li>Planes</li></ul><p>Credits</p><ul><li>Bonus</li><li></li></ul>'
+    assert parse_track_listing(value)[0] == [{'number': 1, 'title': 'Planes'}]
+    assert parse_track_items(value) == [{'number': 1, 'title': 'Planes'}, {'number': 2, 'title': 'Bonus'}]
+
+
+def test_empty_value():
+    assert parse_track_listing('') == ([], None)
+    assert parse_track_items(None) == []
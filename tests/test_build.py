@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+import build
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(build, 'SITE_PATH', str(tmp_path))
+    monkeypatch.setattr(build, 'STATE_FILE', str(tmp_path / '.build-state.json'))
+    return tmp_path
+
+
+def script(site, name, source):
+    (site / name).write_text(source)
+
+
+def results(stages, **options):
+    """Names of the stages one build runs, in order."""
+    ran = []
+    real_run_stage = build.run_stage
+
+    def run_stage(stage):
+        ran.append(stage['name'])
+        return real_run_stage(stage)
+
+    build.run_stage = run_stage
+    try:
+        assert build.build(stages, **options)
+    finally:
+        build.run_stage = real_run_stage
+    return ran
+
+
+PAGES = {'name': 'pages', 'script': 'pages.py', 'inputs': ['albums.json'],
+         'optional_inputs': ['fonts.css'], 'outputs': ['out']}
+FONTS = {'name': 'fonts', 'script': 'fonts.py', 'inputs': ['out'], 'outputs': ['fonts.css']}
+
+
+def pipeline(site):
+    (site / 'albums.json').write_text('[]')
+    script(site, 'pages.py', "import os\n"
+                             "os.makedirs('out', exist_ok=True)\n"
+                             "fonts = os.path.exists('fonts.css')\n"
+                             "open('out/index.html', 'w').write('self-hosted' if fonts else 'google')\n")
+    script(site, 'fonts.py', "open('fonts.css', 'w').write('@font-face {}')\n")
+    return [PAGES, FONTS]
+
+
+def test_input_written_by_later_stage_reruns_earlier(site):
+    stages = pipeline(site)
+    assert results(stages) == ['pages', 'fonts']
+    assert (site / 'out/index.html').read_text() == 'google'
+
+    # pages ran before fonts.css existed, so it is out of date, and so is
+    # fonts, which reads the rewritten pages
+    assert results(stages) == ['pages', 'fonts']
+    assert (site / 'out/index.html').read_text() == 'self-hosted'
+    assert results(stages) == []
+
+
+def test_missing_output_reruns(site):
+    stages = pipeline(site)
+    results(stages)
+    results(stages)
+    (site / 'out/index.html').unlink()
+    os.rmdir(site / 'out')
+    assert results(stages) == ['pages']
+
+    # pages reads fonts.css too, so it goes back to Google Fonts until fonts
+    # has written it again
+    (site / 'fonts.css').unlink()
+    assert results(stages) == ['pages', 'fonts']
+    assert results(stages) == ['pages', 'fonts']
+    assert (site / 'out/index.html').read_text() == 'self-hosted'
+    assert results(stages) == []
+
+
+def test_own_rewrite_is_not_a_change(site):
+    (site / 'albums.json').write_text('albums')
+    script(site, 'covers.py', "text = open('albums.json').read()\n"
+                              "open('albums.json', 'w').write(text if text.endswith('+covers') else text + '+covers')\n")
+    stages = [{'name': 'covers', 'script': 'covers.py', 'inputs': ['albums.json'], 'outputs': ['albums.json']}]
+    assert results(stages) == ['covers']
+    assert results(stages) == []
+
+    (site / 'albums.json').write_text('edited')
+    assert results(stages) == ['covers']
+    assert (site / 'albums.json').read_text() == 'edited+covers'
+
+
+def test_dry_run_marks_readers_of_would_run_stages(site, capsys):
+    stages = pipeline(site)
+    results(stages)
+    results(stages)
+    (site / 'albums.json').write_text('[{}]')
+    capsys.readouterr()
+    assert results(stages, dry_run=True) == []
+    output = capsys.readouterr().out
+    assert 'pages: would run\n' in output
+    assert 'fonts: would run (after pages)' in output
+    assert results(stages) == ['pages']
+
+
+def test_failed_stage_reruns(site):
+    (site / 'albums.json').write_text('[]')
+    script(site, 'fail.py', "open('out.txt', 'w').write('partial')\nraise SystemExit(1)\n")
+    stages = [{'name': 'fail', 'script': 'fail.py', 'inputs': ['albums.json'], 'outputs': ['out.txt']}]
+    assert not build.build(stages)
+    assert not build.build(stages)
+
+
+def test_stages_writing_sw_read_its_shell_files():
+    writers = [stage for stage in build.STAGES if 'sw.js' in stage['outputs']]
+    assert writers
+    for stage in writers:
+        assert set(build.SW_INPUTS) <= set(build.stage_reads(stage)), stage['name']
+        assert 'assets/js/app.js' in build.stage_reads(stage)
+
+
+def test_site_stages_track_every_configured_site():
+    sites = [{'site_path': '/sites/a', 'sql_file': '/dumps/a.sql'},
+             {'site_path': '/sites/b', 'sql_file': '/dumps/b.sql'}]
+    stage = {'name': 'extract', 'script': 'extract.py', 'sites': True,
+             'inputs': [build.SQL_FILE, build.ALBUMS], 'outputs': [build.ALBUMS]}
+    plain = {'name': 'covers', 'script': 'covers.py', 'inputs': [build.ALBUMS], 'outputs': [build.ALBUMS]}
+    extract, covers = build.configured_stages([stage, plain], sites)
+    assert extract['inputs'] == ['/dumps/a.sql', '/dumps/b.sql', '/sites/a/data/albums.json', '/sites/b/data/albums.json']
+    assert extract['outputs'] == ['/sites/a/data/albums.json', '/sites/b/data/albums.json']
+    assert build.SITES_FILE in extract['optional_inputs']
+    assert covers is plain
+    assert build.configured_stages([stage], []) == [stage]
@@ -0,0 +1,59 @@
+import json
+import os
+
+from catalog_schema import validate_catalog
+from timeline_rules import load_rule_types
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+TIMELINE_TYPES = load_rule_types(os.path.join(DATA_PATH, 'timeline_rules.json'))
+
+
+def album(**fields):
+    return {'name': 'Kowloon', 'artist': 'The Longwalls', 'slug': 'kowloon', 'artistSlug': 'the-longwalls', **fields}
+
+
+def test_shipped_catalog_is_valid():
+    catalog = {}
+    for name in ('albums', 'artists', 'timeline', 'people'):
+        with open(os.path.join(DATA_PATH, f'{name}.json'), 'r') as f:
+            catalog[name] = json.load(f)
+    assert validate_catalog(catalog['albums'], catalog['artists'], catalog['timeline'], catalog['people'],
+                            TIMELINE_TYPES) == []
+
+
+def test_error_strings():
+    albums = [
+        album(releaseDate='2012/05/01', tracks=[{'number': '1', 'title': 'Rukia'}, {'number': 2}]),
+        album(slug=None, bandcampEmbed={'provider': 'myspace', 'id': 1}),
+        album(coverImageColor='#ABCDEF', related=['Gold Standard']),
+    ]
+    artists = [{'name': 'Gatsby', 'slug': 'gatsby', 'albums': 'none'}, 'gatsby']
+    timeline = [{'title': 'Kowloon is out now!', 'type': 'album'}]
+    people = [{'name': 'Mike Quinn', 'slug': 'mike-quinn', 'credits': [{'album': 'kowloon', 'roles': [None]}]}]
+    assert validate_catalog(albums, artists, timeline, people, TIMELINE_TYPES) == [
+        "albums[kowloon].releaseDate: '2012/05/01' is not in the expected format",
+        'albums[kowloon].tracks[0].number: expected integer, got str',
+        'albums[kowloon].tracks[1].title: is required',
+        'albums[1].slug: is required',
+        "albums[1].bandcampEmbed.provider: 'myspace' is not one of bandcamp, soundcloud, youtube",
+        'albums[1].bandcampEmbed.id: expected string, got int',
+        "albums[kowloon].coverImageColor: '#ABCDEF' is not in the expected format",
+        "albums[kowloon].related[0]: 'Gold Standard' is not in the expected format",
+        'artists[gatsby].albums: expected list, got str',
+        'artists[1]: expected object, got str',
+        "timeline[0].type: 'album' is not one of live, news, placement, press, radio, release, video",
+        'people[mike-quinn].credits[0].roles[0]: is required',
+        'albums[kowloon].slug: duplicate slug',
+    ]
+
+
+def test_timeline_types_follow_the_rules():
+    timeline = [{'title': 'Kowloon tour diary', 'type': 'tour'}]
+    assert validate_catalog([], [], timeline, timeline_types=TIMELINE_TYPES) == [
+        "timeline[0].type: 'tour' is not one of live, news, placement, press, radio, release, video",
+    ]
+    assert validate_catalog([], [], timeline, timeline_types=TIMELINE_TYPES | {'tour'}) == []
+
+
+def test_collection_not_a_list():
+    assert validate_catalog({}, [], []) == ['albums: expected list, got dict']
@@ -0,0 +1,79 @@
+import gzip
+import sqlite3
+
+import pytest
+
+import dump_cache
+from dump_cache import column_affinity, import_dump, open_dump_cache
+from sql_dump import read_table_rows
+
+DUMP = b"""DROP TABLE IF EXISTS `wp_posts`;
+CREATE TABLE `wp_posts` (
+  `ID` bigint(20) unsigned NOT NULL AUTO_INCREMENT,
+  `post_name` varchar(200) NOT NULL,
+  `post_type` varchar(20) NOT NULL,
+  PRIMARY KEY (`ID`)
+) ENGINE=InnoDB;
+INSERT INTO `wp_posts` VALUES (1,'it\\'s','post'),(2,'x,),(y','product');
+CREATE TABLE `wp_options` (
+  `option_id` bigint(20)
+) ENGINE=InnoDB;
+INSERT INTO `wp_options` VALUES (1);
+CREATE TABLE `wp_postmeta` (
+  `meta_id` bigint(20),
+  `post_id` bigint(20),
+  `meta_key` varchar(255),
+  `meta_value` longtext
+) ENGINE=InnoDB;
+INSERT INTO `wp_postmeta` VALUES (1,1,'_price','10'),(2,2,'_sku','');
+INSERT INTO `wp_posts` VALUES (3,'third','page');
+"""
+
+
+@pytest.mark.parametrize('name', ['dump.sql', 'dump.sql.gz'])
+def test_cache_matches_dump(tmp_path, name):
+    sql_file = str(tmp_path / name)
+    with (gzip.open if name.endswith('.gz') else open)(sql_file, 'wb') as f:
+        f.write(DUMP)
+
+    db = open_dump_cache(sql_file)
+    tables = [table for (table,) in db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'dump_source' ORDER BY name")]
+    assert tables == ['wp_postmeta', 'wp_posts']
+    for table in tables:
+        cached = [tuple(str(value) for value in row) for row in db.execute(f'SELECT * FROM "{table}" ORDER BY rowid')]
+        assert cached == [tuple(fields) for fields in read_table_rows(sql_file, table, workers=1)]
+    db.close()
+
+
+@pytest.mark.parametrize('name', ['dump.sql', 'dump.sql.gz'])
+def test_import_in_small_pieces_matches_dump(tmp_path, name):
+    sql_file = str(tmp_path / name)
+    rows = b','.join(b"(%d,'slug-%d),(x\\'y','post')" % (i, i) for i in range(200))
+    with (gzip.open if name.endswith('.gz') else open)(sql_file, 'wb') as f:
+        f.write(DUMP + b'INSERT INTO `wp_posts` VALUES ' + rows + b';\n')
+
+    db = sqlite3.connect(':memory:')
+    import_dump(db, sql_file, workers=1, chunk_size=64)
+    cached = [tuple(str(value) for value in row) for row in db.execute('SELECT * FROM "wp_posts" ORDER BY rowid')]
+    assert cached == [tuple(fields) for fields in read_table_rows(sql_file, 'wp_posts', workers=1)]
+    assert len(cached) == 203
+    assert list(read_table_rows(sql_file, 'wp_posts', workers=1, chunk_size=64)) == [list(row) for row in cached]
+
+
+def test_integer_affinity():
+    assert [column_affinity(name) for name in ['bigint', 'TINYINT', 'int', 'point', 'varchar', 'mediumint']] == [
+        'INTEGER', 'INTEGER', 'INTEGER', 'TEXT', 'TEXT', 'INTEGER']
+
+
+def test_warns_about_rows_of_the_wrong_width(tmp_path, monkeypatch):
+    sql_file = str(tmp_path / 'dump.sql')
+    with open(sql_file, 'wb') as f:
+        f.write(DUMP + b"INSERT INTO `wp_posts` VALUES (4,'short'),(5,'fine','post');\n")
+    warnings = []
+    monkeypatch.setattr(dump_cache.progress, 'warning', lambda message, **fields: warnings.append(message))
+
+    db = sqlite3.connect(':memory:')
+    import_dump(db, sql_file, workers=1)
+    assert db.execute('SELECT COUNT(*) FROM "wp_posts"').fetchone()[0] == 4
+    assert warnings == ['wp_posts: skipped 1 row without 3 fields']
@@ -0,0 +1,15 @@
+from embeds import embed_origins, parse_embed, youtube_record
+
+
+def test_parse_youtube_iframe():
+    video = '<iframe width="560" height="315" src="https://www.youtube.com/embed/fkR7ZY9Mvaw?si=EMasbV-FTC6wjZJm"></iframe>'
+    assert parse_embed(video) == youtube_record('fkR7ZY9Mvaw')
+    playlist = '<iframe src="https://www.youtube.com/embed/videoseries?list=PLx-1_a"></iframe>'
+    assert parse_embed(playlist) == youtube_record(playlist_id='PLx-1_a')
+
+
+def test_embed_origins():
+    video = youtube_record('fkR7ZY9Mvaw')
+    assert embed_origins(video) == {'https://www.youtube.com', 'https://i.ytimg.com'}
+    assert embed_origins(video, player=False) == {'https://i.ytimg.com'}
+    assert embed_origins(youtube_record(playlist_id='PLx-1_a'), player=False) == set()
@@ -0,0 +1,38 @@
+import generate_pages
+from generate_pages import blocking_styles, inline_critical_css
+
+
+def page(head):
+    return f'<!DOCTYPE html>\n<html>\n<head>\n{head}\n</head>\n<body></body>\n</html>\n'
+
+
+def test_inlines_in_place_of_blocking_styles():
+    html = inline_critical_css(page(blocking_styles('../')), '../', '.a{color:red}', 'about')
+    assert '<!-- Critical styles -->' in html
+    assert '<style>.a{color:red}</style>' in html
+    assert 'rel="stylesheet" href="../assets/css/style.css"' not in html.split('<noscript>')[0]
+
+
+def test_reinlines_between_markers():
+    html = inline_critical_css(page(blocking_styles('')), '', '.a{color:red}', 'home')
+    html = inline_critical_css(html, '', '.b{color:blue}', 'home')
+    assert '.b{color:blue}' in html and '.a{color:red}' not in html
+
+
+def test_warns_when_nothing_to_replace(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(generate_pages.progress, 'warning', lambda message, **fields: warnings.append(message))
+    minified = page('<link rel="stylesheet" href="assets/css/style.min.css">')
+    assert inline_critical_css(minified, '', '.a{color:red}', 'home', relpath='index.html') == minified
+    assert warnings and warnings[0].startswith('index.html: no style links')
+
+
+def test_sites_sharing_a_stylesheet_build_in_one_group(tmp_path):
+    sites = []
+    for name, css in [('a', '.x{}'), ('b', '.y{}'), ('c', '.x{}')]:
+        path = tmp_path / name / generate_pages.STYLESHEET
+        path.parent.mkdir(parents=True)
+        path.write_text(css)
+        sites.append({'name': name, 'site_path': str(tmp_path / name)})
+    groups = generate_pages.stylesheet_groups(sites)
+    assert [[site['name'] for site in group] for group in groups] == [['a', 'c'], ['b']]
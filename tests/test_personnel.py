@@ -0,0 +1,73 @@
+from personnel import credit_entries, credited_people
+
+
+def test_names_before_roles():
+    credits = ("Alan Wuorinen – vocals, acoustic guitar\n"
+               "Dan London: Lead and Backing Vocals, Guitars\n"
+               "Will Dickson - drums (all songs but 3 and 11)")
+    assert credit_entries(credits) == [
+        ('Alan Wuorinen', 'vocals, acoustic guitar'),
+        ('Dan London', 'Lead and Backing Vocals, Guitars'),
+        ('Will Dickson', 'drums (all songs but 3 and 11)'),
+    ]
+
+
+def test_names_after_credit():
+    credits = ("Recorded, mixed and mastered with Mike Quinn at Moontower Studio, Cambridge.\n"
+               "Design by Alex Budnitz.")
+    assert credit_entries(credits) == [
+        ('Mike Quinn', 'Recorded, mixed and mastered'),
+        ('Alex Budnitz', 'Design'),
+    ]
+
+
+def test_role_is_last_clause():
+    credits = ("Originally recorded, and mixed with Mike Quinn at Moontower Studio, Cambridge. "
+               "Mastered by Ian Kennedy at New Alliance East.")
+    assert credit_entries(credits) == [
+        ('Mike Quinn', 'Originally recorded, and mixed'),
+        ('Ian Kennedy', 'Mastered'),
+    ]
+
+
+def test_co_credited_names():
+    assert credit_entries("Lathe cut vinyl release mixed by Brandon Comstock and Kurt von Stetten;"
+                          "\xa0Mastered for vinyl by Mike Quinn") == [
+        ('Brandon Comstock', 'Lathe cut vinyl release mixed'),
+        ('Kurt von Stetten', 'Lathe cut vinyl release mixed'),
+        ('Mike Quinn', 'Mastered for vinyl'),
+    ]
+    assert credit_entries("Trumpets on “Hold it” by Ian Connelly and Tyler Mehlenbacher") == [
+        ('Ian Connelly', 'Trumpets on “Hold it”'),
+        ('Tyler Mehlenbacher', 'Trumpets on “Hold it”'),
+    ]
+    assert credit_entries("Recorded & Mixed by Alex Allinson at The Bridge Sound & Stage. "
+                          "Assistants: Alexander Hayes, Ryan Ainsworth. Intern: Dave Pettibone") == [
+        ('Alex Allinson', 'Recorded & Mixed'),
+        ('Alexander Hayes', 'Assistants'),
+        ('Ryan Ainsworth', 'Assistants'),
+        ('Dave Pettibone', 'Intern'),
+    ]
+
+
+def test_parenthetical_before_name():
+    assert credit_entries("Mastered: (Vinyl) Mike Quinn (Moontower) at Q Division Studios") == [
+        ('Mike Quinn', 'Mastered'),
+    ]
+
+
+def test_bands_and_businesses_skipped():
+    assert credit_entries("Produced & Enginnered by Kurt von Stetten and The Longwalls at Arlington Music Studios") == [
+        ('Kurt von Stetten', 'Produced & Enginnered'),
+    ]
+    assert credit_entries("All songs written by Dan London © 2014 | Published by Drunken Ballerina Music / SESAC") == [
+        ('Dan London', 'All songs written'),
+    ]
+    assert credit_entries("Remixed and mastered summer/fall 2015 \xa0by Mike Quinn, Moontower Studio / Q Division") == [
+        ('Mike Quinn', 'Remixed and mastered summer/fall 2015'),
+    ]
+
+
+def test_credited_people_keeps_first_spelling():
+    credits = "Kurt von Stetten – drums\nProduced by Kurt Von Stetten"
+    assert credited_people(credits) == {'kurt von stetten': 'Kurt von Stetten'}
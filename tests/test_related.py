@@ -0,0 +1,40 @@
+from related import outlet_name, related_albums
+
+
+def album(slug, artist, year, credits=None, press=(), **fields):
+    return {'slug': slug, 'artistSlug': artist, 'releaseDate': f'{year}-05-01', 'credits': credits,
+            'press': [{'text': '...', 'source': source} for source in press], **fields}
+
+
+# One release per artist, so "more by the same artist" would find nothing
+ALBUMS = [
+    album('first-light', 'solo-one', 2010, 'Mike Quinn – drums', ['The Noise']),
+    album('second-wind', 'solo-two', 2011, 'Mike Quinn – bass', ['Boston Globe']),
+    album('up-front', 'various-artists', 2012, press=['— The Noise (online)', 'Boston Globe']),
+    album('far-away', 'solo-three', 2019, 'Jane Roe – vocals', ['Twangville']),
+]
+
+
+def test_single_release_artists_get_related_albums():
+    related = related_albums(ALBUMS, {})
+    assert related['first-light'][0] == 'second-wind'
+    assert related['second-wind'][0] == 'first-light'
+    assert related['far-away'] == []
+
+
+def test_compilation_relates_through_press_and_year():
+    related = related_albums(ALBUMS, {})
+    assert set(related['up-front']) == {'first-light', 'second-wind'}
+
+
+def test_post_tags_link_albums():
+    albums = [album('a', 'one', 2005, relatedPosts=[{'id': 1}]), album('b', 'two', 2015, relatedPosts=[{'id': 2}]),
+              album('c', 'three', 2020), album('d', 'four', 2025)]
+    related = related_albums(albums, {'1': ['Vinyl Release'], '2': ['vinyl  release']})
+    assert related['a'] == ['b'] and related['c'] == []
+
+
+def test_outlet_name():
+    assert outlet_name('Amy Steele for Entertainment Realm') == 'amy steele for entertainment realm'
+    assert outlet_name('Great record.\n— The Noise (scroll down)') == 'the noise'
+    assert outlet_name('') is None
@@ -0,0 +1,21 @@
+import pytest
+
+from sites import DEFAULT_SITE, site_config
+
+
+def test_static_motor_takes_default_prose():
+    site = site_config({'site_path': '/sites/smr', 'sql_file': 'smr.sql'})
+    assert site['about'] == DEFAULT_SITE['about']
+    assert site['data_path'] == '/sites/smr/data'
+
+
+def test_other_labels_must_give_their_own_prose():
+    with pytest.raises(ValueError, match='about, artists_intro, artist_pages'):
+        site_config({'name': 'Sister Label', 'site_path': '/sites/sister', 'sql_file': 'sister.sql'})
+
+
+def test_data_path_must_be_the_sites_data_directory():
+    site = site_config({'site_path': '/sites/smr', 'sql_file': 'smr.sql', 'data_path': '/sites/smr/data/'})
+    assert site['data_path'] == '/sites/smr/data'
+    with pytest.raises(ValueError, match='data_path'):
+        site_config({'site_path': '/sites/smr', 'sql_file': 'smr.sql', 'data_path': '/elsewhere/data'})
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from sql_dump import parse_row, parse_sql_value, postmeta_pattern, split_tuples
+
+
+def loop_sql_value(s, start=0):
+    """The per-character parser parse_sql_value() replaced, as the reference."""
+    if start >= len(s):
+        return None, start
+    if s[start] == "'":
+        i = start + 1
+        result = []
+        while i < len(s):
+            if s[i] == '\\' and i + 1 < len(s):
+                result.append(s[i:i + 2])
+                i += 2
+            elif s[i] == "'":
+                if i + 1 < len(s) and s[i + 1] == "'":
+                    result.append("'")
+                    i += 2
+                else:
+                    return ''.join(result), i + 1
+            else:
+                result.append(s[i])
+                i += 1
+        return ''.join(result), i
+    end = start
+    while end < len(s) and s[end] not in ',)':
+        end += 1
+    return s[start:end], end
+
+
+def loop_row(row_str):
+    fields = []
+    i = 0
+    while i < len(row_str):
+        if row_str[i] in ' ,':
+            i += 1
+            continue
+        value, i = loop_sql_value(row_str, i)
+        if value is not None:
+            fields.append(value)
+        if i < len(row_str) and row_str[i] == ',':
+            i += 1
+    return fields
+
+
+ROWS = [
+    "1,'Kowloon','kowloon','publish'",
+    "2,'it''s','a\\'b',NULL, 'x,y'",
+    "3,'<p>Songs by Alan (BMI)</p>\\r\\n','',0",
+    "4,'unterminated ''",
+    "5,'ends in a backslash\\",
+    "",
+]
+
+
+@pytest.mark.parametrize('row', ROWS)
+def test_parse_row_matches_loop(row):
+    assert parse_row(row) == loop_row(row)
+
+
+def test_parse_sql_value_matches_loop_on_random_strings():
+    rng = random.Random(0)
+    for _ in range(5000):
+        s = ''.join(rng.choice("ab',\\ \n") for _ in range(rng.randint(0, 12)))
+        for start in range(len(s) + 1):
+            assert parse_sql_value(s, start) == loop_sql_value(s, start), (s, start)
+        assert parse_row(s) == loop_row(s), s
+
+
+def test_stray_paren_does_not_hang():
+    assert parse_row("1,)'a'") == ['1', '', 'a']
+
+
+def test_split_tuples():
+    assert split_tuples("(1,'a),(b'),(2,'it''s')") == ["1,'a),(b'", "2,'it''s'"]
+
+
+def test_postmeta_pattern():
+    data = b"(1,10,'_price','9.99'),(2,11,'_sku','a\\'b'),(3,12,'_price','it''s')"
+    matches = [match.groups() for match in postmeta_pattern(['_price']).finditer(data)]
+    assert matches == [(b'1', b'10', b'_price', b'9.99'), (b'3', b'12', b'_price', b"it''s")]
@@ -0,0 +1,73 @@
+import json
+import os
+import random
+
+import pytest
+
+from timeline_rules import compile_rules, load_rules
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'timeline_rules.json')
+
+
+def elif_chain(title):
+    """The hard-coded classifier timeline_rules.json replaced, as the reference."""
+    title_lower = title.lower() if title else ''
+    if any(word in title_lower for word in ['review', 'love', 'praise', 'kind words', 'best of']):
+        return 'press'
+    elif any(word in title_lower for word in ['out now', 'on sale', 'release', 'vinyl', 'digital']):
+        return 'release'
+    elif any(word in title_lower for word in ['live', 'show', 'concert', 'tour']):
+        return 'live'
+    elif any(word in title_lower for word in ['video', 'premiere']):
+        return 'video'
+    elif any(word in title_lower for word in ['mtv', 'tv', 'placement']):
+        return 'placement'
+    elif any(word in title_lower for word in ['radio', 'wmbr', 'wmfo', 'pipeline']):
+        return 'radio'
+    return 'news'
+
+
+@pytest.mark.parametrize('title', [
+    'Kowloon is out now!',
+    'Live at the Bridge video premiere',
+    'The Longwalls on WMBR Pipeline',
+    'Kind words from DigBoston',
+    'Gold Standard vinyl release show',
+    'Songs placed on MTV',
+    'Deliverance',    # "live" inside a word still counts, as before
+    'Happy new year',
+    '',
+    None,
+])
+def test_matches_elif_chain(title):
+    classify = load_rules(RULES_PATH)
+    assert classify({'title': title}) == elif_chain(title)
+
+
+def test_matches_elif_chain_on_random_titles():
+    classify = load_rules(RULES_PATH)
+    with open(RULES_PATH, 'r') as f:
+        keywords = [keyword for rule in json.load(f)['rules'] for keyword in rule['keywords']]
+    rng = random.Random(0)
+    for _ in range(2000):
+        words = rng.sample(keywords + ['the', 'album', 'new', 'Boston', 'o', 'ti'], 4)
+        title = rng.choice(['', ' ']).join(word.upper() if rng.random() < 0.3 else word for word in words)
+        assert classify({'title': title}) == elif_chain(title), title
+
+
+def test_fields_and_priority():
+    classify = compile_rules({'default': 'news', 'rules': [
+        {'type': 'press', 'keywords': ['review']},
+        {'type': 'live', 'fields': ['tags', 'content'], 'keywords': ['tour']},
+    ]}, clean=lambda text: text.replace('<p>', ''))
+    assert classify({'title': 'Tour review', 'tags': ['tour']}) == 'press'
+    assert classify({'title': 'Tour dates', 'tags': []}) == 'news'
+    assert classify({'title': 'Dates', 'content': '<p>Tour'}) == 'live'
+    assert classify({'title': 'Dates', 'tags': ['Spring Tour']}) == 'live'
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError, match='unknown fields: excerpt'):
+        compile_rules({'rules': [{'type': 'press', 'fields': ['excerpt'], 'keywords': ['review']}]})
+    with pytest.raises(ValueError, match='invalid keyword'):
+        compile_rules({'rules': [{'type': 'press', 'keywords': ['']}]})
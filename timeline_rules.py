@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Rule-driven classification of blog posts into timeline event types.
+
+data/timeline_rules.json lists rules in priority order:
+
+    {"default": "news",
+     "rules": [{"type": "press", "fields": ["title"], "keywords": ["review", ...]}, ...]}
+
+A post gets the type of the first rule with a keyword in one of the rule's
+fields (title, tags, categories or content; title if not given), matched
+case-insensitively anywhere in the text, or the default type.
+
+compile_rules() joins every keyword of every rule into one regex, and each
+post is classified with a single scan over its fields joined together, so
+the cost per post doesn't grow with the number of rules. The catalog
+validator accepts exactly the types rule_types() lists, so a new rule's type
+needs no other change.
+"""
+
+import json
+import re
+from bisect import bisect_right
+
+FIELDS = ['title', 'tags', 'categories', 'content']
+
+# Separates the fields of a post in the scanned text; never in a keyword
+FIELD_SEPARATOR = '\0'
+
+
+def field_text(post, field, clean):
+    value = post.get(field) or ''
+    if field == 'content':
+        value = clean(value)
+    elif isinstance(value, list):
+        value = ' '.join(value)
+    return value.lower()
+
+
+def compile_rules(config, clean=lambda text: text):
+    """Build classify(post) from a rules config. clean turns post content into plain text."""
+    default = config.get('default', 'news')
+
+    # keyword -> {field index: best (lowest) rule index}
+    keyword_rules = {}
+    for priority, rule in enumerate(config['rules']):
+        fields = rule.get('fields', ['title'])
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Rule {rule['type']!r} has unknown fields: {', '.join(sorted(unknown))}")
+        for keyword in rule['keywords']:
+            keyword = keyword.lower()
+            if not keyword or FIELD_SEPARATOR in keyword:
+                raise ValueError(f"Rule {rule['type']!r} has an invalid keyword {keyword!r}")
+            best = keyword_rules.setdefault(keyword, {})
+            for field in fields:
+                best.setdefault(FIELDS.index(field), priority)
+
+    types = [rule['type'] for rule in config['rules']]
+    if not keyword_rules:
+        return lambda post: default
+
+    # Fields no rule looks at are left empty rather than extracted
+    used = {field for rules in keyword_rules.values() for field in rules}
+
+    # The regex reports one keyword per position, the longest; fold in the
+    # rules of every keyword it contains so shorter overlapping ones still count
+    keywords = sorted(keyword_rules, key=len, reverse=True)
+    matches = {}
+    for keyword in keywords:
+        best = {}
+        for other in keywords:
+            if other in keyword:
+                for field, priority in keyword_rules[other].items():
+                    best[field] = min(priority, best.get(field, priority))
+        matches[keyword] = best
+
+    # A lookahead finds a match starting at every position, overlapping or not
+    pattern = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in keywords) + '))')
+
+    def classify(post):
+        fields = [field_text(post, field, clean) if index in used else ''
+                  for index, field in enumerate(FIELDS)]
+        starts = []
+        offset = 0
+        for text in fields:
+            starts.append(offset)
+            offset += len(text) + 1
+        text = FIELD_SEPARATOR.join(fields)
+
+        best = len(types)
+        for match in pattern.finditer(text):
+            field = bisect_right(starts, match.start()) - 1
+            priority = matches[match.group(1)].get(field)
+            if priority is not None and priority < best:
+                best = priority
+                if best == 0:
+                    break
+        return types[best] if best < len(types) else default
+
+    return classify
+
+
+def rule_types(config):
+    """Every type a rules config can assign: its rules' types and the default."""
+    return {config.get('default', 'news')} | {rule['type'] for rule in config['rules']}
+
+
+def load_rule_types(path):
+    with open(path, 'r') as f:
+        return rule_types(json.load(f))
+
+
+def load_rules(path, clean=lambda text: text):
+    with open(path, 'r') as f:
+        return compile_rules(json.load(f), clean)
@@ -9,6 +9,8 @@ import csv
 import os
 import re
 
+import progress
+
 BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive'
 ALBUMS_JSON = os.path.join(BASE_PATH, 'smr-archive-site/data/albums.json')
 PRESS_CSV = os.path.join(BASE_PATH, 'SMR_Albums_Press.csv')
@@ -142,8 +144,10 @@ def slugify(name):
     return slug
 
 def main():
+    progress.configure_from_args()
+
     # Load albums
-    print("Loading albums.json...")
+    progress.info("Loading albums.json...")
     with open(ALBUMS_JSON, 'r') as f:
         albums = json.load(f)
 
@@ -152,7 +156,7 @@ def main():
     albums_by_name = {a['name'].lower(): a for a in albums}
 
     # Load press CSV
-    print("Loading press CSV...")
+    progress.info("Loading press CSV...")
     press_data = {}
     with open(PRESS_CSV, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -165,7 +169,7 @@ def main():
                 'press': press
             }
 
-    print(f"Found {len(press_data)} albums in CSV")
+    progress.info(f"Found {len(press_data)} albums in CSV", albums=len(press_data))
 
     # Update albums with press data
     updated_count = 0
@@ -183,7 +187,7 @@ def main():
                 if fq:
                     if not album.get('featuredQuote') or not album['featuredQuote'].get('text'):
                         album['featuredQuote'] = fq
-                        print(f"  Added featured quote to: {album['name']}")
+                        progress.debug(f"Added featured quote to: {album['name']}", slug=slug)
                         updated_count += 1
 
             # Update press quotes if we have them and album doesn't have many
@@ -193,14 +197,14 @@ def main():
                     existing = album.get('press', [])
                     if len(existing) < len(new_quotes):
                         album['press'] = new_quotes
-                        print(f"  Updated press for: {album['name']} ({len(new_quotes)} quotes)")
+                        progress.debug(f"Updated press for: {album['name']} ({len(new_quotes)} quotes)", slug=slug)
                         updated_count += 1
 
         # Update cover images
         if slug in COVER_UPDATES:
             new_cover = f"assets/images/albums/{COVER_UPDATES[slug]}"
             album['coverImage'] = new_cover
-            print(f"  Updated cover for: {album['name']} -> {COVER_UPDATES[slug]}")
+            progress.debug(f"Updated cover for: {album['name']} -> {COVER_UPDATES[slug]}", slug=slug)
             updated_count += 1
 
         # Update metadata
@@ -209,24 +213,24 @@ def main():
 
             if not album.get('releaseDate') or album['releaseDate'] != release_date:
                 album['releaseDate'] = release_date
-                print(f"  Updated release date for: {album['name']} -> {release_date}")
+                progress.debug(f"Updated release date for: {album['name']} -> {release_date}", slug=slug)
 
             if not album.get('catalogNumber'):
                 album['catalogNumber'] = catalog_num
-                print(f"  Updated catalog # for: {album['name']} -> {catalog_num}")
+                progress.debug(f"Updated catalog # for: {album['name']} -> {catalog_num}", slug=slug)
 
             if not album.get('formats') or len(album['formats']) == 0:
                 album['formats'] = formats
-                print(f"  Updated formats for: {album['name']} -> {formats}")
+                progress.debug(f"Updated formats for: {album['name']} -> {formats}", slug=slug)
 
             updated_count += 1
 
     # Save updated albums
-    print(f"\nSaving updated albums.json...")
+    progress.info("Saving updated albums.json...")
     with open(ALBUMS_JSON, 'w') as f:
         json.dump(albums, f, indent=2, ensure_ascii=False)
 
-    print(f"\nDone! Updated {updated_count} albums.")
+    progress.info(f"Done! Updated {updated_count} albums.", updated=updated_count)
 
 if __name__ == '__main__':
     main()
@@ -6,6 +6,8 @@ Update artist data with hero images.
 import json
 import os
 
+import progress
+
 BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
 
 # Artist hero image mapping
@@ -25,6 +27,8 @@ ARTIST_BANDCAMP = {
 }
 
 def main():
+    progress.configure_from_args()
+
     # Load artists
     with open(os.path.join(BASE_PATH, 'data/artists.json'), 'r') as f:
         artists = json.load(f)
@@ -38,18 +42,18 @@ def main():
             image_path = os.path.join(BASE_PATH, ARTIST_IMAGES[slug])
             if os.path.exists(image_path):
                 artist['heroImage'] = ARTIST_IMAGES[slug]
-                print(f"Updated hero image for {artist['name']}")
+                progress.debug(f"Updated hero image for {artist['name']}", slug=slug)
 
         # Bandcamp URL
         if slug in ARTIST_BANDCAMP:
             artist['bandcampUrl'] = ARTIST_BANDCAMP[slug]
-            print(f"Updated Bandcamp URL for {artist['name']}")
+            progress.debug(f"Updated Bandcamp URL for {artist['name']}", slug=slug)
 
     # Save updated artists
     with open(os.path.join(BASE_PATH, 'data/artists.json'), 'w') as f:
         json.dump(artists, f, indent=2)
 
-    print("\nDone!")
+    progress.info(f"Updated {len(artists)} artists")
 
 if __name__ == '__main__':
     main()
@@ -6,6 +6,8 @@ Update album data with cover image paths.
 import json
 import os
 
+import progress
+
 BASE_PATH = '/Users/brandon/Music/SMR/SMR_Archive/smr-archive-site'
 IMAGES_PATH = 'assets/images/albums'
 
@@ -19,6 +21,8 @@ def get_cover_path(slug):
     return None
 
 def main():
+    progress.configure_from_args()
+
     # Load albums
     with open(os.path.join(BASE_PATH, 'data/albums.json'), 'r') as f:
         albums = json.load(f)
@@ -31,18 +35,18 @@ def main():
         if cover:
             album['coverImage'] = cover
             updated += 1
-            print(f"Found: {album['slug']} -> {cover}")
+            progress.debug(f"Found: {album['slug']} -> {cover}", slug=album['slug'])
         else:
             missing.append(album['slug'])
-            print(f"Missing: {album['slug']}")
+            progress.debug(f"Missing: {album['slug']}", slug=album['slug'])
 
     # Save updated albums
     with open(os.path.join(BASE_PATH, 'data/albums.json'), 'w') as f:
         json.dump(albums, f, indent=2)
 
-    print(f"\nUpdated {updated} albums with cover images")
+    progress.info(f"Updated {updated} albums with cover images", updated=updated)
     if missing:
-        print(f"Missing covers for: {', '.join(missing)}")
+        progress.warning(f"Missing covers for: {', '.join(missing)}", missing=missing)
 
 if __name__ == '__main__':
     main()